@@ -24,7 +24,6 @@
 #include <stddef.h>
 #include <stdint.h>
 #include <memory>
-#include <string>
 
 #include "logging.h"
 #include "third_party/absl/memory/memory.h"
@@ -38,8 +37,7 @@
 
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   const char kFilename[] = "/vsimem/a.asc";
-  const std::string data2(reinterpret_cast<const char *>(data), size);
-  autotest2::VsiMemTempWrapper wrapper(kFilename, data2);
+  autotest2::VsiMemBufferWrapper wrapper(kFilename, data, size);
 
   WithQuietHandler error_handler;
   auto open_info =
@@ -34,8 +34,8 @@ DEFINE_PROTO_FUZZER(const Aigrid &a) {
   constexpr char kFilenameAux[] = "/vsimem/a.aux";
   constexpr char kFilenameRrd[] = "/vsimem/a.rrd";
 
-  autotest2::VsiMemMaybeTempWrapper aux(kFilenameAux, a.aux(), a.has_aux());
-  autotest2::VsiMemMaybeTempWrapper rrd(kFilenameRrd, a.rrd(), a.has_rrd());
+  autotest2::VsiMemMaybeBufferWrapper aux(kFilenameAux, a.aux(), a.has_aux());
+  autotest2::VsiMemMaybeBufferWrapper rrd(kFilenameRrd, a.rrd(), a.has_rrd());
 
   constexpr char kFilename[] = "/vsimem/a";
   VSIMkdir(kFilename, 0755);
@@ -51,16 +51,16 @@ DEFINE_PROTO_FUZZER(const Aigrid &a) {
   constexpr char kFilenameW01[] = "/vsimem/a/w001001_adf";
   constexpr char kFilenameW1x[] = "/vsimem/a/w001001x_adf";
 
-  autotest2::VsiMemMaybeTempWrapper clr(kFilenameClr, a.clr(), a.has_clr());
-  autotest2::VsiMemMaybeTempWrapper dbl(kFilenameDbl, a.dbl(), a.has_dbl());
-  autotest2::VsiMemMaybeTempWrapper hdr(kFilenameHdr, a.hdr(), a.has_hdr());
-  autotest2::VsiMemMaybeTempWrapper log(kFilenameLog, a.log(), a.has_log());
-  autotest2::VsiMemMaybeTempWrapper xml(kFilenameXml, a.xml(), a.has_xml());
-  autotest2::VsiMemMaybeTempWrapper prj(kFilenamePrj, a.prj(), a.has_prj());
-  autotest2::VsiMemMaybeTempWrapper sta(kFilenameSta, a.sta(), a.has_sta());
-  autotest2::VsiMemMaybeTempWrapper vat(kFilenameVat, a.vat(), a.has_vat());
-  autotest2::VsiMemMaybeTempWrapper w01(kFilenameW01, a.w01(), a.has_w01());
-  autotest2::VsiMemMaybeTempWrapper x1k(kFilenameW1x, a.w1x(), a.has_w1x());
+  autotest2::VsiMemMaybeBufferWrapper clr(kFilenameClr, a.clr(), a.has_clr());
+  autotest2::VsiMemMaybeBufferWrapper dbl(kFilenameDbl, a.dbl(), a.has_dbl());
+  autotest2::VsiMemMaybeBufferWrapper hdr(kFilenameHdr, a.hdr(), a.has_hdr());
+  autotest2::VsiMemMaybeBufferWrapper log(kFilenameLog, a.log(), a.has_log());
+  autotest2::VsiMemMaybeBufferWrapper xml(kFilenameXml, a.xml(), a.has_xml());
+  autotest2::VsiMemMaybeBufferWrapper prj(kFilenamePrj, a.prj(), a.has_prj());
+  autotest2::VsiMemMaybeBufferWrapper sta(kFilenameSta, a.sta(), a.has_sta());
+  autotest2::VsiMemMaybeBufferWrapper vat(kFilenameVat, a.vat(), a.has_vat());
+  autotest2::VsiMemMaybeBufferWrapper w01(kFilenameW01, a.w01(), a.has_w01());
+  autotest2::VsiMemMaybeBufferWrapper x1k(kFilenameW1x, a.w1x(), a.has_w1x());
 
   constexpr char kFilenameInf[] = "/vsimem/info";
   VSIMkdir(kFilenameInf, 0755);
@@ -80,20 +80,33 @@ DEFINE_PROTO_FUZZER(const Aigrid &a) {
   constexpr char kFilenameXml3[] = "/vsimem/info/arc0003.xml";
   constexpr char kFilenameDir[] = "/vsimem/info/arc.dir";
 
-  autotest2::VsiMemMaybeTempWrapper dat0(kFilenameDat0, a.dat0(), a.has_dat0());
-  autotest2::VsiMemMaybeTempWrapper nit0(kFilenameNit0, a.nit0(), a.has_nit0());
-  autotest2::VsiMemMaybeTempWrapper xml0(kFilenameXml0, a.xml0(), a.has_xml0());
-  autotest2::VsiMemMaybeTempWrapper dat1(kFilenameDat1, a.dat1(), a.has_dat1());
-  autotest2::VsiMemMaybeTempWrapper nit1(kFilenameNit1, a.nit1(), a.has_nit1());
-  autotest2::VsiMemMaybeTempWrapper xml1(kFilenameXml1, a.xml1(), a.has_xml1());
-  autotest2::VsiMemMaybeTempWrapper dat2(kFilenameDat2, a.dat2(), a.has_dat2());
-  autotest2::VsiMemMaybeTempWrapper nit2(kFilenameNit2, a.nit2(), a.has_nit2());
-  autotest2::VsiMemMaybeTempWrapper xml2(kFilenameXml2, a.xml2(), a.has_xml2());
-  autotest2::VsiMemMaybeTempWrapper a2r1(kFilenameA2r1, a.a2r1(), a.has_a2r1());
-  autotest2::VsiMemMaybeTempWrapper dat3(kFilenameDat3, a.dat3(), a.has_dat3());
-  autotest2::VsiMemMaybeTempWrapper nit3(kFilenameNit3, a.nit3(), a.has_nit3());
-  autotest2::VsiMemMaybeTempWrapper xml3(kFilenameXml3, a.xml3(), a.has_xml3());
-  autotest2::VsiMemMaybeTempWrapper dir(kFilenameDir, a.dir(), a.has_dir());
+  autotest2::VsiMemMaybeBufferWrapper dat0(kFilenameDat0, a.dat0(),
+                                           a.has_dat0());
+  autotest2::VsiMemMaybeBufferWrapper nit0(kFilenameNit0, a.nit0(),
+                                           a.has_nit0());
+  autotest2::VsiMemMaybeBufferWrapper xml0(kFilenameXml0, a.xml0(),
+                                           a.has_xml0());
+  autotest2::VsiMemMaybeBufferWrapper dat1(kFilenameDat1, a.dat1(),
+                                           a.has_dat1());
+  autotest2::VsiMemMaybeBufferWrapper nit1(kFilenameNit1, a.nit1(),
+                                           a.has_nit1());
+  autotest2::VsiMemMaybeBufferWrapper xml1(kFilenameXml1, a.xml1(),
+                                           a.has_xml1());
+  autotest2::VsiMemMaybeBufferWrapper dat2(kFilenameDat2, a.dat2(),
+                                           a.has_dat2());
+  autotest2::VsiMemMaybeBufferWrapper nit2(kFilenameNit2, a.nit2(),
+                                           a.has_nit2());
+  autotest2::VsiMemMaybeBufferWrapper xml2(kFilenameXml2, a.xml2(),
+                                           a.has_xml2());
+  autotest2::VsiMemMaybeBufferWrapper a2r1(kFilenameA2r1, a.a2r1(),
+                                           a.has_a2r1());
+  autotest2::VsiMemMaybeBufferWrapper dat3(kFilenameDat3, a.dat3(),
+                                           a.has_dat3());
+  autotest2::VsiMemMaybeBufferWrapper nit3(kFilenameNit3, a.nit3(),
+                                           a.has_nit3());
+  autotest2::VsiMemMaybeBufferWrapper xml3(kFilenameXml3, a.xml3(),
+                                           a.has_xml3());
+  autotest2::VsiMemMaybeBufferWrapper dir(kFilenameDir, a.dir(), a.has_dir());
 
   WithQuietHandler error_handler;
 
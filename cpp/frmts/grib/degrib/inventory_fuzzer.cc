@@ -14,7 +14,6 @@
 
 #include <stddef.h>
 #include <stdint.h>
-#include <string>
 
 #include "logging.h"
 #include "third_party/absl/memory/memory.h"
@@ -24,9 +23,8 @@
 
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   const char kFilename[] = "/vsimem/a.grib";
-  const std::string data2(reinterpret_cast<const char *>(data), size);
 
-  autotest2::VsiMemTempWrapper wrapper(kFilename, data2);
+  autotest2::VsiMemBufferWrapper wrapper(kFilename, data, size);
 
   VSILFILE *file = VSIFOpenL(kFilename, "r");
 
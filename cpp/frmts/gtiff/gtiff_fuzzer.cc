@@ -52,17 +52,17 @@ DEFINE_PROTO_FUZZER(const Gtiff &s) {
   const char kFilenameVrt[] = "/vsimem/a.vrt";
   const char kFilenameXml[] = "/vsimem/a.aux.xml";
 
-  autotest2::VsiMemMaybeTempWrapper aux(kFilenameAux, s.aux(), s.has_aux());
-  autotest2::VsiMemMaybeTempWrapper imd(kFilenameImd, s.imd(), s.has_imd());
-  autotest2::VsiMemMaybeTempWrapper ovr(kFilenameOvr, s.ovr(), s.has_ovr());
-  autotest2::VsiMemMaybeTempWrapper prj(kFilenamePrj, s.prj(), s.has_prj());
-  autotest2::VsiMemMaybeTempWrapper rpb(kFilenameRpb, s.rpb(), s.has_rpb());
-  autotest2::VsiMemMaybeTempWrapper rpc(kFilenameRpc, s.rpc(), s.has_rpc());
-  autotest2::VsiMemMaybeTempWrapper rrd(kFilenameRrd, s.rrd(), s.has_rrd());
+  autotest2::VsiMemMaybeBufferWrapper aux(kFilenameAux, s.aux(), s.has_aux());
+  autotest2::VsiMemMaybeBufferWrapper imd(kFilenameImd, s.imd(), s.has_imd());
+  autotest2::VsiMemMaybeBufferWrapper ovr(kFilenameOvr, s.ovr(), s.has_ovr());
+  autotest2::VsiMemMaybeBufferWrapper prj(kFilenamePrj, s.prj(), s.has_prj());
+  autotest2::VsiMemMaybeBufferWrapper rpb(kFilenameRpb, s.rpb(), s.has_rpb());
+  autotest2::VsiMemMaybeBufferWrapper rpc(kFilenameRpc, s.rpc(), s.has_rpc());
+  autotest2::VsiMemMaybeBufferWrapper rrd(kFilenameRrd, s.rrd(), s.has_rrd());
   // tif is required.
-  autotest2::VsiMemMaybeTempWrapper tif(kFilenameTif, s.tif(), true);
-  autotest2::VsiMemMaybeTempWrapper vrt(kFilenameVrt, s.vrt(), s.has_vrt());
-  autotest2::VsiMemMaybeTempWrapper xml(kFilenameXml, s.xml(), s.has_xml());
+  autotest2::VsiMemMaybeBufferWrapper tif(kFilenameTif, s.tif(), true);
+  autotest2::VsiMemMaybeBufferWrapper vrt(kFilenameVrt, s.vrt(), s.has_vrt());
+  autotest2::VsiMemMaybeBufferWrapper xml(kFilenameXml, s.xml(), s.has_xml());
 
   WithQuietHandler error_handler;
 
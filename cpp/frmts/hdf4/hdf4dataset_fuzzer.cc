@@ -17,7 +17,6 @@
 #include <stddef.h>
 #include <stdint.h>
 #include <memory>
-#include <string>
 
 #include "logging.h"
 #include "third_party/absl/memory/memory.h"
@@ -30,8 +29,7 @@
 
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   const char kFilename[] = "/vsimem/a.grib";
-  const string data2(reinterpret_cast<const char *>(data), size);
-  autotest2::VsiMemTempWrapper wrapper(kFilename, data2);
+  autotest2::VsiMemBufferWrapper wrapper(kFilename, data, size);
 
   WithQuietHandler error_handler;
   auto open_info =
@@ -41,13 +41,13 @@ DEFINE_PROTO_FUZZER(const Hfa &s) {
   const char kFilenameVrt[] = "/vsimem/a.vrt";
   const char kFilenameXml[] = "/vsimem/a.aux.xml";
 
-  autotest2::VsiMemMaybeTempWrapper aux(kFilenameAux, s.aux(), s.has_aux());
+  autotest2::VsiMemMaybeBufferWrapper aux(kFilenameAux, s.aux(), s.has_aux());
   // img is required.
-  autotest2::VsiMemMaybeTempWrapper img(kFilenameImg, s.img(), true);
-  autotest2::VsiMemMaybeTempWrapper prj(kFilenamePrj, s.prj(), s.has_prj());
-  autotest2::VsiMemMaybeTempWrapper rrd(kFilenameRrd, s.rrd(), s.has_rrd());
-  autotest2::VsiMemMaybeTempWrapper vrt(kFilenameVrt, s.vrt(), s.has_vrt());
-  autotest2::VsiMemMaybeTempWrapper xml(kFilenameXml, s.xml(), s.has_xml());
+  autotest2::VsiMemMaybeBufferWrapper img(kFilenameImg, s.img(), true);
+  autotest2::VsiMemMaybeBufferWrapper prj(kFilenamePrj, s.prj(), s.has_prj());
+  autotest2::VsiMemMaybeBufferWrapper rrd(kFilenameRrd, s.rrd(), s.has_rrd());
+  autotest2::VsiMemMaybeBufferWrapper vrt(kFilenameVrt, s.vrt(), s.has_vrt());
+  autotest2::VsiMemMaybeBufferWrapper xml(kFilenameXml, s.xml(), s.has_xml());
 
   WithQuietHandler error_handler;
 
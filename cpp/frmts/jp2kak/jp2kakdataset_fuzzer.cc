@@ -15,7 +15,6 @@
 #include <stddef.h>
 #include <stdint.h>
 #include <memory>
-#include <string>
 
 #include "logging.h"
 #include "third_party/absl/memory/memory.h"
@@ -27,8 +26,7 @@
 
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   const char kFilename[] = "/vsimem/a.jp2";
-  const std::string data2(reinterpret_cast<const char *>(data), size);
-  autotest2::VsiMemTempWrapper wrapper(kFilename, data2);
+  autotest2::VsiMemBufferWrapper wrapper(kFilename, data, size);
   std::unique_ptr<GDALOpenInfo> open_info(
       new GDALOpenInfo(kFilename, GDAL_OF_READONLY, nullptr));
   if (open_info == nullptr)
@@ -16,7 +16,6 @@
 #include <stdint.h>
 #include <functional>
 #include <memory>
-#include <string>
 
 #include "logging.h"
 #include "third_party/absl/memory/memory.h"
@@ -33,8 +32,7 @@ constexpr size_t kMaxStrLen = 100000;
 
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   const char kFilename[] = "/vsimem/a.jpg";
-  const std::string data2(reinterpret_cast<const char *>(data), size);
-  autotest2::VsiMemTempWrapper wrapper(kFilename, data2);
+  autotest2::VsiMemBufferWrapper wrapper(kFilename, data, size);
 
   WithQuietHandler error_handler;
   auto open_info =
@@ -40,11 +40,11 @@ DEFINE_PROTO_FUZZER(const Ehdr &s) {
   const char kFilenameVrt[] = "/vsimem/a.vrt";
   const char kFilenameXml[] = "/vsimem/a.aux.xml";
 
-  autotest2::VsiMemMaybeTempWrapper bil(kFilenameBil, s.bil(), true);
-  autotest2::VsiMemMaybeTempWrapper hdr(kFilenameHdr, s.hdr(), true);
-  autotest2::VsiMemMaybeTempWrapper prj(kFilenamePrj, s.prj(), s.has_prj());
-  autotest2::VsiMemMaybeTempWrapper vrt(kFilenameVrt, s.vrt(), s.has_vrt());
-  autotest2::VsiMemMaybeTempWrapper xml(kFilenameXml, s.xml(), s.has_xml());
+  autotest2::VsiMemMaybeBufferWrapper bil(kFilenameBil, s.bil(), true);
+  autotest2::VsiMemMaybeBufferWrapper hdr(kFilenameHdr, s.hdr(), true);
+  autotest2::VsiMemMaybeBufferWrapper prj(kFilenamePrj, s.prj(), s.has_prj());
+  autotest2::VsiMemMaybeBufferWrapper vrt(kFilenameVrt, s.vrt(), s.has_vrt());
+  autotest2::VsiMemMaybeBufferWrapper xml(kFilenameXml, s.xml(), s.has_xml());
 
   WithQuietHandler error_handler;
 
@@ -15,7 +15,6 @@
 #include <stddef.h>
 #include <stdint.h>
 #include <memory>
-#include <string>
 
 #include "third_party/absl/memory/memory.h"
 #include "autotest2/cpp/fuzzers/gdal.h"
@@ -35,11 +34,8 @@ extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   const char kFilenameHdr[] = "/vsimem/a.hdr";
   const char kFilenameDat[] = "/vsimem/a.dat";
   const size_t half = size / 2;
-  const std::string data_hdr(reinterpret_cast<const char *>(data), half);
-  const std::string data_dat(reinterpret_cast<const char *>(data + half),
-                             size - half);
-  autotest2::VsiMemTempWrapper hdr(kFilenameHdr, data_hdr);
-  autotest2::VsiMemTempWrapper dat(kFilenameDat, data_dat);
+  autotest2::VsiMemBufferWrapper hdr(kFilenameHdr, data, half);
+  autotest2::VsiMemBufferWrapper dat(kFilenameDat, data + half, size - half);
   auto open_info =
       absl::make_unique<GDALOpenInfo>(kFilenameDat, GDAL_OF_READONLY, nullptr);
   auto dataset = absl::WrapUnique(ENVIDataset::Open(open_info.get()));
@@ -16,7 +16,6 @@
 #include <stdint.h>
 
 #include <memory>
-#include <string>
 
 #include "logging.h"
 #include "third_party/absl/memory/memory.h"
@@ -28,7 +27,6 @@
 #include "gcore/gdal_priv.h"
 
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
-  const std::string data2(reinterpret_cast<const char *>(data), size);
 
   WithQuietHandler error_handler;
   GDALRegister_SRTMHGT();
@@ -45,7 +43,7 @@ extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
         "/vsimem/n00e006.hgt.gz"
         "/vsimem/n00e006.hgt.zip"
         "/vsimem/n00e006.srtmswbd.raw.zip"}) {
-    autotest2::VsiMemTempWrapper wrapper(filename, data2);
+    autotest2::VsiMemBufferWrapper wrapper(filename, data, size);
     auto dataset = GDALOpen(filename, GA_ReadOnly);
     if (dataset == nullptr) continue;
     autotest2::GDALFuzzOneInput(static_cast<GDALDataset *>(dataset));
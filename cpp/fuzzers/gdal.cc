@@ -14,15 +14,21 @@
 
 // Raster driver fuzzer.
 
-#include "gcore/gdal.h"
+#include "autotest2/cpp/fuzzers/gdal.h"
+
 #include "commandlineflags.h"
 #include "logging.h"
 #include "third_party/absl/flags/flag.h"
 #include "third_party/absl/memory/memory.h"
+#include "third_party/absl/time/clock.h"
+#include "third_party/absl/time/time.h"
 #include "alg/gdal_alg.h"
 #include "autotest2/cpp/util/error_handler.h"
 #include "autotest2/cpp/util/vsimem.h"
+#include "gcore/gdal.h"
+#include "gcore/gdal_frmts.h"
 #include "gcore/gdal_priv.h"
+#include "port/cpl_vsi.h"
 
 // Parsing the command line requires that the calling target is built with this
 // build dependency.  It is okay to go without it.
@@ -30,6 +36,15 @@
 ABSL_FLAG(bool, gdal_deep_fuzz, true,
           "Disable to do light fuzzing.  Generally used for faster fuzzing "
           "to generate initial corpus for a fuzzer.");
+ABSL_FLAG(bool, gdal_create_copy, false,
+          "After deep fuzzing, CreateCopy each dataset to MEM and to a GTiff "
+          "in /vsimem.  Reaches write code and read paths that only "
+          "CreateCopy uses.");
+ABSL_FLAG(int64, gdal_create_copy_max_pixels, 1024 * 1024 * 4,
+          "Largest number of pixels summed over all bands to CreateCopy.");
+ABSL_FLAG(int64, gdal_create_copy_max_bytes, 64 * 1024 * 1024,
+          "Largest number of bytes of pixel data summed over all bands to "
+          "CreateCopy.");
 
 namespace autotest2 {
 
@@ -133,7 +148,73 @@ void GDALFuzzOneInput(GDALDataset *dataset) {
 #endif
   }
 
-  // TODO(schwehr): CreateCopy.
+#if !defined(MEMORY_SANITIZER)
+  if (absl::GetFlag(FLAGS_gdal_create_copy)) {
+    const CreateCopyStats stats = GDALFuzzCreateCopy(
+        dataset, absl::GetFlag(FLAGS_gdal_create_copy_max_pixels),
+        absl::GetFlag(FLAGS_gdal_create_copy_max_bytes));
+    VLOG(1) << "CreateCopy attempted: " << stats.attempted
+            << " MEM: " << stats.mem_ok << " " << stats.mem_time
+            << " GTiff: " << stats.gtiff_ok << " " << stats.gtiff_time << " "
+            << stats.gtiff_bytes << " bytes";
+  }
+#endif
+}
+
+CreateCopyStats GDALFuzzCreateCopy(GDALDataset *dataset, int64_t max_pixels,
+                                   int64_t max_bytes) {
+  constexpr char kFilename[] = "/vsimem/fuzz_create_copy.tif";
+
+  CreateCopyStats stats;
+  if (dataset == nullptr) return stats;
+
+  const int num_bands = dataset->GetRasterCount();
+  if (num_bands < 1) return stats;
+
+  // Check each band before the total so that the sums cannot overflow.
+  const int64_t band_pixels =
+      static_cast<int64_t>(dataset->GetRasterXSize()) *
+      dataset->GetRasterYSize();
+  if (band_pixels > max_pixels / num_bands) return stats;
+  int64_t num_bytes = 0;
+  for (int band_num = 1; band_num < num_bands + 1; band_num++) {
+    GDALRasterBand *band = dataset->GetRasterBand(band_num);
+    CHECK(band);
+    num_bytes +=
+        band_pixels * GDALGetDataTypeSizeBytes(band->GetRasterDataType());
+    if (num_bytes > max_bytes) return stats;
+  }
+  stats.attempted = true;
+
+  GDALRegister_MEM();
+  GDALRegister_GTiff();
+  GDALDriverManager *drv_manager = GetGDALDriverManager();
+
+  GDALDriver *mem_driver = drv_manager->GetDriverByName("MEM");
+  CHECK(mem_driver != nullptr);
+  absl::Time start = absl::Now();
+  GDALDataset *mem_copy = mem_driver->CreateCopy("", dataset, FALSE, nullptr,
+                                                 nullptr, nullptr);
+  stats.mem_time = absl::Now() - start;
+  stats.mem_ok = mem_copy != nullptr;
+  GDALClose(mem_copy);
+
+  GDALDriver *gtiff_driver = drv_manager->GetDriverByName("GTiff");
+  CHECK(gtiff_driver != nullptr);
+  start = absl::Now();
+  GDALDataset *gtiff_copy = gtiff_driver->CreateCopy(
+      kFilename, dataset, FALSE, nullptr, nullptr, nullptr);
+  stats.gtiff_ok = gtiff_copy != nullptr;
+  // Closing flushes the file, so it is part of the time.
+  GDALClose(gtiff_copy);
+  stats.gtiff_time = absl::Now() - start;
+
+  VSIStatBufL stat;
+  if (VSIStatL(kFilename, &stat) == 0) {
+    stats.gtiff_bytes = stat.st_size;
+    VSIUnlink(kFilename);
+  }
+  return stats;
 }
 
 }  // namespace autotest2
@@ -15,15 +15,38 @@
 #ifndef THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_GDAL_H_
 #define THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_GDAL_H_
 
+#include <stdint.h>
+
+#include "third_party/absl/time/time.h"
+
 class GDALDataset;
 
 namespace autotest2 {
 
 // Excecise an open raster dataset through the fuzzer.
 // Problems are detected by the program crashing or leaks being detected by the
-// fuzzing architecture.void GDALFuzzOneInput(GDALDataset *dataset);
+// fuzzing architecture.  With --gdal_create_copy, finishes with
+// GDALFuzzCreateCopy.
 void GDALFuzzOneInput(GDALDataset *dataset);
 
+// What happened in GDALFuzzCreateCopy.
+struct CreateCopyStats {
+  // False if the dataset has no bands or is over a budget.
+  bool attempted = false;
+  bool mem_ok = false;
+  bool gtiff_ok = false;
+  absl::Duration mem_time;
+  absl::Duration gtiff_time;
+  // Size of the GTiff written to /vsimem.  It is deleted before returning.
+  int64_t gtiff_bytes = 0;
+};
+
+// Copies a dataset to MEM and to a GTiff in /vsimem with CreateCopy.  Skips
+// datasets with more than max_pixels pixels or max_bytes bytes summed over
+// all bands.  Registers the MEM and GTiff drivers if needed.
+CreateCopyStats GDALFuzzCreateCopy(GDALDataset *dataset, int64_t max_pixels,
+                                   int64_t max_bytes);
+
 }  // namespace autotest2
 
 #endif  // THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_GDAL_H_
@@ -27,12 +27,14 @@
 
 #include "gunit.h"
 #include "third_party/absl/memory/memory.h"
+#include "third_party/absl/time/time.h"
 #include "autotest2/cpp/fuzzers/gdal.h"
 #include "autotest2/cpp/util/vsimem.h"
 #include "frmts/aaigrid/aaigriddataset.h"
 #include "gcore/gdal.h"
 #include "gcore/gdal_priv.h"
 #include "port/cpl_conv.h"
+#include "port/cpl_vsi.h"
 
 namespace autotest2 {
 namespace {
@@ -63,5 +65,39 @@ TEST(GdalFuzzTest, BasicLayer) {
   GDALFuzzOneInput(dataset.get());
 }
 
+TEST(GdalFuzzTest, CreateCopy) {
+  constexpr char kGrid[] =
+      "ncols        2\n"
+      "nrows        2\n"
+      "xllcorner    440720.0\n"
+      "yllcorner    3750120.0\n"
+      "cellsize     60.0\n"
+      "    107 123\n"
+      "    115 132\n";
+
+  const char kFilename[] = "/vsimem/create_copy.asc";
+  autotest2::VsiMemTempWrapper wrapper(kFilename, kGrid);
+
+  auto open_info =
+      std::make_unique<GDALOpenInfo>(kFilename, GDAL_OF_READONLY, nullptr);
+  auto dataset = absl::WrapUnique(AAIGDataset::Open(open_info.get()));
+  ASSERT_NE(nullptr, dataset);
+
+  const CreateCopyStats stats =
+      GDALFuzzCreateCopy(dataset.get(), 1000, 1000 * 1000);
+  EXPECT_TRUE(stats.attempted);
+  EXPECT_TRUE(stats.mem_ok);
+  EXPECT_TRUE(stats.gtiff_ok);
+  EXPECT_LE(absl::ZeroDuration(), stats.mem_time);
+  EXPECT_LE(absl::ZeroDuration(), stats.gtiff_time);
+  EXPECT_LT(0, stats.gtiff_bytes);
+  EXPECT_EQ(nullptr, VSIFOpenL("/vsimem/fuzz_create_copy.tif", "rb"));
+
+  // Over the pixel and the byte budgets.
+  EXPECT_FALSE(GDALFuzzCreateCopy(dataset.get(), 3, 1000).attempted);
+  EXPECT_FALSE(GDALFuzzCreateCopy(dataset.get(), 1000, 3).attempted);
+  EXPECT_FALSE(GDALFuzzCreateCopy(nullptr, 1000, 1000).attempted);
+}
+
 }  // namespace
 }  // namespace autotest2
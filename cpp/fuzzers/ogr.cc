@@ -15,18 +15,24 @@
 // Vector driver fuzzer.
 
 #include <stdio.h>
+#include <string.h>
+
+#include <algorithm>
+#include <vector>
 
 #include "commandlineflags.h"
 #include "logging.h"
 #include "third_party/absl/cleanup/cleanup.h"
 #include "third_party/absl/flags/flag.h"
 #include "third_party/absl/memory/memory.h"
+#include "autotest2/cpp/fuzzers/ogr.h"
 #include "autotest2/cpp/util/error_handler.h"
 #include "autotest2/cpp/util/vsimem.h"
 #include "gcore/gdal.h"
 #include "gcore/gdal_priv.h"
 #include "ogr/ogr_core.h"
 #include "ogr/ogr_feature.h"
+#include "ogr/ogr_geometry.h"
 #include "ogr/ogrsf_frmts/ogrsf_frmts.h"
 #include "port/cpl_error.h"
 #include "port/cpl_port.h"
@@ -37,21 +43,91 @@
 ABSL_FLAG(bool, ogr_deep_fuzz, true,
           "Disable to do light fuzzing.  Generally used for faster fuzzing "
           "to generate initial corpus for a fuzzer.");
+ABSL_FLAG(bool, ogr_dump_readable, false,
+          "Write each feature to /dev/null with DumpReadable instead of "
+          "reading it with the typed accessors.  Much slower on large "
+          "inputs.  Use to compare coverage.");
 
 namespace autotest2 {
 
+int64_t OGRFuzzFeature(OGRFeature *feature, std::vector<unsigned char> *wkb) {
+  int64_t num_bytes = 0;
+  const int num_fields = feature->GetFieldCount();
+  for (int field = 0; field < num_fields; field++) {
+    if (!feature->IsFieldSetAndNotNull(field)) continue;
+    int count = 0;
+    switch (feature->GetFieldDefnRef(field)->GetType()) {
+      case OFTInteger:
+      case OFTInteger64:
+        feature->GetFieldAsInteger64(field);
+        num_bytes += sizeof(GIntBig);
+        break;
+      case OFTReal:
+        feature->GetFieldAsDouble(field);
+        num_bytes += sizeof(double);
+        break;
+      case OFTIntegerList:
+        feature->GetFieldAsIntegerList(field, &count);
+        num_bytes += count * sizeof(int);
+        break;
+      case OFTInteger64List:
+        feature->GetFieldAsInteger64List(field, &count);
+        num_bytes += count * sizeof(GIntBig);
+        break;
+      case OFTRealList:
+        feature->GetFieldAsDoubleList(field, &count);
+        num_bytes += count * sizeof(double);
+        break;
+      case OFTStringList: {
+        char **values = feature->GetFieldAsStringList(field);
+        for (int i = 0; values != nullptr && values[i] != nullptr; i++)
+          num_bytes += strlen(values[i]);
+        break;
+      }
+      case OFTBinary:
+        feature->GetFieldAsBinary(field, &count);
+        num_bytes += count;
+        break;
+      default:
+        // Strings, dates and times.
+        num_bytes += strlen(feature->GetFieldAsString(field));
+        break;
+    }
+  }
+
+  const int num_geom = feature->GetGeomFieldCount();
+  for (int geom_num = 0; geom_num < num_geom; geom_num++) {
+    const OGRGeometry *geom = feature->GetGeomFieldRef(geom_num);
+    if (geom == nullptr) continue;
+    const size_t size = geom->WkbSize();
+    // Only grows, so large inputs stop allocating after the first features.
+    if (wkb->size() < size) wkb->resize(size);
+    if (geom->exportToWkb(wkbNDR, wkb->data(), wkbVariantIso) == OGRERR_NONE)
+      num_bytes += size;
+  }
+
+  const char *style = feature->GetStyleString();
+  if (style != nullptr) num_bytes += strlen(style);
+  return num_bytes;
+}
+
 void
 OGRFuzzOneInput(GDALDataset *dataset) {
   if (dataset == nullptr) return;
 
   bool ogr_deep_fuzz = absl::GetFlag(FLAGS_ogr_deep_fuzz);
+  const bool dump_readable = absl::GetFlag(FLAGS_ogr_dump_readable);
 
-  FILE *dev_null = fopen("/dev/null", "w");
-  LOG_IF_FIRST_N(INFO, dev_null == nullptr, 1) << "Unable to write to dev_null";
+  FILE *dev_null = dump_readable ? fopen("/dev/null", "w") : nullptr;
+  LOG_IF_FIRST_N(INFO, dump_readable && dev_null == nullptr, 1)
+      << "Unable to write to dev_null";
   auto closer = absl::MakeCleanup([dev_null] {
     if (dev_null != nullptr) fclose(dev_null);
   });
 
+  std::vector<unsigned char> wkb;
+  int64_t num_bytes = 0;
+
   const int layer_count = dataset->GetLayerCount();
   CHECK_LE(0, layer_count);
   for (int layer_num = 0; layer_num < layer_count; layer_num++) {
@@ -72,8 +148,12 @@ OGRFuzzOneInput(GDALDataset *dataset) {
     bool first = true;
 
     while ((feature = layer->GetNextFeature())) {
-      if (dev_null != nullptr)
-        feature->DumpReadable(dev_null);
+      if (dump_readable) {
+        if (dev_null != nullptr)
+          feature->DumpReadable(dev_null);
+      } else {
+        num_bytes += OGRFuzzFeature(feature, &wkb);
+      }
       if (!first) {
         delete feature;
         continue;
@@ -98,6 +178,7 @@ OGRFuzzOneInput(GDALDataset *dataset) {
     CHECK(extent_error >= OGRERR_NONE);
     CHECK(extent_error <= OGRERR_NON_EXISTING_FEATURE);
   }
+  VLOG(1) << "Feature bytes: " << num_bytes;
 }
 
 }  // namespace autotest2
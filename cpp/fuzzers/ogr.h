@@ -15,7 +15,12 @@
 #ifndef THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_OGR_H_
 #define THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_OGR_H_
 
+#include <stdint.h>
+
+#include <vector>
+
 class GDALDataset;
+class OGRFeature;
 
 namespace autotest2 {
 
@@ -24,6 +29,14 @@ namespace autotest2 {
 // fuzzing architecture.
 void OGRFuzzOneInput(GDALDataset *dataset);
 
+// Reads every field, geometry and the style string of a feature through the
+// typed accessors and exports the geometries to WKB in wkb, which is reused
+// between calls.  This touches the same data as DumpReadable without
+// formatting it as text.
+//
+// Returns the number of bytes of field values and WKB seen.
+int64_t OGRFuzzFeature(OGRFeature *feature, std::vector<unsigned char> *wkb);
+
 }  // namespace autotest2
 
 #endif  // THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_OGR_H_
@@ -24,11 +24,15 @@
 #include "autotest2/cpp/fuzzers/ogr.h"
 
 #include <memory>
+#include <vector>
 
 #include "gunit.h"
 #include "third_party/absl/memory/memory.h"
 #include "gcore/gdal.h"
 #include "gcore/gdal_priv.h"
+#include "ogr/ogr_core.h"
+#include "ogr/ogr_feature.h"
+#include "ogr/ogr_geometry.h"
 #include "ogr/ogrsf_frmts/geojson/ogr_geojson.h"
 #include "ogr/ogrsf_frmts/geojson/ogrgeojsonutils.h"
 
@@ -53,5 +57,39 @@ TEST(OgrFuzzTest, BasicLayer) {
   OGRFuzzOneInput(datasource.get());
 }
 
+TEST(OgrFuzzTest, FeatureBytes) {
+  OGRFeatureDefn *defn = new OGRFeatureDefn("defn");
+  defn->Reference();
+  OGRFieldDefn int_field("i", OFTInteger);
+  OGRFieldDefn real_field("r", OFTReal);
+  OGRFieldDefn string_field("s", OFTString);
+  OGRFieldDefn unset_field("u", OFTString);
+  defn->AddFieldDefn(&int_field);
+  defn->AddFieldDefn(&real_field);
+  defn->AddFieldDefn(&string_field);
+  defn->AddFieldDefn(&unset_field);
+
+  {
+    OGRFeature feature(defn);
+    feature.SetField("i", 1);
+    feature.SetField("r", 2.5);
+    feature.SetField("s", "abc");
+    feature.SetGeometryDirectly(new OGRPoint(1, 2));
+
+    std::vector<unsigned char> wkb;
+    // 8 for each number, 3 for the string and 21 for the 2D point.
+    EXPECT_EQ(8 + 8 + 3 + 21, OGRFuzzFeature(&feature, &wkb));
+    ASSERT_EQ(21, wkb.size());
+    EXPECT_EQ(wkbNDR, wkb[0]);
+
+    // The buffer is reused.
+    feature.SetGeometryDirectly(new OGRPoint(3, 4));
+    const unsigned char *data = wkb.data();
+    EXPECT_EQ(8 + 8 + 3 + 21, OGRFuzzFeature(&feature, &wkb));
+    EXPECT_EQ(data, wkb.data());
+  }
+  defn->Release();
+}
+
 }  // namespace
 }  // namespace autotest2
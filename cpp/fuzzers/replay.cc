@@ -0,0 +1,305 @@
+// Copyright 2018 Google Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+// Replay a fuzzer corpus with a wall clock and memory budget per input.
+//
+// Each input runs in a forked process so that a slow or large input can be
+// killed without taking down the rest of the replay.  Like libFuzzer's
+// -rss_limit_mb, the memory budget is on the resident set size.  An address
+// space limit would not work with the sanitizers, whose shadow mappings are
+// larger than any useful budget.
+
+#include "autotest2/cpp/fuzzers/replay.h"
+
+#include <errno.h>
+#include <inttypes.h>
+#include <signal.h>
+#include <stdio.h>
+#include <string.h>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+#include <algorithm>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "logging.h"
+#include "third_party/absl/strings/str_cat.h"
+#include "third_party/absl/strings/str_format.h"
+#include "third_party/absl/time/clock.h"
+#include "third_party/absl/time/time.h"
+#include "autotest2/cpp/fuzzers/gdal.h"
+#include "autotest2/cpp/fuzzers/ogr.h"
+#include "autotest2/cpp/util/error_handler.h"
+#include "gcore/gdal.h"
+#include "gcore/gdal_priv.h"
+#include "port/cpl_conv.h"
+#include "port/cpl_string.h"
+#include "port/cpl_vsi.h"
+
+namespace autotest2 {
+namespace {
+
+// Exit codes of the child process.
+constexpr int kExitOk = 0;
+constexpr int kExitNotOpened = 2;
+
+// How often to check on the running children.  This is the resolution of
+// the wall clock times.
+constexpr absl::Duration kPollInterval = absl::Milliseconds(2);
+
+// Longest driver name sent back from a child.  Less than PIPE_BUF so that
+// the write cannot block.
+constexpr size_t kMaxDriverName = 128;
+
+// Current resident set size of a process in kilobytes.  0 if it has exited
+// or is not known.
+int64_t ResidentKb(pid_t pid) {
+  const std::string filename = absl::StrCat("/proc/", pid, "/statm");
+  FILE *file = fopen(filename.c_str(), "r");
+  if (file == nullptr) return 0;
+  // The second field is the number of resident pages.
+  int64_t resident = 0;
+  const int num_read = fscanf(file, "%*s %" SCNd64, &resident);
+  fclose(file);
+  if (num_read != 1) return 0;
+  return resident * (sysconf(_SC_PAGESIZE) / 1024);
+}
+
+// Runs in the child process and never returns.  Sends the driver name back
+// before fuzzing so that it is known even if the fuzzing does not finish.
+void RunChild(const std::string &path, ReplayMode mode, int fd) {
+  WithQuietHandler error_handler;
+  const unsigned int flags =
+      GDAL_OF_READONLY |
+      (mode == ReplayMode::kGdal ? GDAL_OF_RASTER : GDAL_OF_VECTOR);
+  GDALDataset *dataset = static_cast<GDALDataset *>(
+      GDALOpenEx(path.c_str(), flags, nullptr, nullptr, nullptr));
+  if (dataset == nullptr) _exit(kExitNotOpened);
+
+  const std::string driver =
+      std::string(GDALGetDriverShortName(GDALGetDatasetDriver(dataset)))
+          .substr(0, kMaxDriverName);
+  if (write(fd, driver.c_str(), driver.size()) < 0) {
+    // The report will be missing the driver.
+  }
+  close(fd);
+
+  if (mode == ReplayMode::kGdal) {
+    GDALFuzzOneInput(dataset);
+  } else {
+    OGRFuzzOneInput(dataset);
+  }
+  GDALClose(dataset);
+  _exit(kExitOk);
+}
+
+struct Running {
+  size_t index;
+  pid_t pid;
+  int fd;  // Read end of the pipe for the driver name.
+  absl::Time start;
+  bool killed;
+  // Why the process was killed: kTimeout or kOutOfMemory.
+  ReplayStatus kill_status;
+};
+
+Running Start(size_t index, const std::string &path, ReplayMode mode) {
+  int fds[2];
+  CHECK_EQ(0, pipe(fds)) << strerror(errno);
+  // Do not let the child flush a copy of buffered output.
+  fflush(nullptr);
+  const pid_t pid = fork();
+  CHECK_NE(-1, pid) << strerror(errno);
+  if (pid == 0) {
+    close(fds[0]);
+    RunChild(path, mode, fds[1]);
+  }
+  close(fds[1]);
+  return Running{index, pid, fds[0], absl::Now(), false, ReplayStatus::kOk};
+}
+
+// Kills the process if it is over a budget.
+void CheckBudget(const ReplayBudget &budget, absl::Time now,
+                 Running *running) {
+  if (running->killed) return;
+  if (now - running->start > budget.wall_time) {
+    running->kill_status = ReplayStatus::kTimeout;
+  } else if (budget.memory_mb > 0 &&
+             ResidentKb(running->pid) > budget.memory_mb * 1024) {
+    running->kill_status = ReplayStatus::kOutOfMemory;
+  } else {
+    return;
+  }
+  kill(running->pid, SIGKILL);
+  running->killed = true;
+}
+
+ReplayResult Finish(const Running &running, const std::string &path,
+                    const ReplayBudget &budget, int wait_status,
+                    const struct rusage &usage, absl::Time end) {
+  ReplayResult result;
+  result.path = path;
+  result.wall_time = end - running.start;
+  // Linux reports kilobytes.
+  result.peak_rss_kb = usage.ru_maxrss;
+
+  char buf[kMaxDriverName];
+  ssize_t num_read = 0;
+  while ((num_read = read(running.fd, buf, sizeof(buf))) > 0) {
+    result.driver.append(buf, num_read);
+  }
+  close(running.fd);
+
+  if (running.killed) {
+    result.status = running.kill_status;
+    result.signal = SIGKILL;
+  } else if (WIFSIGNALED(wait_status)) {
+    result.status = ReplayStatus::kCrash;
+    result.signal = WTERMSIG(wait_status);
+  } else if (budget.memory_mb > 0 &&
+             result.peak_rss_kb > budget.memory_mb * 1024) {
+    // Went over between polls.
+    result.status = ReplayStatus::kOutOfMemory;
+  } else if (WEXITSTATUS(wait_status) == kExitOk) {
+    result.status = ReplayStatus::kOk;
+  } else if (WEXITSTATUS(wait_status) == kExitNotOpened) {
+    result.status = ReplayStatus::kNotOpened;
+  } else {
+    result.status = ReplayStatus::kCrash;
+  }
+  return result;
+}
+
+void AppendTable(const std::string &title,
+                 const std::vector<const ReplayResult *> &results, int top_n,
+                 std::string *report) {
+  absl::StrAppend(report, title, ":\n");
+  absl::StrAppendFormat(report, "%4s %10s %9s %-10s %-12s %s\n", "rank",
+                        "wall_ms", "peak_mb", "status", "driver", "path");
+  const int count = std::min(top_n, static_cast<int>(results.size()));
+  for (int rank = 0; rank < count; rank++) {
+    const ReplayResult &result = *results[rank];
+    absl::StrAppendFormat(
+        report, "%4d %10.1f %9.1f %-10s %-12s %s\n", rank + 1,
+        absl::ToDoubleMilliseconds(result.wall_time),
+        result.peak_rss_kb / 1024.0, ReplayStatusName(result.status),
+        result.driver.empty() ? "-" : result.driver, result.path);
+  }
+}
+
+}  // namespace
+
+const char *ReplayStatusName(ReplayStatus status) {
+  switch (status) {
+    case ReplayStatus::kOk:
+      return "ok";
+    case ReplayStatus::kNotOpened:
+      return "not_opened";
+    case ReplayStatus::kTimeout:
+      return "timeout";
+    case ReplayStatus::kOutOfMemory:
+      return "oom";
+    case ReplayStatus::kCrash:
+      return "crash";
+  }
+  return "unknown";
+}
+
+std::vector<std::string> ListCorpus(const std::string &path) {
+  VSIStatBufL stat;
+  if (VSIStatL(path.c_str(), &stat) != 0) return {};
+  if (!VSI_ISDIR(stat.st_mode)) return {path};
+
+  std::vector<std::string> paths;
+  char **filenames = VSIReadDir(path.c_str());
+  for (int i = 0; filenames != nullptr && filenames[i] != nullptr; i++) {
+    const std::string filepath =
+        CPLFormFilename(path.c_str(), filenames[i], nullptr);
+    if (VSIStatL(filepath.c_str(), &stat) == 0 && VSI_ISREG(stat.st_mode)) {
+      paths.push_back(filepath);
+    }
+  }
+  CSLDestroy(filenames);
+  std::sort(paths.begin(), paths.end());
+  return paths;
+}
+
+std::vector<ReplayResult> ReplayCorpus(const std::vector<std::string> &paths,
+                                       ReplayMode mode,
+                                       const ReplayBudget &budget, int jobs) {
+  CHECK_LT(0, jobs);
+  std::vector<ReplayResult> results(paths.size());
+  std::vector<Running> running;
+  size_t next = 0;
+  while (next < paths.size() || !running.empty()) {
+    while (next < paths.size() && static_cast<int>(running.size()) < jobs) {
+      running.push_back(Start(next, paths[next], mode));
+      next++;
+    }
+
+    absl::SleepFor(kPollInterval);
+    const absl::Time now = absl::Now();
+    for (auto it = running.begin(); it != running.end();) {
+      // Check the budgets first so that a process over the wall clock budget
+      // is a timeout even if it exited since the last poll.
+      CheckBudget(budget, now, &*it);
+      int wait_status = 0;
+      struct rusage usage;
+      const pid_t pid = wait4(it->pid, &wait_status, WNOHANG, &usage);
+      CHECK_NE(-1, pid) << strerror(errno);
+      if (pid == 0) {
+        ++it;
+        continue;
+      }
+      results[it->index] =
+          Finish(*it, paths[it->index], budget, wait_status, usage, now);
+      it = running.erase(it);
+    }
+  }
+  return results;
+}
+
+std::string FormatReplayReport(const std::vector<ReplayResult> &results,
+                               int top_n) {
+  std::vector<const ReplayResult *> ranked;
+  for (const auto &result : results) ranked.push_back(&result);
+
+  std::string report;
+  std::stable_sort(ranked.begin(), ranked.end(),
+                   [](const ReplayResult *a, const ReplayResult *b) {
+                     return a->wall_time > b->wall_time;
+                   });
+  AppendTable("Slowest inputs", ranked, top_n, &report);
+
+  std::stable_sort(ranked.begin(), ranked.end(),
+                   [](const ReplayResult *a, const ReplayResult *b) {
+                     return a->peak_rss_kb > b->peak_rss_kb;
+                   });
+  AppendTable("\nLargest inputs", ranked, top_n, &report);
+
+  std::map<std::string, int> counts;
+  for (const auto &result : results) counts[ReplayStatusName(result.status)]++;
+  absl::StrAppend(&report, "\nStatus counts:\n");
+  for (const auto &count : counts) {
+    absl::StrAppendFormat(&report, "%-10s %d\n", count.first, count.second);
+  }
+  return report;
+}
+
+}  // namespace autotest2
@@ -0,0 +1,81 @@
+// Copyright 2018 Google Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_REPLAY_H_
+#define THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_REPLAY_H_
+
+#include <string>
+#include <vector>
+
+#include "third_party/absl/time/time.h"
+
+namespace autotest2 {
+
+// Which fuzz entry point to run each input through.
+enum class ReplayMode { kGdal, kOgr };
+
+enum class ReplayStatus {
+  kOk,           // Opened and went through the fuzzer.
+  kNotOpened,    // No driver would open the input.
+  kTimeout,      // Killed for going over the wall clock budget.
+  kOutOfMemory,  // Went over the memory budget.
+  kCrash,        // Died from a signal or exited with an unexpected code.
+};
+
+const char *ReplayStatusName(ReplayStatus status);
+
+// Limits for each input.
+struct ReplayBudget {
+  absl::Duration wall_time = absl::Seconds(25);
+  // Limit on the resident set size of the process running an input.  0 for
+  // no limit.
+  int64_t memory_mb = 2560;
+};
+
+struct ReplayResult {
+  std::string path;
+  // Short name of the driver that opened the input.  Empty if not opened.
+  std::string driver;
+  ReplayStatus status = ReplayStatus::kOk;
+  absl::Duration wall_time;
+  int64_t peak_rss_kb = 0;
+  // Signal that ended the process for kTimeout and kCrash.
+  int signal = 0;
+};
+
+// Paths of the regular files in a directory, sorted.  If path is a file,
+// just that path.
+std::vector<std::string> ListCorpus(const std::string &path);
+
+// Runs each input through GDALFuzzOneInput or OGRFuzzOneInput in a forked
+// process with up to jobs processes at once.  A process is killed when it
+// goes over the wall clock budget or its resident set size goes over the
+// memory budget.  Both are checked as often as the running processes are
+// polled, and a process that went over the memory budget between polls is
+// still reported as kOutOfMemory.  Drivers must be registered before
+// calling.
+//
+// Returns the results in the same order as paths.
+std::vector<ReplayResult> ReplayCorpus(const std::vector<std::string> &paths,
+                                       ReplayMode mode,
+                                       const ReplayBudget &budget, int jobs);
+
+// Table of the top_n slowest and top_n largest inputs and a count of each
+// status.
+std::string FormatReplayReport(const std::vector<ReplayResult> &results,
+                               int top_n);
+
+}  // namespace autotest2
+
+#endif  // THIRD_PARTY_GDAL_AUTOTEST2_CPP_FUZZERS_REPLAY_H_
@@ -0,0 +1,85 @@
+// Copyright 2018 Google Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+// Replay fuzzer corpora through GDALFuzzOneInput or OGRFuzzOneInput.
+//
+// Usage:
+//   replay --replay_mode=ogr --replay_timeout=10s corpus_dir [file ...]
+//
+// Prints the slowest and largest inputs with the driver that opened each.
+// Exits with 1 if any input went over a budget or crashed.
+
+#include <stdio.h>
+
+#include <string>
+#include <vector>
+
+#include "commandlineflags.h"
+#include "init_google.h"
+#include "logging.h"
+#include "third_party/absl/flags/flag.h"
+#include "third_party/absl/time/time.h"
+#include "autotest2/cpp/fuzzers/replay.h"
+#include "gcore/gdal.h"
+
+ABSL_FLAG(std::string, replay_mode, "gdal",
+          "Fuzz entry point to use: gdal for rasters or ogr for vectors.");
+ABSL_FLAG(int32_t, replay_jobs, 4, "Number of inputs to run at once.");
+ABSL_FLAG(absl::Duration, replay_timeout, absl::Seconds(25),
+          "Wall clock budget for each input.");
+ABSL_FLAG(int64_t, replay_memory_mb, 2560,
+          "Resident set size budget for each input.  0 for no limit.");
+ABSL_FLAG(int32_t, replay_top, 20,
+          "Number of inputs to list in each ranking.");
+
+int main(int argc, char **argv) {
+  InitGoogle(argv[0], &argc, &argv, true);
+  if (argc < 2) {
+    fprintf(stderr, "Usage: %s [flags] corpus_dir_or_file ...\n", argv[0]);
+    return 2;
+  }
+
+  const std::string mode_name = absl::GetFlag(FLAGS_replay_mode);
+  QCHECK(mode_name == "gdal" || mode_name == "ogr")
+      << "--replay_mode must be gdal or ogr: " << mode_name;
+  const autotest2::ReplayMode mode = mode_name == "gdal"
+                                         ? autotest2::ReplayMode::kGdal
+                                         : autotest2::ReplayMode::kOgr;
+
+  autotest2::ReplayBudget budget;
+  budget.wall_time = absl::GetFlag(FLAGS_replay_timeout);
+  budget.memory_mb = absl::GetFlag(FLAGS_replay_memory_mb);
+
+  std::vector<std::string> paths;
+  for (int i = 1; i < argc; i++) {
+    const std::vector<std::string> corpus = autotest2::ListCorpus(argv[i]);
+    LOG_IF(WARNING, corpus.empty()) << "No inputs in " << argv[i];
+    paths.insert(paths.end(), corpus.begin(), corpus.end());
+  }
+
+  GDALAllRegister();
+  const std::vector<autotest2::ReplayResult> results = autotest2::ReplayCorpus(
+      paths, mode, budget, absl::GetFlag(FLAGS_replay_jobs));
+  printf("%s",
+         autotest2::FormatReplayReport(results, absl::GetFlag(FLAGS_replay_top))
+             .c_str());
+
+  for (const auto &result : results) {
+    if (result.status != autotest2::ReplayStatus::kOk &&
+        result.status != autotest2::ReplayStatus::kNotOpened) {
+      return 1;
+    }
+  }
+  return 0;
+}
@@ -0,0 +1,165 @@
+// Copyright 2018 Google Inc. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//
+// Tests the corpus replay for the GDAL and OGR fuzzers.
+
+#include "autotest2/cpp/fuzzers/replay.h"
+
+#include <signal.h>
+#include <stdio.h>
+
+#include <string>
+#include <vector>
+
+#include "file/base/path.h"
+#include "googletest.h"
+#include "gunit.h"
+#include "third_party/absl/flags/flag.h"
+#include "third_party/absl/time/time.h"
+#include "gcore/gdal.h"
+#include "port/cpl_vsi.h"
+
+namespace autotest2 {
+namespace {
+
+constexpr char kGrid[] =
+    "ncols        1\n"
+    "nrows        1\n"
+    "xllcorner    440720.0\n"
+    "yllcorner    3750120.0\n"
+    "cellsize     60.0\n"
+    "    107\n";
+
+constexpr char kCsv[] = "a,b\n1,2\n";
+
+void WriteFile(const std::string &filepath, const std::string &data) {
+  FILE *file = fopen(filepath.c_str(), "wb");
+  ASSERT_NE(nullptr, file);
+  ASSERT_EQ(1, fwrite(data.c_str(), data.size(), 1, file));
+  ASSERT_EQ(0, fclose(file));
+}
+
+class ReplayTest : public ::testing::Test {
+ protected:
+  void SetUp() override {
+    GDALAllRegister();
+    dir_ = file::JoinPath(absl::GetFlag(FLAGS_test_tmpdir), "replay_corpus");
+    ASSERT_EQ(0, VSIMkdir(dir_.c_str(), 0755));
+    WriteFile(file::JoinPath(dir_, "b.asc"), kGrid);
+    WriteFile(file::JoinPath(dir_, "a.csv"), kCsv);
+    WriteFile(file::JoinPath(dir_, "c.bin"), "not a known format");
+  }
+
+  void TearDown() override {
+    for (const auto &filepath : ListCorpus(dir_)) VSIUnlink(filepath.c_str());
+    VSIRmdir(dir_.c_str());
+  }
+
+  std::string dir_;
+};
+
+TEST_F(ReplayTest, ListCorpus) {
+  const std::vector<std::string> expected = {file::JoinPath(dir_, "a.csv"),
+                                             file::JoinPath(dir_, "b.asc"),
+                                             file::JoinPath(dir_, "c.bin")};
+  EXPECT_EQ(expected, ListCorpus(dir_));
+  EXPECT_EQ(std::vector<std::string>{expected[1]}, ListCorpus(expected[1]));
+  EXPECT_TRUE(ListCorpus("/does/not/exist").empty());
+}
+
+TEST_F(ReplayTest, Gdal) {
+  const auto results =
+      ReplayCorpus(ListCorpus(dir_), ReplayMode::kGdal, ReplayBudget(), 2);
+  ASSERT_EQ(3, results.size());
+
+  EXPECT_EQ(file::JoinPath(dir_, "b.asc"), results[1].path);
+  EXPECT_EQ(ReplayStatus::kOk, results[1].status);
+  EXPECT_EQ("AAIGrid", results[1].driver);
+  EXPECT_LT(0, results[1].peak_rss_kb);
+  EXPECT_LT(absl::ZeroDuration(), results[1].wall_time);
+
+  EXPECT_EQ(ReplayStatus::kNotOpened, results[2].status);
+  EXPECT_EQ("", results[2].driver);
+}
+
+TEST_F(ReplayTest, Ogr) {
+  const auto results =
+      ReplayCorpus(ListCorpus(dir_), ReplayMode::kOgr, ReplayBudget(), 1);
+  ASSERT_EQ(3, results.size());
+  EXPECT_EQ(ReplayStatus::kOk, results[0].status);
+  EXPECT_EQ("CSV", results[0].driver);
+  EXPECT_EQ(ReplayStatus::kNotOpened, results[2].status);
+}
+
+TEST_F(ReplayTest, Timeout) {
+  ReplayBudget budget;
+  budget.wall_time = absl::ZeroDuration();
+  const auto results =
+      ReplayCorpus({file::JoinPath(dir_, "b.asc")}, ReplayMode::kGdal, budget,
+                   1);
+  ASSERT_EQ(1, results.size());
+  // Over the budget at the first poll even if the child already exited.
+  EXPECT_EQ(ReplayStatus::kTimeout, results[0].status);
+  EXPECT_EQ(SIGKILL, results[0].signal);
+}
+
+TEST_F(ReplayTest, MemoryBudget) {
+  ReplayBudget budget;
+  // Smaller than any process, so the input is over whether it is caught
+  // while running or from its peak after it exits.
+  budget.memory_mb = 1;
+  const auto results =
+      ReplayCorpus({file::JoinPath(dir_, "b.asc")}, ReplayMode::kGdal, budget,
+                   1);
+  ASSERT_EQ(1, results.size());
+  EXPECT_EQ(ReplayStatus::kOutOfMemory, results[0].status);
+  EXPECT_LT(1024, results[0].peak_rss_kb);
+}
+
+TEST(ReplayReportTest, Rankings) {
+  std::vector<ReplayResult> results(3);
+  results[0].path = "fast_large";
+  results[0].driver = "GTiff";
+  results[0].wall_time = absl::Milliseconds(1);
+  results[0].peak_rss_kb = 4096;
+  results[1].path = "slow_small";
+  results[1].driver = "HFA";
+  results[1].status = ReplayStatus::kTimeout;
+  results[1].wall_time = absl::Seconds(30);
+  results[1].peak_rss_kb = 1024;
+  results[2].path = "unknown";
+  results[2].status = ReplayStatus::kNotOpened;
+
+  const std::string report = FormatReplayReport(results, 1);
+  const size_t slowest = report.find("Slowest inputs");
+  const size_t largest = report.find("Largest inputs");
+  ASSERT_NE(std::string::npos, slowest);
+  ASSERT_NE(std::string::npos, largest);
+
+  const std::string slowest_table = report.substr(slowest, largest - slowest);
+  EXPECT_NE(std::string::npos, slowest_table.find("slow_small"));
+  EXPECT_NE(std::string::npos, slowest_table.find("HFA"));
+  EXPECT_EQ(std::string::npos, slowest_table.find("fast_large"));
+
+  const std::string largest_table = report.substr(largest);
+  EXPECT_NE(std::string::npos, largest_table.find("fast_large"));
+  EXPECT_EQ(std::string::npos, largest_table.find("slow_small"));
+
+  EXPECT_NE(std::string::npos, report.find("timeout    1"));
+  EXPECT_NE(std::string::npos, report.find("not_opened 1"));
+  EXPECT_NE(std::string::npos, report.find("ok         1"));
+}
+
+}  // namespace
+}  // namespace autotest2
@@ -15,12 +15,33 @@
 // limitations under the License.
 
 // MOE:end_strip
+#include <algorithm>
+#include <climits>
+#include <cstring>
+#include <iterator>
+#include <memory>
+#include <vector>
+
+#include "benchmark.h"
 #include "gunit.h"
+#include "logging.h"
+#include "third_party/absl/memory/memory.h"
+#include "third_party/absl/strings/str_cat.h"
 #include "autotest2/cpp/util/error_handler.h"
 #include "gcore/gdal.h"
+#include "gcore/gdal_frmts.h"
+#include "gcore/gdal_priv.h"
 
 namespace {
 
+// Types for the GDALCopyWords tests and benchmarks.
+const GDALDataType kCopyTypes[] = {GDT_Byte,  GDT_UInt16,  GDT_Int16,
+                                   GDT_Int32, GDT_Float32, GDT_Float64};
+
+// Counts around the vector widths so that both the SIMD loops and their
+// tails run.
+const int kCopyCounts[] = {1, 2, 3, 7, 8, 9, 15, 16, 17, 31, 32, 33, 64, 1000};
+
 // TODO(schwehr): Test GDALRasterBand::IRasterIO.
 
 TEST(RasterIoTest, GdalSwapWords) {
@@ -89,9 +110,405 @@ TEST(RasterIoTest, GdalSwapWords) {
   }
 }
 
-// TODO(schwehr): Test GDALCopyWords.
-// TODO(schwehr): Test GDALBandGetBestOverviewLevel.
-// TODO(schwehr): Test GDALRasterBand::OverviewRasterIO.
+TEST(RasterIoTest, GdalSwapWordsMatchesReverse) {
+  // Long enough runs for any vectorized swap and its tail.
+  for (const int word_size : {2, 4, 8}) {
+    for (const int count : kCopyCounts) {
+      std::vector<GByte> buf(word_size * count + 1);
+      for (size_t i = 0; i < buf.size(); i++) buf[i] = static_cast<GByte>(i);
+      std::vector<GByte> expected(buf);
+      for (int word = 0; word < count; word++) {
+        std::reverse(expected.begin() + word * word_size,
+                     expected.begin() + (word + 1) * word_size);
+      }
+      GDALSwapWords(buf.data(), word_size, count, word_size);
+      EXPECT_EQ(expected, buf) << word_size << " " << count;
+    }
+  }
+}
+
+TEST(RasterIoTest, GdalCopyWordsSameTypePacked) {
+  constexpr GByte kGuard = 0xAB;
+  for (const GDALDataType type : kCopyTypes) {
+    const int size = GDALGetDataTypeSizeBytes(type);
+    for (const int count : kCopyCounts) {
+      std::vector<GByte> src(size * count);
+      for (size_t i = 0; i < src.size(); i++)
+        src[i] = static_cast<GByte>(i * 7);
+      // A guard word past the end catches writes beyond count.
+      std::vector<GByte> dst(size * (count + 1), kGuard);
+      GDALCopyWords(src.data(), type, size, dst.data(), type, size, count);
+      EXPECT_EQ(0, memcmp(src.data(), dst.data(), src.size()))
+          << GDALGetDataTypeName(type) << " " << count;
+      EXPECT_EQ(std::vector<GByte>(size, kGuard),
+                std::vector<GByte>(dst.end() - size, dst.end()))
+          << GDALGetDataTypeName(type) << " " << count;
+    }
+  }
+}
+
+template <typename T>
+void CheckCopyFromByte(GDALDataType type) {
+  for (const int count : kCopyCounts) {
+    std::vector<GByte> src(count);
+    for (int i = 0; i < count; i++) src[i] = static_cast<GByte>(i * 3);
+    std::vector<T> dst(count);
+    GDALCopyWords(src.data(), GDT_Byte, 1, dst.data(), type, sizeof(T), count);
+    for (int i = 0; i < count; i++) {
+      EXPECT_EQ(static_cast<T>(src[i]), dst[i])
+          << GDALGetDataTypeName(type) << " " << count << " " << i;
+    }
+  }
+}
+
+TEST(RasterIoTest, GdalCopyWordsFromByte) {
+  CheckCopyFromByte<GUInt16>(GDT_UInt16);
+  CheckCopyFromByte<GInt16>(GDT_Int16);
+  CheckCopyFromByte<GInt32>(GDT_Int32);
+  CheckCopyFromByte<float>(GDT_Float32);
+  CheckCopyFromByte<double>(GDT_Float64);
+}
+
+template <typename S, typename D>
+void CheckCopy(const std::vector<S> &src, GDALDataType src_type,
+               const std::vector<D> &expected, GDALDataType dst_type) {
+  std::vector<D> dst(expected.size());
+  GDALCopyWords(src.data(), src_type, sizeof(S), dst.data(), dst_type,
+                sizeof(D), static_cast<int>(src.size()));
+  EXPECT_EQ(expected, dst) << GDALGetDataTypeName(src_type) << " to "
+                           << GDALGetDataTypeName(dst_type);
+}
+
+TEST(RasterIoTest, GdalCopyWordsClampAndRound) {
+  CheckCopy<float, GByte>({-1.0f, 0.0f, 1.4f, 1.6f, 254.6f, 300.0f},
+                          GDT_Float32, {0, 0, 1, 2, 255, 255}, GDT_Byte);
+  CheckCopy<GInt16, GByte>({-5, 0, 100, 300}, GDT_Int16, {0, 0, 100, 255},
+                           GDT_Byte);
+  CheckCopy<GUInt16, GInt16>({0, 32767, 40000, 65535}, GDT_UInt16,
+                             {0, 32767, 32767, 32767}, GDT_Int16);
+  CheckCopy<GInt32, GUInt16>({-70000, -5, 7, 70000}, GDT_Int32,
+                             {0, 0, 7, 65535}, GDT_UInt16);
+  CheckCopy<double, GInt32>({-1e20, -2.4, 2.6, 1e20}, GDT_Float64,
+                            {INT_MIN, -2, 3, INT_MAX}, GDT_Int32);
+
+  // Long enough for any vectorized conversion.
+  std::vector<float> src;
+  std::vector<GByte> expected;
+  for (int i = 0; i < 100; i++) {
+    src.push_back(i * 4 - 50.0f);
+    expected.push_back(
+        static_cast<GByte>(std::min(255, std::max(0, i * 4 - 50))));
+  }
+  CheckCopy<float, GByte>(src, GDT_Float32, expected, GDT_Byte);
+}
+
+TEST(RasterIoTest, GdalCopyWordsStrides) {
+  // Pick one band out of pixel interleaved RGB.
+  {
+    const GByte src[] = {1, 2, 3, 4, 5, 6, 7, 8, 9};
+    GByte dst[3] = {};
+    GDALCopyWords(src, GDT_Byte, 3, dst, GDT_Byte, 1, 3);
+    EXPECT_EQ(std::vector<GByte>({1, 4, 7}), std::vector<GByte>(dst, dst + 3));
+  }
+
+  // Write into every other byte.
+  {
+    const GByte src[] = {1, 2, 3};
+    GByte dst[5] = {};
+    GDALCopyWords(src, GDT_Byte, 1, dst, GDT_Byte, 2, 3);
+    EXPECT_EQ(std::vector<GByte>({1, 0, 2, 0, 3}),
+              std::vector<GByte>(dst, dst + 5));
+  }
+
+  // A source stride of 0 repeats one value.
+  {
+    const GInt16 src = 42;
+    std::vector<float> dst(5);
+    GDALCopyWords(&src, GDT_Int16, 0, dst.data(), GDT_Float32, sizeof(float),
+                  5);
+    EXPECT_EQ(std::vector<float>(5, 42.0f), dst);
+  }
+
+  // Interleaved source and gapped destination with a type change.
+  for (const int count : kCopyCounts) {
+    std::vector<GInt16> src(count * 3);
+    for (int i = 0; i < count * 3; i++) src[i] = static_cast<GInt16>(i - 50);
+    std::vector<double> dst(count * 2);
+    GDALCopyWords(src.data(), GDT_Int16, 3 * sizeof(GInt16), dst.data(),
+                  GDT_Float64, 2 * sizeof(double), count);
+    for (int i = 0; i < count; i++) {
+      EXPECT_EQ(src[i * 3], dst[i * 2]) << count << " " << i;
+      EXPECT_EQ(0.0, dst[i * 2 + 1]) << count << " " << i;
+    }
+  }
+}
+
+// Benchmarks for the inner loops of RasterIO.
+
+enum CopyLayout { kPacked, kInterleaved, kGapped };
+
+const char *const kCopyLayoutNames[] = {"packed", "interleaved", "gapped"};
+
+// Words between pixels in the source and the destination for each layout.
+// Interleaved reads one band of three.  Gapped writes every other word.
+const int kCopyLayoutSteps[][2] = {{1, 1}, {3, 1}, {1, 2}};
+
+void BM_GdalCopyWords(benchmark::State &state) {
+  const auto src_type = static_cast<GDALDataType>(state.range(0));
+  const auto dst_type = static_cast<GDALDataType>(state.range(1));
+  const int layout = state.range(2);
+  const int count = state.range(3);
+  const int src_size = GDALGetDataTypeSizeBytes(src_type);
+  const int dst_size = GDALGetDataTypeSizeBytes(dst_type);
+  const int src_stride = src_size * kCopyLayoutSteps[layout][0];
+  const int dst_stride = dst_size * kCopyLayoutSteps[layout][1];
+
+  // Values that fit in every type.
+  std::vector<double> values(count * kCopyLayoutSteps[layout][0]);
+  for (size_t i = 0; i < values.size(); i++) values[i] = i % 100;
+  std::vector<GByte> src(values.size() * src_size);
+  GDALCopyWords(values.data(), GDT_Float64, sizeof(double), src.data(),
+                src_type, src_size, static_cast<int>(values.size()));
+  std::vector<GByte> dst(static_cast<size_t>(count) * dst_stride);
+
+  for (auto _ : state) {
+    GDALCopyWords(src.data(), src_type, src_stride, dst.data(), dst_type,
+                  dst_stride, count);
+    benchmark::DoNotOptimize(dst.data());
+  }
+  state.SetItemsProcessed(state.iterations() * count);
+  state.SetBytesProcessed(state.iterations() * count * (src_size + dst_size));
+  state.SetLabel(absl::StrCat(GDALGetDataTypeName(src_type), "->",
+                              GDALGetDataTypeName(dst_type), " ",
+                              kCopyLayoutNames[layout]));
+}
+
+void CopyWordsArgs(benchmark::internal::Benchmark *benchmark) {
+  for (const GDALDataType src_type : kCopyTypes) {
+    for (const GDALDataType dst_type : kCopyTypes) {
+      for (const int layout : {kPacked, kInterleaved, kGapped}) {
+        for (const int count : {256, 65536}) {
+          benchmark->Args({src_type, dst_type, layout, count});
+        }
+      }
+    }
+  }
+}
+
+BENCHMARK(BM_GdalCopyWords)->Apply(CopyWordsArgs);
+
+void BM_GdalSwapWords(benchmark::State &state) {
+  const int word_size = state.range(0);
+  const int count = state.range(1);
+  std::vector<GByte> buf(static_cast<size_t>(word_size) * count);
+  for (size_t i = 0; i < buf.size(); i++) buf[i] = static_cast<GByte>(i);
+
+  for (auto _ : state) {
+    GDALSwapWords(buf.data(), word_size, count, word_size);
+    benchmark::DoNotOptimize(buf.data());
+  }
+  state.SetItemsProcessed(state.iterations() * count);
+  state.SetBytesProcessed(state.iterations() * count * word_size);
+}
+
+BENCHMARK(BM_GdalSwapWords)
+    ->ArgPair(2, 256)
+    ->ArgPair(2, 65536)
+    ->ArgPair(2, 1 << 20)
+    ->ArgPair(4, 256)
+    ->ArgPair(4, 65536)
+    ->ArgPair(4, 1 << 20)
+    ->ArgPair(8, 256)
+    ->ArgPair(8, 65536)
+    ->ArgPair(8, 1 << 20);
+
+// Decimation factors of the overviews in CreatePyramid.
+const int kOverviewFactors[] = {2, 4, 8, 16};
+
+const GDALRIOResampleAlg kResampleAlgs[] = {
+    GRIORA_NearestNeighbour, GRIORA_Bilinear, GRIORA_Cubic,
+    GRIORA_CubicSpline,      GRIORA_Lanczos,  GRIORA_Average,
+    GRIORA_Mode,             GRIORA_Gauss};
+
+const char *ResampleAlgName(GDALRIOResampleAlg resample_alg) {
+  switch (resample_alg) {
+    case GRIORA_NearestNeighbour:
+      return "nearest";
+    case GRIORA_Bilinear:
+      return "bilinear";
+    case GRIORA_Cubic:
+      return "cubic";
+    case GRIORA_CubicSpline:
+      return "cubicspline";
+    case GRIORA_Lanczos:
+      return "lanczos";
+    case GRIORA_Average:
+      return "average";
+    case GRIORA_Mode:
+      return "mode";
+    case GRIORA_Gauss:
+      return "gauss";
+    default:
+      return "other";
+  }
+}
+
+// A size by size Byte MEM dataset.  With overviews, every pixel of overview
+// i is i + 1 and the full resolution pixels are 0, so any resampling of a
+// read gives the level that it came from.
+std::unique_ptr<GDALDataset> CreatePyramid(int size, bool with_overviews) {
+  GDALRegister_MEM();
+  GDALDriver *driver = GetGDALDriverManager()->GetDriverByName("MEM");
+  CHECK(driver != nullptr);
+  auto dataset = absl::WrapUnique(
+      driver->Create("", size, size, 1, GDT_Byte, nullptr));
+  CHECK(dataset != nullptr);
+  if (!with_overviews) return dataset;
+
+  std::vector<int> factors(std::begin(kOverviewFactors),
+                           std::end(kOverviewFactors));
+  const int num_overviews = static_cast<int>(factors.size());
+  CHECK_EQ(CE_None,
+           GDALBuildOverviews(dataset.get(), "NEAREST", num_overviews,
+                              factors.data(), 0, nullptr, nullptr, nullptr));
+  GDALRasterBand *band = dataset->GetRasterBand(1);
+  CHECK_EQ(num_overviews, band->GetOverviewCount());
+  for (int i = 0; i < band->GetOverviewCount(); i++) {
+    CHECK_EQ(CE_None, band->GetOverview(i)->Fill(i + 1));
+  }
+  return dataset;
+}
+
+// Reads the whole band into a buf_size square buffer.
+CPLErr ReadDownsampled(GDALRasterBand *band, int buf_size,
+                       GDALRIOResampleAlg resample_alg,
+                       std::vector<GByte> *buf) {
+  buf->resize(static_cast<size_t>(buf_size) * buf_size);
+  GDALRasterIOExtraArg extra_arg;
+  INIT_RASTERIO_EXTRA_ARG(extra_arg);
+  extra_arg.eResampleAlg = resample_alg;
+  return band->RasterIO(GF_Read, 0, 0, band->GetXSize(), band->GetYSize(),
+                        buf->data(), buf_size, buf_size, GDT_Byte, 0, 0,
+                        &extra_arg);
+}
+
+// Buffer sizes for a 1024 pixel band and the expected level: 0 for full
+// resolution or the overview index + 1.  An overview coarser than asked for
+// is not used, so 3x uses the 2x overview and not the 4x.  The sizes stay
+// clear of the small oversampling allowance for nearest neighbour.
+struct OverviewCase {
+  int buf_size;
+  int level;
+};
+
+const OverviewCase kOverviewCases[] = {
+    {1024, 0}, {683, 0}, {512, 1}, {341, 1}, {256, 2},
+    {171, 2},  {128, 3}, {64, 4},  {32, 4},
+};
+
+TEST(RasterIoTest, GdalBandGetBestOverviewLevel) {
+  auto dataset = CreatePyramid(1024, true);
+  GDALRasterBand *band = dataset->GetRasterBand(1);
+  for (const auto &overview_case : kOverviewCases) {
+    int x_off = 0;
+    int y_off = 0;
+    int x_size = 1024;
+    int y_size = 1024;
+    const int overview = GDALBandGetBestOverviewLevel2(
+        band, x_off, y_off, x_size, y_size, overview_case.buf_size,
+        overview_case.buf_size, nullptr);
+    EXPECT_EQ(overview_case.level - 1, overview) << overview_case.buf_size;
+    if (overview < 0) continue;
+
+    // The window is scaled to the overview.
+    const int expected_size = 1024 / kOverviewFactors[overview];
+    EXPECT_EQ(0, x_off);
+    EXPECT_EQ(0, y_off);
+    EXPECT_EQ(expected_size, x_size) << overview_case.buf_size;
+    EXPECT_EQ(expected_size, y_size) << overview_case.buf_size;
+  }
+}
+
+TEST(RasterIoTest, OverviewRasterIo) {
+  auto dataset = CreatePyramid(1024, true);
+  GDALRasterBand *band = dataset->GetRasterBand(1);
+  std::vector<GByte> buf;
+  for (const GDALRIOResampleAlg resample_alg : kResampleAlgs) {
+    for (const auto &overview_case : kOverviewCases) {
+      ASSERT_EQ(CE_None, ReadDownsampled(band, overview_case.buf_size,
+                                         resample_alg, &buf));
+      EXPECT_EQ(std::vector<GByte>(buf.size(), overview_case.level), buf)
+          << ResampleAlgName(resample_alg) << " buffer "
+          << overview_case.buf_size;
+    }
+  }
+}
+
+TEST(RasterIoTest, OverviewThumbnail) {
+  // A 256 pixel thumbnail of a 4096 pixel band comes from the 16x overview,
+  // which has 256 times fewer pixels to read.  BM_RasterIoDownsample times
+  // the difference.
+  auto pyramid = CreatePyramid(4096, true);
+  GDALRasterBand *band = pyramid->GetRasterBand(1);
+  std::vector<GByte> buf;
+  for (const GDALRIOResampleAlg resample_alg :
+       {GRIORA_NearestNeighbour, GRIORA_Average, GRIORA_Cubic}) {
+    ASSERT_EQ(CE_None, ReadDownsampled(band, 256, resample_alg, &buf));
+    EXPECT_EQ(std::vector<GByte>(buf.size(), 4), buf)
+        << ResampleAlgName(resample_alg);
+  }
+}
+
+// Band size for the RasterIO benchmarks.
+constexpr int kBenchmarkSize = 4096;
+
+GDALRasterBand *BenchmarkBand(bool with_overviews) {
+  // Built once and kept for all of the benchmarks.
+  static GDALDataset *full = CreatePyramid(kBenchmarkSize, false).release();
+  static GDALDataset *pyramid = CreatePyramid(kBenchmarkSize, true).release();
+  return (with_overviews ? pyramid : full)->GetRasterBand(1);
+}
+
+void BM_RasterIoDownsample(benchmark::State &state) {
+  const int buf_size = state.range(0);
+  const auto resample_alg = static_cast<GDALRIOResampleAlg>(state.range(1));
+  const bool with_overviews = state.range(2);
+  GDALRasterBand *band = BenchmarkBand(with_overviews);
+
+  int x_off = 0;
+  int y_off = 0;
+  int x_size = kBenchmarkSize;
+  int y_size = kBenchmarkSize;
+  const int overview = GDALBandGetBestOverviewLevel2(
+      band, x_off, y_off, x_size, y_size, buf_size, buf_size, nullptr);
+
+  std::vector<GByte> buf;
+  for (auto _ : state) {
+    CHECK_EQ(CE_None, ReadDownsampled(band, buf_size, resample_alg, &buf));
+    benchmark::DoNotOptimize(buf.data());
+  }
+  state.SetItemsProcessed(state.iterations() * buf_size * buf_size);
+  state.counters["overview"] = overview;
+  state.SetLabel(absl::StrCat(ResampleAlgName(resample_alg),
+                              with_overviews ? " overviews" : " full"));
+}
+
+void RasterIoDownsampleArgs(benchmark::internal::Benchmark *benchmark) {
+  for (const int buf_size : {2048, 1024, 512, 256, 128}) {
+    for (const GDALRIOResampleAlg resample_alg :
+         {GRIORA_NearestNeighbour, GRIORA_Bilinear, GRIORA_Cubic,
+          GRIORA_Average, GRIORA_Mode}) {
+      for (const int with_overviews : {0, 1}) {
+        benchmark->Args({buf_size, resample_alg, with_overviews});
+      }
+    }
+  }
+}
+
+BENCHMARK(BM_RasterIoDownsample)
+    ->Apply(RasterIoDownsampleArgs)
+    ->Unit(benchmark::kMicrosecond);
+
 // TODO(schwehr): Test GDALDataset::BlockBasedRasterIO.
 // TODO(schwehr): Test GDALDatasetCopyWholeRaster.
 // TODO(schwehr): Test GDALRasterBandCopyWholeRaster.
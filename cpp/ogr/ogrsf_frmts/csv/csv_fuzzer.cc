@@ -18,7 +18,6 @@
 #include <stddef.h>
 #include <stdint.h>
 #include <memory>
-#include <string>
 
 #include "logging.h"
 #include "autotest2/cpp/util/vsimem.h"
@@ -28,8 +27,7 @@
 
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   const char kFilename[] = "/vsimem/a";
-  const string data2(reinterpret_cast<const char *>(data), size);
-  autotest2::VsiMemTempWrapper wrapper(kFilename, data2);
+  autotest2::VsiMemBufferWrapper wrapper(kFilename, data, size);
   std::unique_ptr<OGRCSVDataSource> dataset(new OGRCSVDataSource);
   const int result = dataset->Open(kFilename, FALSE, FALSE, nullptr);
   CHECK(result == FALSE || result == TRUE);
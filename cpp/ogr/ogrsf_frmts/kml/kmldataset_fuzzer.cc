@@ -15,7 +15,6 @@
 #include <stddef.h>
 #include <stdint.h>
 #include <memory>
-#include <string>
 
 #include "logging.h"
 #include "absl/memory/memory.h"
@@ -32,8 +31,7 @@ extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   WithQuietHandler handler;
 
   const char kFilename[] = "/vsimem/a.kml";
-  const string data2(reinterpret_cast<const char *>(data), size);
-  autotest2::VsiMemTempWrapper file(kFilename, data2);
+  autotest2::VsiMemBufferWrapper file(kFilename, data, size);
   auto dataset = absl::make_unique<OGRKMLDataSource>();
   const int result = dataset->Open(kFilename, FALSE);
   CHECK(result == FALSE || result == TRUE);
@@ -45,7 +45,7 @@ DEFINE_PROTO_FUZZER(const Mitab &m) {
 
   // Try with just the map file.
   const char kFilenameMap[] = "/vsimem/a.map";
-  autotest2::VsiMemMaybeTempWrapper map(kFilenameMap, m.map(), m.has_map());
+  autotest2::VsiMemMaybeBufferWrapper map(kFilenameMap, m.map(), m.has_map());
   auto open_info =
       gtl::MakeUnique<GDALOpenInfo>(kFilenameMap, GDAL_OF_READONLY, nullptr);
   TryMitab(open_info.get());
@@ -59,36 +59,36 @@ DEFINE_PROTO_FUZZER(const Mitab &m) {
 
   // Try each available file with the .map by itself.
   if (m.has_mif()) {
-    autotest2::VsiMemTempWrapper mif(kFilenameMif, m.mif());
+    autotest2::VsiMemBufferWrapper mif(kFilenameMif, m.mif());
     TryMitab(open_info.get());
   }
   if (m.has_mid()) {
-    autotest2::VsiMemTempWrapper mid(kFilenameMid, m.mid());
+    autotest2::VsiMemBufferWrapper mid(kFilenameMid, m.mid());
     TryMitab(open_info.get());
   }
   if (m.has_tab()) {
-    autotest2::VsiMemTempWrapper tab(kFilenameTab, m.tab());
+    autotest2::VsiMemBufferWrapper tab(kFilenameTab, m.tab());
     TryMitab(open_info.get());
   }
   if (m.has_ind()) {
-    autotest2::VsiMemTempWrapper ind(kFilenameInd, m.ind());
+    autotest2::VsiMemBufferWrapper ind(kFilenameInd, m.ind());
     TryMitab(open_info.get());
   }
   if (m.has_dat()) {
-    autotest2::VsiMemTempWrapper dat(kFilenameDat, m.dat());
+    autotest2::VsiMemBufferWrapper dat(kFilenameDat, m.dat());
     TryMitab(open_info.get());
   }
   if (m.has_id()) {
-    autotest2::VsiMemTempWrapper id(kFilenameId, m.id());
+    autotest2::VsiMemBufferWrapper id(kFilenameId, m.id());
     TryMitab(open_info.get());
   }
 
   // Try again with all available files written to vsimem.
-  autotest2::VsiMemMaybeTempWrapper mif(kFilenameMif, m.mif(), m.has_mif());
-  autotest2::VsiMemMaybeTempWrapper mid(kFilenameMid, m.mid(), m.has_mid());
-  autotest2::VsiMemMaybeTempWrapper tab(kFilenameTab, m.tab(), m.has_tab());
-  autotest2::VsiMemMaybeTempWrapper ind(kFilenameInd, m.ind(), m.has_ind());
-  autotest2::VsiMemMaybeTempWrapper dat(kFilenameDat, m.dat(), m.has_dat());
-  autotest2::VsiMemMaybeTempWrapper id(kFilenameId, m.id(), m.has_id());
+  autotest2::VsiMemMaybeBufferWrapper mif(kFilenameMif, m.mif(), m.has_mif());
+  autotest2::VsiMemMaybeBufferWrapper mid(kFilenameMid, m.mid(), m.has_mid());
+  autotest2::VsiMemMaybeBufferWrapper tab(kFilenameTab, m.tab(), m.has_tab());
+  autotest2::VsiMemMaybeBufferWrapper ind(kFilenameInd, m.ind(), m.has_ind());
+  autotest2::VsiMemMaybeBufferWrapper dat(kFilenameDat, m.dat(), m.has_dat());
+  autotest2::VsiMemMaybeBufferWrapper id(kFilenameId, m.id(), m.has_id());
   TryMitab(open_info.get());
 }
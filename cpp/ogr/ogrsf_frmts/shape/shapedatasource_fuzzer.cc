@@ -44,7 +44,7 @@ DEFINE_PROTO_FUZZER(const Shape &s) {
   WithQuietHandler handler;
 
   const char kFilenameShp[] = "/vsimem/a.shp";
-  autotest2::VsiMemMaybeTempWrapper shp(kFilenameShp, s.shp(), s.has_shp());
+  autotest2::VsiMemMaybeBufferWrapper shp(kFilenameShp, s.shp(), s.has_shp());
 
   auto open_info =
       gtl::MakeUnique<GDALOpenInfo>(kFilenameShp, GDAL_OF_READONLY, nullptr);
@@ -63,46 +63,46 @@ DEFINE_PROTO_FUZZER(const Shape &s) {
 
   // Try each available file with the .shp by itself.
   if (s.has_cpg()) {
-    autotest2::VsiMemTempWrapper cpg(kFilenameCpg, s.cpg());
+    autotest2::VsiMemBufferWrapper cpg(kFilenameCpg, s.cpg());
     TryShape(open_info.get());
   }
   if (s.has_dbf()) {
-    autotest2::VsiMemTempWrapper dbf(kFilenameDbf, s.dbf());
+    autotest2::VsiMemBufferWrapper dbf(kFilenameDbf, s.dbf());
     TryShape(open_info.get());
   }
   if (s.has_idm()) {
-    autotest2::VsiMemTempWrapper idm(kFilenameIdm, s.idm());
+    autotest2::VsiMemBufferWrapper idm(kFilenameIdm, s.idm());
     TryShape(open_info.get());
   }
   if (s.has_ind()) {
-    autotest2::VsiMemTempWrapper ind(kFilenameInd, s.ind());
+    autotest2::VsiMemBufferWrapper ind(kFilenameInd, s.ind());
     TryShape(open_info.get());
   }
   if (s.has_qix()) {
-    autotest2::VsiMemTempWrapper qix(kFilenameQix, s.qix());
+    autotest2::VsiMemBufferWrapper qix(kFilenameQix, s.qix());
     TryShape(open_info.get());
   }
   if (s.has_prj()) {
-    autotest2::VsiMemTempWrapper prj(kFilenamePrj, s.prj());
+    autotest2::VsiMemBufferWrapper prj(kFilenamePrj, s.prj());
     TryShape(open_info.get());
   }
   if (s.has_sbn()) {
-    autotest2::VsiMemTempWrapper sbn(kFilenameSbn, s.sbn());
+    autotest2::VsiMemBufferWrapper sbn(kFilenameSbn, s.sbn());
     TryShape(open_info.get());
   }
   if (s.has_shx()) {
-    autotest2::VsiMemTempWrapper shx(kFilenameShx, s.shx());
+    autotest2::VsiMemBufferWrapper shx(kFilenameShx, s.shx());
     TryShape(open_info.get());
   }
 
   // Try again with all available files written to vsimem.
-  autotest2::VsiMemMaybeTempWrapper cpg(kFilenameCpg, s.cpg(), s.has_cpg());
-  autotest2::VsiMemMaybeTempWrapper dbf(kFilenameDbf, s.dbf(), s.has_dbf());
-  autotest2::VsiMemMaybeTempWrapper idm(kFilenameIdm, s.idm(), s.has_idm());
-  autotest2::VsiMemMaybeTempWrapper ind(kFilenameInd, s.ind(), s.has_ind());
-  autotest2::VsiMemMaybeTempWrapper qix(kFilenameQix, s.qix(), s.has_qix());
-  autotest2::VsiMemMaybeTempWrapper prj(kFilenamePrj, s.prj(), s.has_prj());
-  autotest2::VsiMemMaybeTempWrapper sbn(kFilenameSbn, s.sbn(), s.has_sbn());
-  autotest2::VsiMemMaybeTempWrapper shx(kFilenameShx, s.shx(), s.has_shx());
+  autotest2::VsiMemMaybeBufferWrapper cpg(kFilenameCpg, s.cpg(), s.has_cpg());
+  autotest2::VsiMemMaybeBufferWrapper dbf(kFilenameDbf, s.dbf(), s.has_dbf());
+  autotest2::VsiMemMaybeBufferWrapper idm(kFilenameIdm, s.idm(), s.has_idm());
+  autotest2::VsiMemMaybeBufferWrapper ind(kFilenameInd, s.ind(), s.has_ind());
+  autotest2::VsiMemMaybeBufferWrapper qix(kFilenameQix, s.qix(), s.has_qix());
+  autotest2::VsiMemMaybeBufferWrapper prj(kFilenamePrj, s.prj(), s.has_prj());
+  autotest2::VsiMemMaybeBufferWrapper sbn(kFilenameSbn, s.sbn(), s.has_sbn());
+  autotest2::VsiMemMaybeBufferWrapper shx(kFilenameShx, s.shx(), s.has_shx());
   TryShape(open_info.get());
 }
@@ -14,7 +14,6 @@
 
 #include <stddef.h>
 #include <stdint.h>
-#include <string>
 
 #include "logging.h"
 #include "autotest2/cpp/util/error_handler.h"
@@ -41,8 +40,7 @@ extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
   // A single slash between the two vsi paths does not work:
   //   /vsigzip/vsimem/a
   const char kFilenameGzip[] = "/vsigzip//vsimem/a";
-  const std::string data2(reinterpret_cast<const char *>(data), size);
-  autotest2::VsiMemTempWrapper wrapper(kFilename, data2);
+  autotest2::VsiMemBufferWrapper wrapper(kFilename, data, size);
 
   WithQuietHandler error_handler;
 
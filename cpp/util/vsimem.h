@@ -1,6 +1,8 @@
 #ifndef THIRD_PARTY_GDAL_AUTOTEST2_CPP_UTIL_VSIMEM_H_
 #define THIRD_PARTY_GDAL_AUTOTEST2_CPP_UTIL_VSIMEM_H_
 
+#include <stddef.h>
+
 #include <string>
 #include "logging.h"
 #include "port/cpl_vsi.h"
@@ -47,6 +49,59 @@ class VsiMemMaybeTempWrapper {
   bool do_it_;
 };
 
+// Makes a buffer available as a file in the in-memory filesystem without
+// copying it and deletes the file when the instance goes out of scope.  The
+// caller keeps ownership of the buffer, which must outlive the instance and
+// must only be read through the file.
+class VsiMemBufferWrapper {
+ public:
+  VsiMemBufferWrapper(const std::string &filename, const void *data,
+                      size_t size)
+      : filename_(filename) {
+    VSILFILE *file = VSIFileFromMemBuffer(
+        filename.c_str(),
+        static_cast<GByte *>(const_cast<void *>(data)), size, FALSE);
+    CHECK_NE(nullptr, file);
+    CHECK_EQ(0, VSIFCloseL(file));
+  }
+  VsiMemBufferWrapper(const std::string &filename, const std::string &data)
+      : VsiMemBufferWrapper(filename, data.c_str(), data.length()) {}
+  // The file would point into a destroyed temporary.
+  VsiMemBufferWrapper(const std::string &filename, std::string &&data) = delete;
+  ~VsiMemBufferWrapper() { CHECK_EQ(0, VSIUnlink(filename_.c_str())); }
+
+ private:
+  std::string filename_;
+};
+
+// Makes a buffer available as a file in the in-memory filesystem without
+// copying it and deletes the file when the instance goes out of scope.  The
+// buffer must outlive the instance.
+class VsiMemMaybeBufferWrapper {
+ public:
+  VsiMemMaybeBufferWrapper(const std::string &filename,
+                           const std::string &data, bool do_it)
+      : filename_(filename), do_it_(do_it) {
+    if (!do_it_) return;
+    VSILFILE *file = VSIFileFromMemBuffer(
+        filename.c_str(),
+        reinterpret_cast<GByte *>(const_cast<char *>(data.c_str())),
+        data.length(), FALSE);
+    CHECK_NE(nullptr, file);
+    CHECK_EQ(0, VSIFCloseL(file));
+  }
+  VsiMemMaybeBufferWrapper(const std::string &filename, std::string &&data,
+                           bool do_it) = delete;
+  ~VsiMemMaybeBufferWrapper() {
+    if (!do_it_) return;
+    CHECK_EQ(0, VSIUnlink(filename_.c_str()));
+  }
+
+ private:
+  std::string filename_;
+  bool do_it_;
+};
+
 }  // namespace autotest2
 
 #endif  // THIRD_PARTY_GDAL_AUTOTEST2_CPP_UTIL_VSIMEM_H_
@@ -16,6 +16,7 @@
 #include <vector>
 
 #include "autotest2/cpp/util/vsimem.h"
+#include "benchmark.h"
 #include "gunit.h"
 
 namespace autotest2 {
@@ -56,5 +57,78 @@ TEST(VsimemTest, VsiMemMaybeTempWrapper) {
   EXPECT_EQ(nullptr, VSIFOpenL(kFilename, "rb"));
 }
 
+std::string ReadAll(const char *filename) {
+  VSILFILE *file = VSIFOpenL(filename, "rb");
+  if (file == nullptr) return "";
+  std::vector<char> buf(100, 0);
+  const size_t num_read = VSIFReadL(&buf[0], 1, buf.size(), file);
+  EXPECT_EQ(0, VSIFCloseL(file));
+  return std::string(buf.data(), num_read);
+}
+
+TEST(VsimemTest, VsiMemBufferWrapper) {
+  const char kFilename[] = "/vsimem/e";
+  std::string data = "fgh";
+  {
+    VsiMemBufferWrapper wrapper(kFilename, data);
+    EXPECT_EQ("fgh", ReadAll(kFilename));
+
+    // The file is the caller's buffer, not a copy.
+    data[1] = 'x';
+    EXPECT_EQ("fxh", ReadAll(kFilename));
+  }
+
+  EXPECT_EQ(nullptr, VSIFOpenL(kFilename, "rb"));
+  EXPECT_EQ("fxh", data);
+}
+
+TEST(VsimemTest, VsiMemBufferWrapperPointer) {
+  const char kFilename[] = "/vsimem/i";
+  const unsigned char kData[] = {'j', 'k', 'l'};
+  {
+    VsiMemBufferWrapper wrapper(kFilename, kData, 2);
+    EXPECT_EQ("jk", ReadAll(kFilename));
+  }
+
+  EXPECT_EQ(nullptr, VSIFOpenL(kFilename, "rb"));
+}
+
+TEST(VsimemTest, VsiMemMaybeBufferWrapper) {
+  const char kFilename[] = "/vsimem/m";
+  const std::string kData = "n";
+  {
+    VsiMemMaybeBufferWrapper wrapper(kFilename, kData, false);
+    EXPECT_EQ(nullptr, VSIFOpenL(kFilename, "rb"));
+  }
+
+  {
+    VsiMemMaybeBufferWrapper wrapper(kFilename, kData, true);
+    EXPECT_EQ("n", ReadAll(kFilename));
+  }
+
+  EXPECT_EQ(nullptr, VSIFOpenL(kFilename, "rb"));
+}
+
+// Creating and deleting a file of state.range(0) bytes by copying versus
+// pointing at the buffer.
+
+void BM_VsiMemTempWrapper(benchmark::State &state) {
+  const std::string data(state.range(0), 'a');
+  for (auto _ : state) {
+    VsiMemTempWrapper wrapper("/vsimem/benchmark", data);
+  }
+  state.SetBytesProcessed(state.iterations() * data.length());
+}
+BENCHMARK(BM_VsiMemTempWrapper)->Range(1 << 10, 1 << 24);
+
+void BM_VsiMemBufferWrapper(benchmark::State &state) {
+  const std::string data(state.range(0), 'a');
+  for (auto _ : state) {
+    VsiMemBufferWrapper wrapper("/vsimem/benchmark", data);
+  }
+  state.SetBytesProcessed(state.iterations() * data.length());
+}
+BENCHMARK(BM_VsiMemBufferWrapper)->Range(1 << 10, 1 << 24);
+
 }  // namespace
 }  // namespace autotest2
@@ -0,0 +1,503 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Support for the tests of the gdal command line applications.
+
+Runs gdalinfo, ogrinfo, gdalbuildvrt and gdal_rasterize in-process through
+the gdal.Info, gdal.VectorInfo, gdal.BuildVRT and gdal.Rasterize option
+APIs and gdal2tiles through osgeo_utils.  Each runner takes the same options
+as the command line tool.  Pass in_process=False to start the binary instead
+for tests of the command line parsing.  The binaries are found in the
+AUTOTEST2_APPS_DIR config option or environment variable, or else on the
+PATH.
+
+Also provides an in-process cloud optimized GeoTIFF (COG) validator so that
+tests and bulk checks do not have to start validate_cloud_optimized_geotiff
+and parse its output.  The checks mirror those done by:
+
+http://trac.osgeo.org/gdal/browser/trunk/gdal/swig/python/samples/validate_cloud_optimized_geotiff.py
+"""
+
+import collections
+import fnmatch
+import json
+import math
+from multiprocessing.pool import ThreadPool
+import os
+import subprocess
+import unittest
+
+from osgeo import gdal
+from osgeo import osr
+
+import gflags as flags
+import logging
+import six
+from autotest2.gcore import gcore_util
+
+try:
+  from osgeo_utils import gdal2tiles
+except ImportError:
+  gdal2tiles = None
+
+FLAGS = flags.FLAGS
+
+# A file larger than this in either dimension must be tiled and have
+# overviews to be a COG.
+COG_MAX_UNTILED_SIZE = 512
+
+# Strip based files can have a block width equal to the width of the image.
+# Only complain about wide blocks larger than this.
+COG_MAX_STRIP_WIDTH = 1024
+
+# IFD offsets of the first image for ClassicTIFF and BigTIFF.
+COG_MAIN_IFD_OFFSETS = (8, 16)
+
+# Half the circumference of the earth in EPSG:3857 meters, which puts the
+# origin of the gdal2tiles mercator profile at the lower left.
+MERCATOR_ORIGIN_SHIFT = math.pi * 6378137.0
+
+TILE_SIZE = 256
+
+
+def GetTestFilePath(filename):
+  return os.path.join(
+      FLAGS.test_srcdir,
+      'autotest2/python/apps/testdata',
+      filename
+      )
+
+
+def FindBinary(name):
+  """Path to a command line tool or None if it cannot be found."""
+  apps_dir = gdal.GetConfigOption('AUTOTEST2_APPS_DIR')
+  dirpaths = [apps_dir] if apps_dir else os.environ.get(
+      'PATH', '').split(os.pathsep)
+  for dirpath in dirpaths:
+    filepath = os.path.join(dirpath, name)
+    if os.path.isfile(filepath) and os.access(filepath, os.X_OK):
+      return filepath
+  return None
+
+
+def RunBinary(name, args):
+  """Run a command line tool and return what it wrote to stdout as a str.
+
+  Raises:
+    subprocess.CalledProcessError: If the tool fails.
+  """
+  binary = FindBinary(name)
+  if not binary:
+    raise OSError('Unable to find %s' % name)
+  cmd = [binary] + list(args)
+  logging.info('Running: %s', ' '.join(cmd))
+  output = subprocess.check_output(cmd)
+  if not isinstance(output, six.string_types):
+    output = output.decode('utf-8')
+  return output
+
+
+def SkipIfBinaryMissing(name):
+  """Decorator for tests that need the command line tool name."""
+  def _IdReturn(obj):
+    return obj
+
+  if FindBinary(name):
+    return _IdReturn
+  return unittest.skip('%s not found' % name)
+
+
+def _Format(options):
+  """Split -json from options for the gdal.*Info format argument."""
+  options = list(options or [])
+  if '-json' in options:
+    return [option for option in options if option != '-json'], 'json'
+  return options, 'text'
+
+
+def _Open(filepath, open_flags):
+  if not isinstance(filepath, six.string_types):
+    return filepath
+  src = gdal.OpenEx(filepath, open_flags)
+  if src is None:
+    raise RuntimeError('Unable to open %s: %s' %
+                       (filepath, gdal.GetLastErrorMsg()))
+  return src
+
+
+def GdalInfo(filepath, options=None, in_process=True):
+  """Run gdalinfo on a raster.
+
+  Args:
+    filepath: str path or gdal.Dataset.  Must be a str when not in_process.
+    options: List of str gdalinfo options.  e.g. ['-mm', '-json'].
+    in_process: Set to False to run the gdalinfo binary.
+
+  Returns:
+    A dictionary with -json, otherwise the text report.
+  """
+  if not in_process:
+    output = RunBinary('gdalinfo', list(options or []) + [filepath])
+    return json.loads(output) if '-json' in (options or []) else output
+  options, output_format = _Format(options)
+  return gdal.Info(_Open(filepath, gdal.OF_RASTER), options=options,
+                   format=output_format)
+
+
+def OgrInfo(filepath, options=None, layers=None, in_process=True):
+  """Run ogrinfo on a vector datasource.
+
+  Args:
+    filepath: str path, inline GeoJSON or gdal.Dataset.  Must be a str when
+      not in_process.
+    options: List of str ogrinfo options.  e.g. ['-ro', '-al'].
+    layers: Optional list of str layer names to report.
+    in_process: Set to False to run the ogrinfo binary.  This is also used
+      if the bindings are too old to have gdal.VectorInfo.
+
+  Returns:
+    A dictionary with -json, otherwise the text report.
+  """
+  if not hasattr(gdal, 'VectorInfo') and in_process:
+    logging.info('gdal.VectorInfo is missing.  Running ogrinfo.')
+    in_process = False
+  if not in_process:
+    output = RunBinary(
+        'ogrinfo', list(options or []) + [filepath] + list(layers or []))
+    return json.loads(output) if '-json' in (options or []) else output
+  options, output_format = _Format(options)
+  return gdal.VectorInfo(_Open(filepath, gdal.OF_VECTOR),
+                         options=options + list(layers or []),
+                         format=output_format)
+
+
+def BuildVrt(dst_filepath, src_filepaths, options=None, in_process=True):
+  """Run gdalbuildvrt.
+
+  Args:
+    dst_filepath: str, Where to write the VRT.  Not a /vsimem path when not
+      in_process.
+    src_filepaths: List of str input rasters.
+    options: List of str gdalbuildvrt options.  e.g. ['-separate'].
+    in_process: Set to False to run the gdalbuildvrt binary.
+
+  Returns:
+    The VRT as a gdal.Dataset.
+  """
+  if not in_process:
+    RunBinary('gdalbuildvrt',
+              ['-q'] + list(options or []) + [dst_filepath] +
+              list(src_filepaths))
+    return gdal.Open(dst_filepath)
+  return gdal.BuildVRT(dst_filepath, list(src_filepaths),
+                       options=list(options or []))
+
+
+def Rasterize(dst_filepath, src_filepath, options=None, in_process=True):
+  """Run gdal_rasterize to create a new raster.
+
+  Args:
+    dst_filepath: str, Where to write the raster.  Not a /vsimem path when not
+      in_process.
+    src_filepath: str, Vector datasource to burn.
+    options: List of str gdal_rasterize options.  e.g. ['-burn', '1'].
+    in_process: Set to False to run the gdal_rasterize binary.
+
+  Returns:
+    The output as a gdal.Dataset.
+  """
+  if not in_process:
+    RunBinary('gdal_rasterize',
+              ['-q'] + list(options or []) + [src_filepath, dst_filepath])
+    return gdal.Open(dst_filepath)
+  return gdal.Rasterize(dst_filepath, _Open(src_filepath, gdal.OF_VECTOR),
+                        options=list(options or []))
+
+
+def Gdal2Tiles(src_filepath, dst_dirpath, options=None, in_process=True):
+  """Run gdal2tiles to write a tile pyramid.
+
+  Args:
+    src_filepath: str, Input raster.
+    dst_dirpath: str, Directory for the tiles.
+    options: List of str gdal2tiles options.  e.g. ['-z', '10-12'].
+    in_process: Set to False to run the gdal2tiles script.  This is also
+      used if osgeo_utils is missing.
+
+  Raises:
+    RuntimeError: If gdal2tiles fails in-process.
+  """
+  args = ['-q'] + list(options or []) + [src_filepath, dst_dirpath]
+  if gdal2tiles is None and in_process:
+    logging.info('osgeo_utils.gdal2tiles is missing.  Running gdal2tiles.')
+    in_process = False
+  if not in_process:
+    name = 'gdal2tiles' if FindBinary('gdal2tiles') else 'gdal2tiles.py'
+    RunBinary(name, args)
+    return
+  if gdal2tiles.main(['gdal2tiles'] + args):
+    raise RuntimeError('gdal2tiles failed on %s' % src_filepath)
+
+
+def MercatorBounds(src):
+  """(min_x, min_y, max_x, max_y) of a raster as gdal2tiles sees it.
+
+  gdal2tiles uses the geotransform of rasters already in EPSG:3857 and
+  warps everything else with the defaults of gdal.AutoCreateWarpedVRT.
+
+  Args:
+    src: gdal.Dataset with a geotransform and a spatial reference.
+
+  Returns:
+    Tuple of float EPSG:3857 meters.
+  """
+  srs = osr.SpatialReference()
+  srs.ImportFromEPSG(3857)
+  src_srs = osr.SpatialReference(src.GetProjectionRef())
+  if not src_srs.IsSame(srs):
+    src = gdal.AutoCreateWarpedVRT(src, None, srs.ExportToWkt())
+  x0, dx, _, y0, _, dy = src.GetGeoTransform()
+  x1 = x0 + dx * src.RasterXSize
+  y1 = y0 + dy * src.RasterYSize
+  return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+
+def MercatorTile(x, y, zoom):
+  """TMS (tx, ty) of the tile at zoom holding EPSG:3857 point (x, y).
+
+  Same arithmetic as GlobalMercator.MetersToTile in gdal2tiles, so points
+  on a tile edge go to the tile below or to the left.
+  """
+  resolution = 2 * MERCATOR_ORIGIN_SHIFT / TILE_SIZE / 2 ** zoom
+  px = (x + MERCATOR_ORIGIN_SHIFT) / resolution
+  py = (y + MERCATOR_ORIGIN_SHIFT) / resolution
+  return (int(math.ceil(px / float(TILE_SIZE)) - 1),
+          int(math.ceil(py / float(TILE_SIZE)) - 1))
+
+
+def ExpectedTiles(bounds, min_zoom, max_zoom, xyz=False):
+  """Every tile that gdal2tiles should write for a mercator profile.
+
+  Args:
+    bounds: (min_x, min_y, max_x, max_y) in EPSG:3857 meters.  See
+      MercatorBounds.
+    min_zoom: int, First zoom level.
+    max_zoom: int, Last zoom level, inclusive.
+    xyz: If True, number the rows from the top as with --xyz.  Otherwise
+      use the TMS rows from the bottom.
+
+  Returns:
+    Set of (zoom, x, y) tuples.
+  """
+  min_x, min_y, max_x, max_y = bounds
+  tiles = set()
+  for zoom in range(min_zoom, max_zoom + 1):
+    last = 2 ** zoom - 1
+    tmin_x, tmin_y = MercatorTile(min_x, min_y, zoom)
+    tmax_x, tmax_y = MercatorTile(max_x, max_y, zoom)
+    for tx in range(max(0, tmin_x), min(last, tmax_x) + 1):
+      for ty in range(max(0, tmin_y), min(last, tmax_y) + 1):
+        tiles.add((zoom, tx, last - ty if xyz else ty))
+  return tiles
+
+
+def ListTiles(dirpath, ext='.png'):
+  """Set of (zoom, x, y) for the zoom/x/y.ext files under dirpath."""
+  tiles = set()
+  for zoom in os.listdir(dirpath):
+    zoom_dirpath = os.path.join(dirpath, zoom)
+    if not zoom.isdigit() or not os.path.isdir(zoom_dirpath):
+      continue
+    for x in os.listdir(zoom_dirpath):
+      x_dirpath = os.path.join(zoom_dirpath, x)
+      if not x.isdigit() or not os.path.isdir(x_dirpath):
+        continue
+      for filename in os.listdir(x_dirpath):
+        y, file_ext = os.path.splitext(filename)
+        if file_ext == ext and y.isdigit():
+          tiles.add((int(zoom), int(x), int(y)))
+  return tiles
+
+
+class CogValidationResult(
+    collections.namedtuple(
+        'CogValidationResult', ['filepath', 'errors', 'warnings', 'details'])):
+  """Outcome of validating one file as a cloud optimized GeoTIFF.
+
+  Attributes:
+    filepath: str, The file that was checked.
+    errors: List of str describing why the file is not a COG.
+    warnings: List of str for issues that do not prevent it being a COG.
+    details: Dictionary with 'ifd_offsets' and 'data_offsets' entries, each a
+      dictionary keyed by 'main' and 'overview_<index>'.
+  """
+  __slots__ = ()
+
+  @property
+  def is_valid(self):
+    return not self.errors
+
+
+def _IsTiled(band):
+  block_xsize, _ = band.GetBlockSize()
+  return not (block_xsize == band.XSize and block_xsize > COG_MAX_STRIP_WIDTH)
+
+
+def _GetOffset(band, key):
+  value = band.GetMetadataItem(key, 'TIFF')
+  return int(value) if value else None
+
+
+def ValidateCloudOptimizedGeoTiff(filepath, check_tiled=True):
+  """Check the layout of a GeoTIFF without starting a subprocess.
+
+  The file is opened once and all checks are done from the TIFF metadata
+  domain of the main band and its overviews.
+
+  Args:
+    filepath: str, Path to the file to check.  May be a /vsi path.
+    check_tiled: Set to False to report striped files as warnings rather than
+      errors.
+
+  Returns:
+    A CogValidationResult.
+  """
+  errors = []
+  warnings = []
+  details = {'ifd_offsets': {}, 'data_offsets': {}}
+  result = CogValidationResult(filepath, errors, warnings, details)
+
+  with gcore_util.ErrorHandler('CPLQuietErrorHandler'):
+    src = gdal.Open(filepath)
+  if src is None:
+    errors.append('Invalid file: %s' % gdal.GetLastErrorMsg())
+    return result
+  if src.GetDriver().ShortName.lower() != 'gtiff':
+    errors.append('The file is not a GeoTIFF')
+    return result
+
+  main_band = src.GetRasterBand(1)
+  overviews = [main_band.GetOverview(i)
+               for i in range(main_band.GetOverviewCount())]
+
+  file_list = src.GetFileList() or []
+  if src.GetDescription() + '.ovr' in file_list:
+    errors.append(
+        'Overviews found in external .ovr file. They should be internal')
+
+  if (main_band.XSize > COG_MAX_UNTILED_SIZE or
+      main_band.YSize > COG_MAX_UNTILED_SIZE):
+    if not _IsTiled(main_band):
+      (errors if check_tiled else warnings).append(
+          'The file is greater than %dxH or Wx%d, but is not tiled' %
+          (COG_MAX_UNTILED_SIZE, COG_MAX_UNTILED_SIZE))
+    if not overviews:
+      errors.append('The file is greater than %dxH or Wx%d, but has no '
+                    'overviews' % (COG_MAX_UNTILED_SIZE, COG_MAX_UNTILED_SIZE))
+
+  ifd_offsets = [_GetOffset(main_band, 'IFD_OFFSET')]
+  details['ifd_offsets']['main'] = ifd_offsets[0]
+  if ifd_offsets[0] not in COG_MAIN_IFD_OFFSETS:
+    errors.append('The offset of the main IFD should be 8 for ClassicTIFF '
+                  'or 16 for BigTIFF. It is %s instead' % ifd_offsets[0])
+
+  previous = main_band
+  for index, overview in enumerate(overviews):
+    if overview.XSize > previous.XSize or overview.YSize > previous.YSize:
+      errors.append('Overview of index %d has larger dimension than %s' %
+                    (index, 'main band' if index == 0 else
+                     'overview of index %d' % (index - 1)))
+    previous = overview
+
+    if not _IsTiled(overview):
+      (errors if check_tiled else warnings).append(
+          'Overview of index %d is not tiled' % index)
+
+    ifd_offset = _GetOffset(overview, 'IFD_OFFSET')
+    details['ifd_offsets']['overview_%d' % index] = ifd_offset
+    if ifd_offset is None:
+      errors.append('Missing IFD_OFFSET for overview of index %d' % index)
+    else:
+      # Compare with the last IFD that has a known offset.
+      known = [offset for offset in ifd_offsets if offset is not None]
+      if known and ifd_offset < known[-1]:
+        errors.append('The offset of the IFD for overview of index %d is %d, '
+                      'whereas it should be after the one at byte %d' %
+                      (index, ifd_offset, known[-1]))
+    ifd_offsets.append(ifd_offset)
+
+  # The imagery must start with the smallest overview and end with the main
+  # resolution image.
+  data_offsets = []
+  for index, band in enumerate([main_band] + overviews):
+    name = 'main' if index == 0 else 'overview_%d' % (index - 1)
+    data_offset = _GetOffset(band, 'BLOCK_OFFSET_0_0')
+    details['data_offsets'][name] = data_offset
+    if data_offset is None:
+      errors.append('Missing BLOCK_OFFSET_0_0 for %s' % name)
+    data_offsets.append(data_offset)
+
+  if None in data_offsets:
+    return result
+
+  if ifd_offsets[-1] is not None and data_offsets[-1] < ifd_offsets[-1]:
+    errors.append('The offset of the first block of the %s should be after '
+                  'its IFD' % ('smallest overview' if overviews else 'image'))
+  for index in range(len(data_offsets) - 2, 0, -1):
+    if data_offsets[index] < data_offsets[index + 1]:
+      errors.append('The offset of the first block of overview of index %d '
+                    'should be after the one of the overview of index %d' %
+                    (index - 1, index))
+  if len(data_offsets) >= 2 and data_offsets[0] < data_offsets[1]:
+    errors.append('The offset of the first block of the main resolution '
+                  'image should be after the one of the overview of index %d'
+                  % (len(overviews) - 1))
+
+  return result
+
+
+def ValidateCloudOptimizedGeoTiffDir(dirpath, pattern='*.tif',
+                                     num_threads=None, check_tiled=True):
+  """Validate all matching files in a directory using a pool of threads.
+
+  GDAL releases the GIL while reading, so threads are enough to overlap the
+  file opens.
+
+  Args:
+    dirpath: str, Directory to search recursively.
+    pattern: str, fnmatch style pattern of the basenames to check.
+    num_threads: int, Number of workers.  Defaults to the number of CPUs.
+    check_tiled: Set to False to report striped files as warnings.
+
+  Returns:
+    A list of CogValidationResult sorted by filepath.
+  """
+  filepaths = []
+  for root, _, filenames in os.walk(dirpath):
+    for filename in fnmatch.filter(filenames, pattern):
+      filepaths.append(os.path.join(root, filename))
+  filepaths.sort()
+  logging.info('Validating %d files in %s', len(filepaths), dirpath)
+
+  if not filepaths:
+    return []
+
+  pool = ThreadPool(num_threads)
+  try:
+    return pool.map(
+        lambda filepath: ValidateCloudOptimizedGeoTiff(filepath, check_tiled),
+        filepaths)
+  finally:
+    pool.close()
+    pool.join()
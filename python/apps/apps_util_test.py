@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for apps_util.py."""
+
+import os
+import shutil
+import unittest
+
+from osgeo import gdal
+from osgeo import ogr
+
+from autotest2.apps import apps_util
+from autotest2.gcore import gcore_util
+from autotest2.gdrivers import gdrivers_util
+from autotest2.ogr import ogr_util
+
+
+def CreateTiff(filepath, size, options=None, overviews=None):
+  """Write a GeoTIFF by way of a MEM dataset with optional overviews."""
+  src = gdal.GetDriverByName('MEM').Create('', size, size, 1)
+  src.GetRasterBand(1).Fill(42)
+  if overviews:
+    src.BuildOverviews('NEAREST', overviews)
+  dst = gdal.GetDriverByName('GTiff').CreateCopy(
+      filepath, src, options=options or [])
+  dst = None  # Flush the file.
+
+
+class BinaryTest(unittest.TestCase):
+
+  def testFindBinary(self):
+    self.assertIsNone(apps_util.FindBinary('no_such_gdal_app'))
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      filepath = os.path.join(tempdir, 'gdalfake')
+      with open(filepath, 'w') as f:
+        f.write('#!/bin/sh\necho "$@"\n')
+      os.chmod(filepath, 0o755)
+      with gdrivers_util.ConfigOption('AUTOTEST2_APPS_DIR', tempdir):
+        self.assertEqual(filepath, apps_util.FindBinary('gdalfake'))
+        self.assertEqual('-a b\n', apps_util.RunBinary('gdalfake', ['-a', 'b']))
+      self.assertIsNone(apps_util.FindBinary('gdalfake'))
+    self.assertRaises(OSError, apps_util.RunBinary, 'no_such_gdal_app', [])
+
+
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.MEM_DRIVER)
+class InProcessTest(unittest.TestCase):
+
+  def testGdalInfo(self):
+    filepath = '/vsimem/info.tif'
+    with gcore_util.GdalUnlinkWhenDone(filepath):
+      CreateTiff(filepath, 20)
+      self.assertIn('Size is 20, 20', apps_util.GdalInfo(filepath))
+      info = apps_util.GdalInfo(filepath, ['-mm', '-json'])
+    self.assertEqual([20, 20], info['size'])
+    self.assertEqual(42, info['bands'][0]['computedMax'])
+
+    src = gdal.GetDriverByName('MEM').Create('', 3, 4)
+    self.assertEqual([3, 4], apps_util.GdalInfo(src, ['-json'])['size'])
+    self.assertRaises(RuntimeError, apps_util.GdalInfo, '/does/not/exist.tif')
+
+  @unittest.skipIf(not hasattr(gdal, 'VectorInfo'), 'Requires VectorInfo')
+  @ogr_util.SkipIfDriverMissing(ogr_util.GEOJSON_DRIVER)
+  def testOgrInfo(self):
+    point = '{"type": "Point", "coordinates": [1.0, 2.0]}'
+    self.assertIn('POINT (1 2)', apps_util.OgrInfo(point, ['-ro', '-al']))
+    info = apps_util.OgrInfo(point, ['-ro', '-al', '-json'])
+    self.assertEqual(1, info['layers'][0]['featureCount'])
+
+  @gdrivers_util.SkipIfDriverMissing(gdrivers_util.VRT_DRIVER)
+  def testBuildVrt(self):
+    filepaths = ['/vsimem/vrt_a.tif', '/vsimem/vrt_b.tif']
+    vrt_filepath = '/vsimem/vrt.vrt'
+    for filepath in filepaths:
+      CreateTiff(filepath, 10)
+    try:
+      dst = apps_util.BuildVrt(vrt_filepath, filepaths, ['-separate'])
+      self.assertEqual(2, dst.RasterCount)
+      self.assertEqual(
+          42, bytearray(dst.GetRasterBand(2).ReadRaster(0, 0, 1, 1))[0])
+      dst = None
+    finally:
+      for filepath in filepaths + [vrt_filepath]:
+        gdal.Unlink(filepath)
+
+  @ogr_util.SkipIfDriverMissing(ogr_util.MEMORY_DRIVER)
+  def testRasterize(self):
+    src = ogr.GetDriverByName('Memory').CreateDataSource('')
+    layer = src.CreateLayer('square')
+    feature = ogr.Feature(layer.GetLayerDefn())
+    feature.SetGeometry(ogr.CreateGeometryFromWkt(
+        'POLYGON ((0 0,0 10,10 10,10 0,0 0))'))
+    layer.CreateFeature(feature)
+
+    filepath = '/vsimem/rasterize.tif'
+    with gcore_util.GdalUnlinkWhenDone(filepath):
+      dst = apps_util.Rasterize(
+          filepath, src, ['-burn', '7', '-ot', 'Byte', '-tr', '1', '1'])
+      self.assertEqual((10, 10), (dst.RasterXSize, dst.RasterYSize))
+      self.assertEqual(700, sum(bytearray(dst.ReadRaster())))
+      dst = None
+
+
+class TilesTest(unittest.TestCase):
+
+  def testExpectedTilesWorld(self):
+    shift = apps_util.MERCATOR_ORIGIN_SHIFT - 1
+    tiles = apps_util.ExpectedTiles((-shift, -shift, shift, shift), 0, 2)
+    self.assertEqual(1 + 4 + 16, len(tiles))
+    self.assertIn((0, 0, 0), tiles)
+    self.assertIn((2, 3, 3), tiles)
+
+  def testExpectedTilesCorner(self):
+    # A small box around the center of the north west quarter.
+    half = apps_util.MERCATOR_ORIGIN_SHIFT / 2
+    bounds = (-half - 1, half - 1, -half + 1, half + 1)
+    self.assertEqual(
+        set([(1, 0, 1), (2, 0, 2), (2, 0, 3), (2, 1, 2), (2, 1, 3)]),
+        apps_util.ExpectedTiles(bounds, 1, 2))
+    self.assertEqual(
+        set([(1, 0, 0), (2, 0, 0), (2, 0, 1), (2, 1, 0), (2, 1, 1)]),
+        apps_util.ExpectedTiles(bounds, 1, 2, xyz=True))
+
+  def testListTiles(self):
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      for path in ('3/1/2.png', '3/1/5.png', '4/0/0.png', '4/0/0.png.aux.xml',
+                   'leaflet/1/1.png'):
+        filepath = os.path.join(tempdir, path)
+        if not os.path.isdir(os.path.dirname(filepath)):
+          os.makedirs(os.path.dirname(filepath))
+        open(filepath, 'w').close()
+      self.assertEqual(set([(3, 1, 2), (3, 1, 5), (4, 0, 0)]),
+                       apps_util.ListTiles(tempdir))
+      self.assertEqual(set(), apps_util.ListTiles(tempdir, '.jpg'))
+
+
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.MEM_DRIVER)
+class ValidateCloudOptimizedGeoTiffTest(unittest.TestCase):
+
+  def testMissingFile(self):
+    result = apps_util.ValidateCloudOptimizedGeoTiff('/does/not/exist.tif')
+    self.assertFalse(result.is_valid)
+    self.assertIn('Invalid file', result.errors[0])
+
+  def testNotTiledNoOverviews(self):
+    filepath = '/vsimem/not_tiled.tif'
+    with gcore_util.GdalUnlinkWhenDone(filepath):
+      CreateTiff(filepath, 2048)
+      result = apps_util.ValidateCloudOptimizedGeoTiff(filepath)
+    self.assertFalse(result.is_valid)
+    self.assertEqual(2, len(result.errors), result.errors)
+    self.assertIn('is not tiled', result.errors[0])
+    self.assertIn('has no overviews', result.errors[1])
+    self.assertEqual(8, result.details['ifd_offsets']['main'])
+
+  def testNotTiledAllowed(self):
+    filepath = '/vsimem/not_tiled_allowed.tif'
+    with gcore_util.GdalUnlinkWhenDone(filepath):
+      CreateTiff(filepath, 2048)
+      result = apps_util.ValidateCloudOptimizedGeoTiff(
+          filepath, check_tiled=False)
+    self.assertEqual(1, len(result.errors), result.errors)
+    self.assertIn('has no overviews', result.errors[0])
+    self.assertIn('is not tiled', result.warnings[0])
+
+  def testSmallFile(self):
+    filepath = '/vsimem/small.tif'
+    with gcore_util.GdalUnlinkWhenDone(filepath):
+      CreateTiff(filepath, 20)
+      result = apps_util.ValidateCloudOptimizedGeoTiff(filepath)
+    self.assertTrue(result.is_valid, result.errors)
+    self.assertFalse(result.warnings)
+
+  def testCogeo(self):
+    filepath = '/vsimem/cogeo.tif'
+    with gcore_util.GdalUnlinkWhenDone(filepath):
+      CreateTiff(filepath, 2048, ['TILED=YES', 'COPY_SRC_OVERVIEWS=YES'],
+                 [2, 4, 8])
+      result = apps_util.ValidateCloudOptimizedGeoTiff(filepath)
+    self.assertTrue(result.is_valid, result.errors)
+    self.assertEqual(filepath, result.filepath)
+    self.assertEqual(
+        ['main', 'overview_0', 'overview_1', 'overview_2'],
+        sorted(result.details['ifd_offsets']))
+    data_offsets = result.details['data_offsets']
+    self.assertGreater(data_offsets['main'], data_offsets['overview_0'])
+    self.assertGreater(data_offsets['overview_0'], data_offsets['overview_2'])
+
+  def testBadOverviewOrder(self):
+    filepath = '/vsimem/bad_order.tif'
+    with gcore_util.GdalUnlinkWhenDone(filepath):
+      CreateTiff(filepath, 2048, ['TILED=YES'])
+      dst = gdal.Open(filepath, gdal.GA_Update)
+      dst.BuildOverviews('NEAREST', [2, 4])
+      dst = None
+      result = apps_util.ValidateCloudOptimizedGeoTiff(filepath)
+    self.assertFalse(result.is_valid)
+    self.assertTrue(
+        [error for error in result.errors if 'should be after' in error],
+        result.errors)
+
+  @gdrivers_util.SkipIfDriverMissing(gdrivers_util.HFA_DRIVER)
+  def testOverviewsNotInTiff(self):
+    # Overviews in an Erdas .aux file have no TIFF IFD_OFFSET.
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      filepath = os.path.join(tempdir, 'rrd.tif')
+      CreateTiff(filepath, 2048, ['TILED=YES'])
+      with gdrivers_util.ConfigOption('USE_RRD', 'YES'):
+        dst = gdal.Open(filepath)
+        dst.BuildOverviews('NEAREST', [2, 4])
+        dst = None
+      result = apps_util.ValidateCloudOptimizedGeoTiff(filepath)
+    self.assertFalse(result.is_valid)
+    self.assertIn('Missing IFD_OFFSET for overview of index 0', result.errors)
+    self.assertIn('Missing IFD_OFFSET for overview of index 1', result.errors)
+    self.assertIsNone(result.details['ifd_offsets']['overview_0'])
+
+  def testDir(self):
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      CreateTiff(os.path.join(tempdir, 'a.tif'), 2048,
+                 ['TILED=YES', 'COPY_SRC_OVERVIEWS=YES'], [2, 4])
+      os.mkdir(os.path.join(tempdir, 'sub'))
+      CreateTiff(os.path.join(tempdir, 'sub', 'b.tif'), 2048)
+      shutil.copy(os.path.join(tempdir, 'a.tif'),
+                  os.path.join(tempdir, 'sub', 'c.tif'))
+      with open(os.path.join(tempdir, 'ignored.txt'), 'w') as f:
+        f.write('not a tiff')
+
+      results = apps_util.ValidateCloudOptimizedGeoTiffDir(
+          tempdir, num_threads=2)
+
+    self.assertEqual(
+        ['a.tif', 'b.tif', 'c.tif'],
+        [os.path.basename(result.filepath) for result in results])
+    self.assertEqual([True, False, True],
+                     [result.is_valid for result in results])
+
+  def testEmptyDir(self):
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      self.assertEqual([], apps_util.ValidateCloudOptimizedGeoTiffDir(tempdir))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark gdal2tiles pyramids by the number of worker processes.
+
+gdal2tiles_test writes one zoom level of a tiny file.  This writes a large
+EPSG:3857 GeoTIFF and runs gdal2tiles over it for several zoom ranges with
+--processes set to each of PROCESS_COUNTS.  Every run is checked for the
+complete set of z/x/y tiles computed from the bounds of the input.  The
+report has the tiles per second and the scaling efficiency, which is the
+speed up over one process divided by the number of processes.
+
+The input is not aligned to the tile grid so that every tile within the
+bounds has some data.
+"""
+
+import multiprocessing
+import os
+import shutil
+import unittest
+
+from osgeo import gdal
+from osgeo import osr
+import logging
+from autotest2.apps import apps_util
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.gdrivers import gdrivers_util
+
+# Width and height of the input in pixels before scaling.
+SIZE = 4096
+
+# Zoom level at which the input pixels are the size of the tile pixels.
+NATIVE_ZOOM = 14
+
+# Lower left of the input in tiles at NATIVE_ZOOM.
+ORIGIN_TILE = (8000.37, 10000.61)
+
+# (name, zoom levels below NATIVE_ZOOM for the first zoom).  None is zoom 0.
+ZOOM_RANGES = (
+    ('native', 0),
+    ('pyramid', 4),
+    ('global', None),
+)
+
+PROCESS_COUNTS = (1, 2, 4)
+
+# Number of missing or extra tiles to list in a failure message.
+MAX_TILES_IN_MESSAGE = 10
+
+
+def CreateInput(filepath, size):
+  """Write a one band EPSG:3857 GeoTIFF with a diagonal ramp."""
+  resolution = (2 * apps_util.MERCATOR_ORIGIN_SHIFT / apps_util.TILE_SIZE /
+                2 ** NATIVE_ZOOM)
+  tile_span = apps_util.TILE_SIZE * resolution
+  min_x = ORIGIN_TILE[0] * tile_span - apps_util.MERCATOR_ORIGIN_SHIFT
+  max_y = ((ORIGIN_TILE[1] * tile_span - apps_util.MERCATOR_ORIGIN_SHIFT) +
+           size * resolution)
+
+  dst = gdal.GetDriverByName('GTiff').Create(
+      filepath, size, size, 1, options=['TILED=YES'])
+  srs = osr.SpatialReference()
+  srs.ImportFromEPSG(3857)
+  dst.SetProjection(srs.ExportToWkt())
+  dst.SetGeoTransform((min_x, resolution, 0, max_y, 0, -resolution))
+  band = dst.GetRasterBand(1)
+  ramp = bytearray(i % 256 for i in range(size + 256))
+  for y in range(size):
+    offset = y % 256
+    band.WriteRaster(0, y, size, 1, bytes(ramp[offset:offset + size]))
+  dst = None  # Flush the file.
+
+
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.PNG_DRIVER)
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
+class Gdal2tilesBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(Gdal2tilesBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+    if not (apps_util.gdal2tiles or apps_util.FindBinary('gdal2tiles') or
+            apps_util.FindBinary('gdal2tiles.py')):
+      self.skipTest('gdal2tiles not found')
+
+  def CheckTiles(self, expected, tiles, name):
+    missing = sorted(expected - tiles)
+    extra = sorted(tiles - expected)
+    self.assertFalse(
+        missing or extra,
+        '%s: %d missing tiles %s and %d extra tiles %s' % (
+            name, len(missing), missing[:MAX_TILES_IN_MESSAGE], len(extra),
+            extra[:MAX_TILES_IN_MESSAGE]))
+
+  def testPyramid(self):
+    size = max(apps_util.TILE_SIZE, benchmark_util.Scale(SIZE))
+    logging.info('%d cpus', multiprocessing.cpu_count())
+    report = benchmark_util.Report(
+        'gdal2tiles_pyramid',
+        ['zooms', 'processes', 'tiles', 'seconds', 'tiles_s', 'speedup',
+         'efficiency'])
+    with gcore_util.TestTemporaryDirectory(
+        prefix='gdal2tiles_benchmark') as tmpdir:
+      src_filepath = os.path.join(tmpdir, 'input.tif')
+      CreateInput(src_filepath, size)
+      bounds = apps_util.MercatorBounds(gdal.Open(src_filepath))
+
+      for name, depth in ZOOM_RANGES:
+        min_zoom = 0 if depth is None else NATIVE_ZOOM - depth
+        zooms = '%d-%d' % (min_zoom, NATIVE_ZOOM)
+        expected = apps_util.ExpectedTiles(bounds, min_zoom, NATIVE_ZOOM)
+        serial_seconds = None
+        for processes in PROCESS_COUNTS:
+          dst_dirpath = os.path.join(tmpdir, '%s_%d' % (name, processes))
+          with benchmark_util.Timer() as timer:
+            apps_util.Gdal2Tiles(
+                src_filepath, dst_dirpath,
+                ['-z', zooms, '-w', 'none', '--processes', str(processes)])
+          tiles = apps_util.ListTiles(dst_dirpath)
+          shutil.rmtree(dst_dirpath)
+          self.CheckTiles(expected, tiles, '%s %d' % (name, processes))
+
+          if serial_seconds is None:
+            serial_seconds = timer.seconds
+          speedup = benchmark_util.Rate(serial_seconds, timer.seconds)
+          report.Add(
+              zooms=zooms, processes=processes, tiles=len(tiles),
+              seconds=timer.seconds,
+              tiles_s=benchmark_util.Rate(len(tiles), timer.seconds),
+              speedup=speedup, efficiency=speedup / processes)
+          logging.info('%s with %d processes: %.1f s', name, processes,
+                       timer.seconds)
+
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -14,34 +14,43 @@
 
 """Tests the gdal2tiles commandline application."""
 
-import os
-import subprocess
-import tempfile
 import unittest
 
-import gflags as flags
+from osgeo import gdal
+
+from autotest2.apps import apps_util
 from autotest2.gcore import gcore_util
 from autotest2.gdrivers import gdrivers_util
 
-FLAGS = flags.FLAGS
+HAVE_BINARY = bool(apps_util.FindBinary('gdal2tiles') or
+                   apps_util.FindBinary('gdal2tiles.py'))
 
 
 @gdrivers_util.SkipIfDriverMissing(gdrivers_util.PNG_DRIVER)
 @gdrivers_util.SkipIfDriverMissing(gdrivers_util.MEM_DRIVER)
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
 class Gdal2tilesTest(unittest.TestCase):
 
-  @gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
-  def testWithSingleTiff(self):
+  def CheckSingleTiff(self, in_process):
     inputpath = gcore_util.GetTestFilePath('byte.tif')
-    outputdir = tempfile.mkdtemp(dir=FLAGS.test_tmpdir)
-    binary = os.path.join('TODO(schwehr): Where?',
-                          'gdal2tiles')
-    cmd = [binary, '-z 11', inputpath, outputdir]
-    subprocess.check_call(cmd)
-
-    # Checks the existence of the tile tree.
-    self.assertTrue(os.path.exists(
-        os.path.join(outputdir, '11', '354', '1229.png')))
+    with gcore_util.TestTemporaryDirectory() as outputdir:
+      apps_util.Gdal2Tiles(inputpath, outputdir, ['-z', '11'],
+                           in_process=in_process)
+      tiles = apps_util.ListTiles(outputdir)
+
+    # Checks the whole tile tree, not just the one tile that is expected.
+    self.assertIn((11, 354, 1229), tiles)
+    bounds = apps_util.MercatorBounds(gdal.Open(inputpath))
+    self.assertEqual(apps_util.ExpectedTiles(bounds, 11, 11), tiles)
+
+  @unittest.skipUnless(apps_util.gdal2tiles or HAVE_BINARY,
+                       'gdal2tiles not found')
+  def testWithSingleTiff(self):
+    self.CheckSingleTiff(True)
+
+  @unittest.skipUnless(HAVE_BINARY, 'gdal2tiles not found')
+  def testWithSingleTiffCommandLine(self):
+    self.CheckSingleTiff(False)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark gdal_rasterize in-process on large synthetic vector layers.
+
+gdal_rasterize_test burns poly.shp into a tiny grid.  This generates
+polygon and line layers with a given number of features and vertices and
+rasterizes them with gdal.Rasterize into MEM rasters of several sizes over
+the same extent, with and without ALL_TOUCHED and burning either a constant
+or an attribute.  The report has the output pixels and the features per
+second.
+
+A separate check burns rectangles and horizontal lines whose edges fall
+between pixel edges and centers and compares the result to a NumPy
+reference of the pixels whose center is inside the shape or that the
+shape touches.
+"""
+
+import math
+import random
+import unittest
+
+from osgeo import ogr
+import logging
+from autotest2.apps import apps_util
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.gdrivers import gdrivers_util
+from autotest2.ogr import ogr_util
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+# Width and height of the vector extent in map units.
+EXTENT = 1000.0
+
+# Number of features in each layer before scaling.
+NUM_FEATURES = 2000
+
+# Vertices per feature.
+VERTEX_COUNTS = (8, 256)
+
+# Width and height of the rasters covering EXTENT.
+SIZES = (512, 2048)
+
+# Name to (gdal_rasterize options, output type).
+BURNS = (
+    ('constant', ['-burn', '1'], 'Byte'),
+    ('attribute', ['-a', 'value'], 'Int32'),
+)
+
+# Width and height of the raster for the NumPy reference check, which has
+# one pixel per map unit.
+REFERENCE_SIZE = 256
+
+
+def CreateLayer(src, name, geom_type):
+  layer = src.CreateLayer(name, geom_type=geom_type)
+  layer.CreateField(ogr.FieldDefn('value', ogr.OFTInteger))
+  return layer
+
+
+def AddFeature(layer, geom, value):
+  feature = ogr.Feature(layer.GetLayerDefn())
+  feature.SetField('value', value)
+  feature.SetGeometry(geom)
+  layer.CreateFeature(feature)
+
+
+def RandomPolygon(rand, num_vertices, radius):
+  """A star shaped polygon with num_vertices somewhere in the extent."""
+  x = rand.uniform(radius, EXTENT - radius)
+  y = rand.uniform(radius, EXTENT - radius)
+  ring = ogr.Geometry(ogr.wkbLinearRing)
+  for i in range(num_vertices):
+    angle = 2 * math.pi * (i + rand.random()) / num_vertices
+    r = radius * rand.uniform(0.5, 1.0)
+    ring.AddPoint_2D(x + r * math.cos(angle), y + r * math.sin(angle))
+  ring.CloseRings()
+  polygon = ogr.Geometry(ogr.wkbPolygon)
+  polygon.AddGeometry(ring)
+  return polygon
+
+
+def RandomLineString(rand, num_vertices, radius):
+  """A random walk of num_vertices that stays in the extent."""
+  line = ogr.Geometry(ogr.wkbLineString)
+  x = rand.uniform(0, EXTENT)
+  y = rand.uniform(0, EXTENT)
+  # A random walk of n steps goes about sqrt(n) steps from the start.
+  step = 4 * radius / math.sqrt(num_vertices)
+  for _ in range(num_vertices):
+    x = min(EXTENT, max(0.0, x + rand.uniform(-step, step)))
+    y = min(EXTENT, max(0.0, y + rand.uniform(-step, step)))
+    line.AddPoint_2D(x, y)
+  return line
+
+
+GENERATORS = (
+    ('polygon', ogr.wkbPolygon, RandomPolygon),
+    ('linestring', ogr.wkbLineString, RandomLineString),
+)
+
+
+def CreateSource(kind, geom_type, generator, num_features, num_vertices):
+  """Memory datasource with one layer of random features."""
+  rand = random.Random(num_vertices)
+  radius = EXTENT / 50
+  src = ogr.GetDriverByName('Memory').CreateDataSource('')
+  layer = CreateLayer(src, kind, geom_type)
+  for fid in range(num_features):
+    AddFeature(layer, generator(rand, num_vertices, radius), fid % 200 + 1)
+  return src
+
+
+def RasterizeOptions(size, extent, burn_options, output_type, all_touched):
+  options = ['-of', 'MEM', '-ot', output_type, '-init', '0',
+             '-te', '0', '0', str(extent), str(extent),
+             '-ts', str(size), str(size)] + burn_options
+  if all_touched:
+    options.append('-at')
+  return options
+
+
+def ReferenceRectangles():
+  """(min_x, min_y, max_x, max_y, value) with edges off the pixel grid.
+
+  The rectangles are at least 2 pixels apart so that ALL_TOUCHED does not
+  make them overlap.
+  """
+  rectangles = []
+  for i in range(10):
+    for j in range(10):
+      x = i * 25 + 2.25
+      y = j * 25 + 2.75
+      rectangles.append((x, y, x + 3 + i * 2, y + 20 - j * 2, i * 10 + j + 1))
+  return rectangles
+
+
+def ReferenceLines():
+  """(min_x, max_x, y, value) horizontal lines between the rectangles."""
+  return [(2.25 + i, 250.75 - i * 3, 24.5 + i * 25, 101 + i)
+          for i in range(10)]
+
+
+def ReferenceTouched(lower, upper, touched):
+  """Mask of the 1 unit pixels from 0 that the span lower to upper covers.
+
+  Args:
+    lower: float, Start of the span in pixels.
+    upper: float, End of the span in pixels.
+    touched: If True, any pixel that overlaps the span.  Otherwise only the
+      pixels with their center in the span.
+
+  Returns:
+    Boolean numpy array of REFERENCE_SIZE.
+  """
+  edges = numpy.arange(REFERENCE_SIZE, dtype=numpy.float64)
+  if touched:
+    return (edges < upper) & (edges + 1 > lower)
+  return (edges + 0.5 > lower) & (edges + 0.5 < upper)
+
+
+def ReferenceRaster(all_touched):
+  """The expected attribute burn of the reference rectangles and lines.
+
+  Rows go down from the top of the extent while y goes up.
+  """
+  expected = numpy.zeros((REFERENCE_SIZE, REFERENCE_SIZE), numpy.int32)
+  for min_x, min_y, max_x, max_y, value in ReferenceRectangles():
+    columns = ReferenceTouched(min_x, max_x, all_touched)
+    rows = ReferenceTouched(min_y, max_y, all_touched)[::-1]
+    expected[numpy.outer(rows, columns)] = value
+  if all_touched:
+    for min_x, max_x, y, value in ReferenceLines():
+      columns = ReferenceTouched(min_x, max_x, True)
+      rows = ReferenceTouched(y, y, True)[::-1]
+      expected[numpy.outer(rows, columns)] = value
+  return expected
+
+
+def CreateReferenceSource(with_lines):
+  src = ogr.GetDriverByName('Memory').CreateDataSource('')
+  layer = CreateLayer(src, 'reference', ogr.wkbUnknown)
+  for min_x, min_y, max_x, max_y, value in ReferenceRectangles():
+    AddFeature(layer, ogr.CreateGeometryFromWkt(
+        'POLYGON ((%f %f,%f %f,%f %f,%f %f,%f %f))' % (
+            min_x, min_y, min_x, max_y, max_x, max_y, max_x, min_y,
+            min_x, min_y)), value)
+  if with_lines:
+    for min_x, max_x, y, value in ReferenceLines():
+      AddFeature(layer, ogr.CreateGeometryFromWkt(
+          'LINESTRING (%f %f,%f %f)' % (min_x, y, max_x, y)), value)
+  return src
+
+
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.MEM_DRIVER)
+@ogr_util.SkipIfDriverMissing(ogr_util.MEMORY_DRIVER)
+class GdalRasterizeBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(GdalRasterizeBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  @unittest.skipIf(not numpy, 'Requires numpy')
+  def testReference(self):
+    # Without ALL_TOUCHED, lines only burn the pixels of a Bresenham style
+    # walk, so only check them with ALL_TOUCHED.
+    for all_touched in (False, True):
+      expected = ReferenceRaster(all_touched)
+      src = CreateReferenceSource(all_touched)
+      for name, burn_options, output_type in BURNS:
+        dst = apps_util.Rasterize(
+            '', src, RasterizeOptions(REFERENCE_SIZE, REFERENCE_SIZE,
+                                      burn_options, output_type, all_touched))
+        result = dst.GetRasterBand(1).ReadAsArray()
+        if name == 'constant':
+          self.assertEqual(numpy.count_nonzero(expected),
+                           numpy.count_nonzero(result))
+          reference = (expected != 0).astype(result.dtype)
+        else:
+          reference = expected
+        mismatches = numpy.argwhere(result != reference)
+        self.assertEqual(
+            0, len(mismatches), '%s all_touched=%s: %d pixels differ at %s' %
+            (name, all_touched, len(mismatches), mismatches[:10].tolist()))
+
+  def testThroughput(self):
+    num_features = benchmark_util.Scale(NUM_FEATURES)
+    report = benchmark_util.Report(
+        'gdal_rasterize',
+        ['geometry', 'features', 'vertices', 'size', 'all_touched', 'burn',
+         'seconds', 'pixels_s', 'features_s'])
+    for kind, geom_type, generator in GENERATORS:
+      for num_vertices in VERTEX_COUNTS:
+        src = CreateSource(kind, geom_type, generator, num_features,
+                           num_vertices)
+        for size in SIZES:
+          for all_touched in (False, True):
+            for name, burn_options, output_type in BURNS:
+              options = RasterizeOptions(size, EXTENT, burn_options,
+                                         output_type, all_touched)
+              with benchmark_util.Timer() as timer:
+                dst = apps_util.Rasterize('', src, options)
+              band_max = dst.GetRasterBand(1).ComputeRasterMinMax(False)[1]
+              self.assertGreater(band_max, 0, options)
+              dst = None
+
+              report.Add(
+                  geometry=kind, features=num_features,
+                  vertices=num_vertices, size=size, all_touched=all_touched,
+                  burn=name, seconds=timer.seconds,
+                  pixels_s=benchmark_util.Rate(size * size, timer.seconds),
+                  features_s=benchmark_util.Rate(num_features, timer.seconds))
+          logging.info('%s %d vertices at %d pixels', kind, num_vertices,
+                       size)
+
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
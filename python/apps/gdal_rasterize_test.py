@@ -15,46 +15,51 @@
 """Tests the gdal_rasterize commandline application."""
 
 import os
-import subprocess
-import tempfile
-
 
 from osgeo import gdal
 
-import gflags as flags
 import unittest
+from autotest2.apps import apps_util
 from autotest2.gcore import gcore_util
 from autotest2.gdrivers import gdrivers_util
 
-FLAGS = flags.FLAGS
+OPTIONS = ['-burn', '1', '-of', 'GTiff', '-tr', '1000', '1000']
 
 
 @gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
 class GdalRasterizeTest(gdrivers_util.DriverTestCase):
+
   def setUp(self):
     self._ext = '.tif'
     super(GdalRasterizeTest, self).setUp(gdrivers_util.GTIFF_DRIVER,
                                          self._ext)
+    self.inputpath = gcore_util.GetTestFilePath('poly.shp')
 
-  def testRasterizeShapefile(self):
-    inputpath = gcore_util.GetTestFilePath('poly.shp')
-    _, outputpath = tempfile.mkstemp(dir=FLAGS.test_tmpdir,
-                                     suffix=self._ext)
-    binary = os.path.join('TODO(schwehr): Where?',
-                          'gdal_rasterize')
-    cmd = [binary,
-           '-burn', '1',
-           '-ot', 'gtiff',
-           '-tr', '1000', '1000',
-           inputpath, outputpath]
-    subprocess.check_call(cmd)
-
+  def CheckOutput(self, outputpath):
     # Checks some information about the output.
     self.CheckOpen(outputpath)
     self.CheckGeoTransform(
         (477815.53125, 1000.0, 0.0, 4766110.5, 0.0, -1000.0))
     self.CheckBand(1, 3, gdal_type=gdal.GDT_Float64)
 
+  def testRasterizeShapefile(self):
+    outputpath = '/vsimem/rasterize_shapefile' + self._ext
+    with gcore_util.GdalUnlinkWhenDone(outputpath):
+      dst = apps_util.Rasterize(outputpath, self.inputpath, OPTIONS)
+      self.assertIsNotNone(dst)
+      dst = None  # Flush the file.
+      self.CheckOutput(outputpath)
+      self.src = None
+
+  @apps_util.SkipIfBinaryMissing('gdal_rasterize')
+  def testRasterizeShapefileCommandLine(self):
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      outputpath = os.path.join(tempdir, 'rasterize_shapefile' + self._ext)
+      apps_util.Rasterize(outputpath, self.inputpath, OPTIONS,
+                          in_process=False)
+      self.CheckOutput(outputpath)
+      self.src = None
+
 
 if __name__ == '__main__':
   unittest.main()
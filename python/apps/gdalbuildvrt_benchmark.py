@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark gdalbuildvrt on mosaics of many small GeoTIFF tiles.
+
+gdalbuildvrt_test builds a VRT from one file.  This writes a grid of N
+tiles and builds a VRT of them with the inputs given on the command line
+and with -input_file_list.  Each build runs in a fresh process for the
+build time and how much its peak resident memory grew.
+
+The VRT is then read through a random window twice.  The first read has to
+open every source in the window and the second finds them in the dataset
+pool.  The block cache is flushed before each read so that both decode
+every tile, and the difference divided by the number of sources is the cost
+of opening one source.
+"""
+
+import os
+import random
+import unittest
+
+from osgeo import gdal
+from osgeo import osr
+import logging
+from autotest2.apps import apps_util
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.gdrivers import gdrivers_util
+
+# Number of tiles in each mosaic before scaling.
+TILE_COUNTS = (100, 1000, 5000)
+
+# Width and height of each tile in pixels.
+TILE_SIZE = 32
+
+# Degrees per pixel.  A power of two keeps the tile corners exact.
+RESOLUTION = 1.0 / 1024
+
+# Width and height of the window read through the VRT.  Keep the number of
+# sources it covers below GDAL_MAX_DATASET_POOL_SIZE so the second read does
+# not reopen any.
+WINDOW_SIZE = 8 * TILE_SIZE
+
+# Number of warm reads.  The fastest is reported.
+WARM_REPEAT = 3
+
+MODES = ('list', 'input_file_list')
+
+
+def TileValue(tile_num):
+  """Pixel value of every pixel in a tile.  Never 0 so gaps show up."""
+  return tile_num % 255 + 1
+
+
+def GridWidth(num_tiles):
+  """Number of tiles in each row of the mosaic."""
+  return int(num_tiles ** 0.5) or 1
+
+
+def WriteTiles(dirpath, num_tiles):
+  """Write num_tiles tiles in rows of GridWidth tiles.
+
+  Returns:
+    List of str paths in the order of the tile numbers.
+  """
+  columns = GridWidth(num_tiles)
+  srs = osr.SpatialReference()
+  srs.ImportFromEPSG(4326)
+  wkt = srs.ExportToWkt()
+  driver = gdal.GetDriverByName('GTiff')
+  filepaths = []
+  for tile_num in range(num_tiles):
+    filepath = os.path.join(dirpath, 'tile_%06d.tif' % tile_num)
+    dst = driver.Create(filepath, TILE_SIZE, TILE_SIZE, 1)
+    dst.SetProjection(wkt)
+    row, column = divmod(tile_num, columns)
+    dst.SetGeoTransform((column * TILE_SIZE * RESOLUTION, RESOLUTION, 0,
+                         -row * TILE_SIZE * RESOLUTION, 0, -RESOLUTION))
+    dst.GetRasterBand(1).Fill(TileValue(tile_num))
+    dst = None  # Flush the file.
+    filepaths.append(filepath)
+  return filepaths
+
+
+def BuildVrt(vrt_filepath, src_filepaths, options):
+  """Build and close a VRT and return its raster size and file count."""
+  dst = apps_util.BuildVrt(vrt_filepath, src_filepaths, options)
+  result = dst.RasterXSize, dst.RasterYSize, len(dst.GetFileList())
+  dst = None  # Flush the file.
+  return result
+
+
+def FlushBlockCache():
+  """Drop every block from the GDAL block cache, keeping its size."""
+  cache_max = gdal.GetCacheMax()
+  gdal.SetCacheMax(0)
+  gdal.SetCacheMax(cache_max)
+
+
+def BuildArguments(mode, src_filepaths, dirpath):
+  """(src_filepaths, options) for BuildVrt in a mode."""
+  if mode == 'list':
+    return src_filepaths, []
+  list_filepath = os.path.join(dirpath, 'inputs.txt')
+  with open(list_filepath, 'w') as f:
+    f.write('\n'.join(src_filepaths) + '\n')
+  return [], ['-input_file_list', list_filepath]
+
+
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.VRT_DRIVER)
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
+class GdalbuildvrtBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(GdalbuildvrtBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  def ReadWindow(self, vrt_filepath, num_tiles, rand):
+    """Time a cold and a warm read of a random window.
+
+    Returns:
+      Tuple of (number of sources in the window, cold seconds, warm seconds).
+    """
+    columns = GridWidth(num_tiles)
+    rows = num_tiles // columns
+    size = min(WINDOW_SIZE, columns * TILE_SIZE, rows * TILE_SIZE)
+    x = rand.randrange(columns * TILE_SIZE - size + 1)
+    y = rand.randrange(rows * TILE_SIZE - size + 1)
+    first_column = x // TILE_SIZE
+    first_row = y // TILE_SIZE
+    num_sources = (((x + size - 1) // TILE_SIZE - first_column + 1) *
+                   ((y + size - 1) // TILE_SIZE - first_row + 1))
+
+    src = gdal.Open(vrt_filepath)
+    band = src.GetRasterBand(1)
+    FlushBlockCache()
+    with benchmark_util.Timer() as cold_timer:
+      data = band.ReadRaster(x, y, size, size)
+    warm_seconds = None
+    for _ in range(WARM_REPEAT):
+      FlushBlockCache()
+      with benchmark_util.Timer() as warm_timer:
+        band.ReadRaster(x, y, size, size)
+      if warm_seconds is None or warm_timer.seconds < warm_seconds:
+        warm_seconds = warm_timer.seconds
+    src = None
+
+    self.assertEqual(TileValue(first_row * columns + first_column),
+                     bytearray(data)[0])
+    self.assertNotIn(0, bytearray(data))
+    return num_sources, cold_timer.seconds, warm_seconds
+
+  def testMosaic(self):
+    rand = random.Random(42)
+    report = benchmark_util.Report(
+        'gdalbuildvrt_mosaic',
+        ['tiles', 'mode', 'build_s', 'tiles_s', 'growth_mb',
+         'window_sources', 'cold_ms', 'warm_ms', 'open_ms_per_source'])
+    for num_tiles in TILE_COUNTS:
+      num_tiles = benchmark_util.Scale(num_tiles)
+      with gcore_util.TestTemporaryDirectory(
+          prefix='gdalbuildvrt_benchmark') as tmpdir:
+        with benchmark_util.Timer() as write_timer:
+          src_filepaths = WriteTiles(tmpdir, num_tiles)
+        logging.info('Wrote %d tiles in %.1f s', num_tiles,
+                     write_timer.seconds)
+
+        columns = GridWidth(num_tiles)
+        rows = -(-num_tiles // columns)
+        for mode in MODES:
+          vrt_filepath = os.path.join(tmpdir, mode + '.vrt')
+          filepaths, options = BuildArguments(mode, src_filepaths, tmpdir)
+          result, seconds, rss_growth = benchmark_util.RunInSubprocess(
+              BuildVrt, vrt_filepath, filepaths, options)
+          self.assertEqual(
+              (columns * TILE_SIZE, rows * TILE_SIZE, num_tiles + 1), result,
+              mode)
+
+          num_sources, cold_seconds, warm_seconds = self.ReadWindow(
+              vrt_filepath, num_tiles, rand)
+          report.Add(
+              tiles=num_tiles, mode=mode, build_s=seconds,
+              tiles_s=benchmark_util.Rate(num_tiles, seconds),
+              growth_mb=float(rss_growth) / benchmark_util.MB,
+              window_sources=num_sources, cold_ms=cold_seconds * 1000,
+              warm_ms=warm_seconds * 1000,
+              open_ms_per_source=(
+                  (cold_seconds - warm_seconds) * 1000 / num_sources))
+
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -15,23 +15,20 @@
 """Tests the gdalbuildvrt commandline application."""
 
 import os
-import subprocess
 import unittest
 
+from autotest2.apps import apps_util
 from autotest2.gcore import gcore_util
 from autotest2.gdrivers import gdrivers_util
 
 
 @gdrivers_util.SkipIfDriverMissing(gdrivers_util.VRT_DRIVER)
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
 class GdalbuildvrtTest(unittest.TestCase):
 
-  @gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
-  def testWithSingleTiff(self):
-    inputpath = gcore_util.GetTestFilePath('byte.tif')
-    binary = os.path.join('TODO(schwehr): Where?',
-                          'gdalbuildvrt')
-    cmd = [binary, '-q', '/dev/stdout', inputpath]
-    result = subprocess.check_output(cmd)
+  def CheckVrt(self, dst):
+    self.assertIsNotNone(dst)
+    result = dst.GetMetadata('xml:VRT')[0]
 
     # Checks the existence of some mandatory fields
     self.assertIn('<VRTDataset', result)
@@ -40,6 +37,21 @@ class GdalbuildvrtTest(unittest.TestCase):
     self.assertIn('</VRTRasterBand>', result)
     self.assertIn('<SourceFilename', result)
     self.assertIn('</SourceFilename>', result)
+    self.assertEqual(4672, dst.GetRasterBand(1).Checksum())
+
+  def testWithSingleTiff(self):
+    inputpath = gcore_util.GetTestFilePath('byte.tif')
+    filepath = '/vsimem/single_tiff.vrt'
+    with gcore_util.GdalUnlinkWhenDone(filepath):
+      self.CheckVrt(apps_util.BuildVrt(filepath, [inputpath]))
+
+  @apps_util.SkipIfBinaryMissing('gdalbuildvrt')
+  def testWithSingleTiffCommandLine(self):
+    inputpath = gcore_util.GetTestFilePath('byte.tif')
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      filepath = os.path.join(tempdir, 'single_tiff.vrt')
+      self.CheckVrt(
+          apps_util.BuildVrt(filepath, [inputpath], in_process=False))
 
 
 if __name__ == '__main__':
@@ -14,24 +14,21 @@
 
 """Tests the gdalinfo command line application."""
 
-import os
-import subprocess
 import unittest
 
+from autotest2.apps import apps_util
 from autotest2.gcore import gcore_util
 from autotest2.gdrivers import gdrivers_util
 
 
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
 class GdalinfoTest(unittest.TestCase):
 
-  @gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
-  def testTiff(self):
-    filepath = gcore_util.GetTestFilePath('utmsmall.tif')
-    gdalinfo = os.path.join(
-        'TODO(schwehr): Where?',
-        'gdalinfo')
-    cmd = [gdalinfo, filepath]
-    result = subprocess.check_output(cmd)
+  def setUp(self):
+    super(GdalinfoTest, self).setUp()
+    self.filepath = gcore_util.GetTestFilePath('utmsmall.tif')
+
+  def CheckReport(self, result):
     self.assertIn('GTiff/GeoTIFF', result)
     self.assertIn('NAD27', result)
     self.assertIn('26711', result)
@@ -44,8 +41,24 @@ class GdalinfoTest(unittest.TestCase):
     self.assertIn('Byte', result)
     self.assertIn('Gray', result)
 
-    cmd = [gdalinfo, '-mm', filepath]
-    result = subprocess.check_output(cmd)
+  def testTiff(self):
+    self.CheckReport(apps_util.GdalInfo(self.filepath))
+
+    info = apps_util.GdalInfo(self.filepath, ['-mm', '-stats', '-json'])
+    band = info['bands'][0]
+    self.assertAlmostEqual(band['computedMin'], 0.0)
+    self.assertAlmostEqual(band['computedMax'], 255.0)
+    self.assertAlmostEqual(band['minimum'], 0.0)
+    self.assertAlmostEqual(band['maximum'], 255.0)
+    self.assertAlmostEqual(band['mean'], 154.6212)
+    self.assertAlmostEqual(band['stdDev'], 54.250980733624)
+
+  @apps_util.SkipIfBinaryMissing('gdalinfo')
+  def testTiffCommandLine(self):
+    result = apps_util.GdalInfo(self.filepath, in_process=False)
+    self.CheckReport(result)
+
+    result = apps_util.GdalInfo(self.filepath, ['-mm'], in_process=False)
     self.assertIn('Computed', result)
     computed = [line for line in result.split('\n') if 'Computed' in line][0]
     computed_min, computed_max = [
@@ -53,8 +66,7 @@ class GdalinfoTest(unittest.TestCase):
     self.assertAlmostEqual(computed_min, 0.0)
     self.assertAlmostEqual(computed_max, 255.0)
 
-    cmd = [gdalinfo, '-stats', filepath]
-    result = subprocess.check_output(cmd)
+    result = apps_util.GdalInfo(self.filepath, ['-stats'], in_process=False)
     self.assertIn('STATISTICS_MAXIMUM=255', result)
     self.assertIn('STATISTICS_MINIMUM=0', result)
     self.assertIn('STATISTICS_MEAN', result)
@@ -14,24 +14,18 @@
 
 """Tests the ogrinfo command line application."""
 
-import os
-import subprocess
 import unittest
 
+from autotest2.apps import apps_util
 from autotest2.ogr import ogr_util
 
+POINT = '{"type": "Point","coordinates": [100.0, 0.0]}'
 
+
+@ogr_util.SkipIfDriverMissing(ogr_util.GEOJSON_DRIVER)
 class OgrinfoTest(unittest.TestCase):
 
-  @ogr_util.SkipIfDriverMissing(ogr_util.GEOJSON_DRIVER)
-  def testGeojsonFromStdin(self):
-    # Replaces the need for geojson_test.py test #12.
-    ogrinfo = os.path.join(
-        'TODO(schwehr): Where?',
-        'ogrinfo')
-    cmd = [
-        ogrinfo, '-ro', '-al', '{"type": "Point","coordinates": [100.0, 0.0]}']
-    result = subprocess.check_output(cmd)
+  def CheckReport(self, result):
     self.assertIn('GeoJSON', result)
     self.assertIn('Geometry: Point', result)
     self.assertIn('Feature Count: 1', result)
@@ -39,5 +33,15 @@ class OgrinfoTest(unittest.TestCase):
     self.assertIn('4326', result)
     self.assertIn('POINT (100 0)', result)
 
+  def testGeojson(self):
+    # Replaces the need for geojson_test.py test #12.
+    self.CheckReport(apps_util.OgrInfo(POINT, ['-ro', '-al']))
+
+  @apps_util.SkipIfBinaryMissing('ogrinfo')
+  def testGeojsonFromStdin(self):
+    self.CheckReport(apps_util.OgrInfo(POINT, ['-ro', '-al'],
+                                       in_process=False))
+
+
 if __name__ == '__main__':
   unittest.main()
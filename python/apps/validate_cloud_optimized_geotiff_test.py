@@ -20,6 +20,7 @@ import google3
 from google3.pyglib import flags
 from google3.pyglib import resources
 from google3.testing.pybase import googletest
+from google3.third_party.gdal.autotest2.python.apps import apps_util
 from google3.third_party.gdal.autotest2.python.ogr import ogr_util
 
 FLAGS = flags.FLAGS
@@ -32,10 +33,7 @@ class ValidateCloudOptimizedGeotiffTest(googletest.TestCase):
         resources.GetARootDirWithAllResources(),
         'gdal/validate_cloud_optimized_geotiff')
 
-    # TODO(schwehr): Move this to an apps_util.py.
-    self.test_data_path = os.path.join(
-        FLAGS.test_srcdir,
-        'autotest2/python/apps/testdata/cogeo')
+    self.test_data_path = apps_util.GetTestFilePath('cogeo')
 
   def testHelp(self):
     # Note that options other than -q and the filename always report a failure
@@ -138,5 +136,59 @@ class ValidateCloudOptimizedGeotiffTest(googletest.TestCase):
     self.assertEqual('', result)
 
 
+class ValidateCloudOptimizedGeotiffInProcessTest(googletest.TestCase):
+  """The same checks as above through apps_util without a subprocess."""
+
+  def setUp(self):
+    self.test_data_path = apps_util.GetTestFilePath('cogeo')
+
+  def Validate(self, filename):
+    return apps_util.ValidateCloudOptimizedGeoTiff(
+        os.path.join(self.test_data_path, filename))
+
+  def testMissingFile(self):
+    result = apps_util.ValidateCloudOptimizedGeoTiff('/does/not/exist.tif')
+    self.assertFalse(result.is_valid)
+    self.assertIn('Invalid file', result.errors[0])
+
+  def testMissingTilesMissingOverviews(self):
+    result = self.Validate('1.tif')
+    self.assertFalse(result.is_valid)
+    errors = '\n'.join(result.errors)
+    self.assertIn('is not tiled', errors)
+    self.assertIn('has no overviews', errors)
+
+  def testMissingOverviews(self):
+    result = self.Validate('2-tiled-lzw.tif')
+    self.assertFalse(result.is_valid)
+    errors = '\n'.join(result.errors)
+    self.assertNotIn('is not tiled', errors)
+    self.assertIn('has no overviews', errors)
+
+  def testBadOverviewOrder(self):
+    result = self.Validate('3-overviews.tif')
+    self.assertFalse(result.is_valid)
+    errors = '\n'.join(result.errors)
+    self.assertNotIn('is not tiled', errors)
+    self.assertNotIn('has no overviews', errors)
+    self.assertIn('should be after', errors)
+
+  def testMissingBlockOffset(self):
+    result = self.Validate('block-offset-missing.tif')
+    self.assertFalse(result.is_valid)
+    self.assertIn('Missing BLOCK_OFFSET_0_0', '\n'.join(result.errors))
+
+  def testCogeoFile(self):
+    result = self.Validate('4-cogeo.tif')
+    self.assertTrue(result.is_valid, result.errors)
+
+  def testDir(self):
+    results = apps_util.ValidateCloudOptimizedGeoTiffDir(self.test_data_path)
+    valid = [os.path.basename(result.filepath)
+             for result in results if result.is_valid]
+    self.assertIn('4-cogeo.tif', valid)
+    self.assertNotIn('1.tif', valid)
+
+
 if __name__ == '__main__':
   googletest.main()
@@ -0,0 +1,176 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Support for the *_benchmark.py files.
+
+Benchmarks are unittest modules like the tests.  They run at a small size by
+default so that they are quick enough to run with the tests.  Set the
+AUTOTEST2_BENCHMARK_SCALE config option or environment variable to multiply
+the sizes for real measurements.
+
+Each benchmark collects rows in a Report.  The report is logged and, when
+TEST_UNDECLARED_OUTPUTS_DIR is set, written there as a tab separated file.
+"""
+
+import math
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+from osgeo import gdal
+
+import logging
+from autotest2.gdrivers import gdrivers_util
+
+MB = 1024 * 1024
+
+
+def Scale(count):
+  """Multiply a size by the AUTOTEST2_BENCHMARK_SCALE config option."""
+  scale = float(gdal.GetConfigOption('AUTOTEST2_BENCHMARK_SCALE', '1'))
+  return max(1, int(count * scale))
+
+
+class Timer(object):
+  """Context manager that records the wall clock time of its body.
+
+  Usage:
+
+    with benchmark_util.Timer() as timer:
+      DoSomething()
+    logging.info('Took %f seconds', timer.seconds)
+  """
+
+  def __init__(self):
+    self.start = None
+    self.seconds = None
+
+  def __enter__(self):
+    self.start = time.time()
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.seconds = time.time() - self.start
+
+
+def TimeIt(func, repeat=3):
+  """Call func repeat times and return the fastest time in seconds."""
+  best = None
+  for _ in range(repeat):
+    with Timer() as timer:
+      func()
+    if best is None or timer.seconds < best:
+      best = timer.seconds
+  return best
+
+
+def Rate(count, seconds):
+  """count per second, guarding against timers too coarse to see the work."""
+  return count / max(seconds, 1e-9)
+
+
+def PeakRss():
+  """Peak resident set size of this process in bytes."""
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # Linux reports kilobytes and Mac OS X reports bytes.
+  return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _CurrentRss():
+  """Resident set size of this process in bytes.
+
+  Falls back to PeakRss where /proc is not available.
+  """
+  try:
+    with open('/proc/self/statm') as statm:
+      return int(statm.read().split()[1]) * resource.getpagesize()
+  except (IOError, OSError):
+    return PeakRss()
+
+
+def _CallAndMeasure(args):
+  func, func_args = args
+  start_rss = _CurrentRss()
+  with Timer() as timer:
+    result = func(*func_args)
+  return result, timer.seconds, max(0, PeakRss() - start_rss)
+
+
+def RunInSubprocess(func, *args):
+  """Run func(*args) in a new process to measure its peak memory.
+
+  The peak resident set size of a process never goes down, so each
+  measurement needs a fresh process.  The worker is forked and starts with
+  the resident set of the caller at the time of the fork, so the peak is
+  measured from the resident set size when func is called.  func and args
+  must be picklable.
+
+  Returns:
+    A tuple of (result of func, seconds, bytes the peak resident set size
+    grew by while running func).
+  """
+  pool = multiprocessing.Pool(1, maxtasksperchild=1)
+  try:
+    return pool.map(_CallAndMeasure, [(func, args)])[0]
+  finally:
+    pool.close()
+    pool.join()
+
+
+def SlopeLogLog(sizes, values):
+  """Least squares slope of log(values) against log(sizes).
+
+  A slope near 1 means linear growth and near 0 means constant.
+  """
+  xs = [math.log(size) for size in sizes]
+  ys = [math.log(max(value, 1e-12)) for value in values]
+  x_mean = sum(xs) / len(xs)
+  y_mean = sum(ys) / len(ys)
+  numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+  denominator = sum((x - x_mean) ** 2 for x in xs)
+  return numerator / denominator if denominator else 0.0
+
+
+class Report(object):
+  """Rows of benchmark results with the same columns."""
+
+  def __init__(self, name, columns):
+    self.name = name
+    self.columns = list(columns)
+    self.rows = []
+
+  def Add(self, **values):
+    missing = set(self.columns) - set(values)
+    assert not missing, 'Missing columns: %s' % sorted(missing)
+    self.rows.append(values)
+
+  def Format(self):
+    def _Str(value):
+      if isinstance(value, float):
+        return '%.3f' % value
+      return str(value)
+
+    lines = ['\t'.join(self.columns)]
+    for row in self.rows:
+      lines.append('\t'.join(_Str(row[column]) for column in self.columns))
+    return '\n'.join(lines) + '\n'
+
+  def Write(self):
+    text = self.Format()
+    logging.info('%s:\n%s', self.name, text)
+    if 'TEST_UNDECLARED_OUTPUTS_DIR' in os.environ:
+      gdrivers_util.MaybeWriteOutputFile(self.name + '.tsv', text)
+    return text
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for benchmark_util.py."""
+
+import unittest
+
+from autotest2.gcore import benchmark_util
+from autotest2.gdrivers import gdrivers_util
+
+
+def _Allocate(num_bytes):
+  return len(bytearray(num_bytes))
+
+
+class BenchmarkUtilTest(unittest.TestCase):
+
+  def testScale(self):
+    self.assertEqual(10, benchmark_util.Scale(10))
+    with gdrivers_util.ConfigOption('AUTOTEST2_BENCHMARK_SCALE', '2.5'):
+      self.assertEqual(25, benchmark_util.Scale(10))
+    with gdrivers_util.ConfigOption('AUTOTEST2_BENCHMARK_SCALE', '0.001'):
+      self.assertEqual(1, benchmark_util.Scale(10))
+
+  def testTimer(self):
+    with benchmark_util.Timer() as timer:
+      sum(range(1000))
+    self.assertGreaterEqual(timer.seconds, 0)
+    self.assertGreaterEqual(benchmark_util.TimeIt(lambda: None, 2), 0)
+
+  def testRate(self):
+    self.assertEqual(5, benchmark_util.Rate(10, 2))
+    self.assertGreater(benchmark_util.Rate(10, 0), 0)
+
+  def testRunInSubprocess(self):
+    num_bytes = 64 * benchmark_util.MB
+    result, seconds, growth = benchmark_util.RunInSubprocess(_Allocate,
+                                                             num_bytes)
+    self.assertEqual(num_bytes, result)
+    self.assertGreaterEqual(seconds, 0)
+    # Some of the pages may already be in the heap.
+    self.assertGreater(growth, 0.9 * num_bytes)
+    # Memory held by the caller before the fork is not counted.
+    held = bytearray(num_bytes)
+    _, _, growth = benchmark_util.RunInSubprocess(_Allocate, 0)
+    self.assertLess(growth, num_bytes)
+    del held
+
+  def testSlopeLogLog(self):
+    sizes = [10, 100, 1000]
+    self.assertAlmostEqual(1.0, benchmark_util.SlopeLogLog(sizes, sizes))
+    self.assertAlmostEqual(0.0, benchmark_util.SlopeLogLog(sizes, [5, 5, 5]))
+    self.assertAlmostEqual(
+        2.0, benchmark_util.SlopeLogLog(sizes, [s * s for s in sizes]))
+
+  def testReport(self):
+    report = benchmark_util.Report('test', ['name', 'rate'])
+    report.Add(name='a', rate=1.5)
+    report.Add(name='b', rate=2)
+    self.assertEqual('name\trate\na\t1.500\nb\t2\n', report.Write())
+    self.assertRaises(AssertionError, report.Add, name='c')
+
+
+if __name__ == '__main__':
+  unittest.main()
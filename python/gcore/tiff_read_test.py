@@ -109,39 +109,17 @@ class TestReadGtiff(gdrivers_util.DriverTestCase):
     self.CheckDriver()
 
   def testInfo(self):
-    for base in ('byte', 'int10', 'int12', 'int16', 'int24', 'int32'):
-      filepath = self.getTestFilePath(base + EXT)
-      self.CheckOpen(filepath)
-      self.CheckInfo()
-    for base in ('uint16', 'uint32'):
-      filepath = self.getTestFilePath(base + EXT)
-      self.CheckOpen(filepath)
-      self.CheckInfo()
-    for base in ('cint16', 'cint32'):
-      filepath = self.getTestFilePath(base + EXT)
-      self.CheckOpen(filepath)
-      self.CheckInfo()
-    for base in ('float16', 'float24', 'float32', 'float64'):
-      filepath = self.getTestFilePath(base + EXT)
-      self.CheckOpen(filepath)
-      self.CheckInfo()
-    for base in ('cfloat32', 'cfloat64'):
-      filepath = self.getTestFilePath(base + EXT)
-      self.CheckOpen(filepath)
-      self.CheckInfo()
-    for base in ('float32_minwhite', 'minfloat'):
-      filepath = self.getTestFilePath(base + EXT)
-      self.CheckOpen(filepath)
-      self.CheckInfo()
-    for base in ('rgba-float32', 'rgba-float64', 'rgba-cfloat64'):
-      filepath = self.getTestFilePath(base + '.tif')
-      self.CheckOpen(filepath)
-      self.CheckInfo()
-
-    # Earth Engine export style.
-    filepath = self.getTestFilePath('float32-guuu.tif')
-    self.CheckOpen(filepath)
-    self.CheckInfo()
+    bases = (
+        'byte', 'int10', 'int12', 'int16', 'int24', 'int32',
+        'uint16', 'uint32',
+        'cint16', 'cint32',
+        'float16', 'float24', 'float32', 'float64',
+        'cfloat32', 'cfloat64',
+        'float32_minwhite', 'minfloat',
+        'rgba-float32', 'rgba-float64', 'rgba-cfloat64',
+        # Earth Engine export style.
+        'float32-guuu')
+    self.CheckInfoFiles([self.getTestFilePath(base + EXT) for base in bases])
 
 
 @gdrivers_util.SkipIfDriverMissing(DRIVER)
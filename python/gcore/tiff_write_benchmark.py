@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark GeoTIFF compression codecs with CreateCopy and read back.
+
+Sweeps COMPRESS, PREDICTOR, the tiling layout and NUM_THREADS over synthetic
+rasters and reports encode and decode MB/s and the compression ratio.  Codecs
+that are not built into the GTiff driver are skipped.
+
+Format is described here:
+
+http://www.gdal.org/frmt_gtiff.html
+"""
+
+import unittest
+
+from osgeo import gdal
+import logging
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.gdrivers import gdrivers_util
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+DRIVER = gdrivers_util.GTIFF_DRIVER
+
+# Width and height of the synthetic rasters before scaling.
+SIZE = 512
+
+# Number of times each encode and decode is timed.  The fastest is reported.
+REPEAT = 3
+
+# Codec to (GDAL types it accepts, lossless, extra creation options).
+# None for the types means any type.
+CODECS = {
+    'NONE': (None, True, []),
+    'LZW': (None, True, []),
+    'DEFLATE': (None, True, []),
+    'ZSTD': (None, True, []),
+    'LERC': (None, True, ['MAX_Z_ERROR=0']),
+    'WEBP': ((gdal.GDT_Byte,), True, ['WEBP_LOSSLESS=YES']),
+    'JXL': ((gdal.GDT_Byte, gdal.GDT_UInt16, gdal.GDT_Float32), True,
+            ['JXL_LOSSLESS=YES']),
+    'JPEG': ((gdal.GDT_Byte,), False, []),
+}
+
+# Codecs that use the PREDICTOR creation option.
+PREDICTOR_CODECS = ('LZW', 'DEFLATE', 'ZSTD')
+
+LAYOUTS = (
+    ('strip', []),
+    ('tile256', ['TILED=YES', 'BLOCKXSIZE=256', 'BLOCKYSIZE=256']),
+    ('tile512', ['TILED=YES', 'BLOCKXSIZE=512', 'BLOCKYSIZE=512']),
+)
+
+NUM_THREADS = ('1', 'ALL_CPUS')
+
+
+def AvailableCodecs():
+  """COMPRESS values from CODECS that this build of GTiff can write."""
+  driver = gdal.GetDriverByName(DRIVER)
+  option_list = driver.GetMetadataItem(gdal.DMD_CREATIONOPTIONLIST)
+  return sorted(codec for codec in CODECS
+                if codec == 'NONE' or '>%s<' % codec in option_list)
+
+
+def CreateRgbByte(size):
+  """Three band Byte raster of smooth gradients with some noise."""
+  y, x = numpy.mgrid[0:size, 0:size]
+  noise = numpy.random.RandomState(42).randint(0, 8, (3, size, size))
+  bands = numpy.array([x * 255 // size, y * 255 // size,
+                       (x + y) * 127 // size]) + noise
+  src = gdal.GetDriverByName('MEM').Create('', size, size, 3, gdal.GDT_Byte)
+  for band_num in range(3):
+    src.GetRasterBand(band_num + 1).WriteArray(
+        numpy.clip(bands[band_num], 0, 255).astype(numpy.uint8))
+  return src
+
+
+def CreateDemFloat32(size):
+  """One band Float32 raster that looks a bit like terrain."""
+  y, x = numpy.mgrid[0:size, 0:size] / float(size)
+  noise = numpy.random.RandomState(7).standard_normal((size, size))
+  elevation = (1000 * numpy.sin(3 * x) * numpy.cos(2 * y) + 200 * x +
+               noise).astype(numpy.float32)
+  src = gdal.GetDriverByName('MEM').Create('', size, size, 1,
+                                           gdal.GDT_Float32)
+  src.GetRasterBand(1).WriteArray(elevation)
+  return src
+
+
+def Predictors(gdal_type, compress):
+  if compress not in PREDICTOR_CODECS:
+    return ('1',)
+  if gdal_type in (gdal.GDT_Float32, gdal.GDT_Float64):
+    return ('1', '2', '3')
+  return ('1', '2')
+
+
+def Cases(rasters, codecs):
+  """Yield (raster name, compress, predictor, layout, threads) to measure."""
+  for raster_name, src in sorted(rasters.items()):
+    gdal_type = src.GetRasterBand(1).DataType
+    for compress in codecs:
+      types = CODECS[compress][0]
+      if types is not None and gdal_type not in types:
+        continue
+      for predictor in Predictors(gdal_type, compress):
+        for layout, _ in LAYOUTS:
+          for threads in NUM_THREADS:
+            yield raster_name, compress, predictor, layout, threads
+
+
+def Checksums(src):
+  return [src.GetRasterBand(band_num).Checksum()
+          for band_num in range(1, src.RasterCount + 1)]
+
+
+@unittest.skipIf(not numpy, 'Requires numpy')
+@gdrivers_util.SkipIfDriverMissing(DRIVER)
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.MEM_DRIVER)
+class TiffCodecBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(TiffCodecBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+    self.driver = gdal.GetDriverByName(DRIVER)
+
+  def Measure(self, src, filepath, options, threads):
+    """Returns (encode seconds, decode seconds, compressed size, copy)."""
+    def Encode():
+      dst = self.driver.CreateCopy(filepath, src, options=options)
+      self.assertTrue(dst, 'CreateCopy failed: %s' % options)
+      dst = None  # Flush the file.
+
+    def Decode():
+      dst = gdal.OpenEx(filepath, gdal.OF_RASTER,
+                        open_options=['NUM_THREADS=' + threads])
+      dst.ReadRaster()
+
+    encode_seconds = benchmark_util.TimeIt(Encode, REPEAT)
+    decode_seconds = benchmark_util.TimeIt(Decode, REPEAT)
+    return (encode_seconds, decode_seconds, gdal.VSIStatL(filepath).size,
+            gdal.Open(filepath))
+
+  def testCodecMatrix(self):
+    codecs = AvailableCodecs()
+    logging.info('Codecs: %s', codecs)
+    self.assertIn('DEFLATE', codecs)
+
+    size = benchmark_util.Scale(SIZE)
+    rasters = {
+        'rgb_byte': CreateRgbByte(size),
+        'dem_float32': CreateDemFloat32(size),
+    }
+    checksums = dict((name, Checksums(src)) for name, src in rasters.items())
+    layouts = dict(LAYOUTS)
+
+    report = benchmark_util.Report(
+        'tiff_codec_matrix',
+        ['raster', 'compress', 'predictor', 'layout', 'threads', 'encode_mb_s',
+         'decode_mb_s', 'ratio', 'lossless'])
+    filepath = '/vsimem/tiff_codec_benchmark.tif'
+    for raster_name, compress, predictor, layout, threads in Cases(
+        rasters, codecs):
+      src = rasters[raster_name]
+      raw_mb = float(gdrivers_util.RasterSize(src)) / benchmark_util.MB
+      options = (['COMPRESS=' + compress, 'PREDICTOR=' + predictor,
+                  'NUM_THREADS=' + threads] + layouts[layout] +
+                 CODECS[compress][2])
+      with gcore_util.GdalUnlinkWhenDone(filepath):
+        encode_seconds, decode_seconds, compressed_size, dst = self.Measure(
+            src, filepath, options, threads)
+        lossless = Checksums(dst) == checksums[raster_name]
+        dst = None
+
+      if CODECS[compress][1]:
+        self.assertTrue(lossless, options)
+      report.Add(
+          raster=raster_name, compress=compress, predictor=predictor,
+          layout=layout, threads=threads,
+          encode_mb_s=benchmark_util.Rate(raw_mb, encode_seconds),
+          decode_mb_s=benchmark_util.Rate(raw_mb, decode_seconds),
+          ratio=raw_mb * benchmark_util.MB / compressed_size,
+          lossless=lossless)
+
+    self.assertTrue(report.rows)
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
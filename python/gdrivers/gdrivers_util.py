@@ -23,9 +23,12 @@ http://trac.osgeo.org/gdal/browser/trunk/autotest/pymod/gdaltest.py#L284
 """
 
 import contextlib
+import copy
 import json
+from multiprocessing.pool import ThreadPool
 from optparse import OptionParser
 import os
+import threading
 import unittest
 
 from osgeo import gdal
@@ -35,6 +38,11 @@ import gflags as flags
 import logging
 from autotest2.gcore import gcore_util
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
 FLAGS = flags.FLAGS
 
 drivers = [gdal.GetDriver(i).ShortName.lower()
@@ -218,6 +226,10 @@ TIFF_BYTE_FILE = (
     '\x31\x31\x4e\x7c\x00')
 
 
+# Largest size in bytes that BlockCacheAtLeast will grow the GDAL block cache.
+MAX_BLOCK_CACHE = 1 << 30
+
+
 def SkipIfDriverMissing(driver_name):
   """Decorator that only runs a test if a required driver is found.
 
@@ -427,6 +439,21 @@ class DriverTestCase(unittest.TestCase):
     band = self.src.GetRasterBand(band_num)
     self.assertEqual(checksum, band.Checksum(xoff, yoff, xsize, ysize))
 
+  def CheckBandSubRegions(self, band_num, regions):
+    """Check the checksums of many windows with one read of the band.
+
+    Requires numpy.
+
+    Args:
+      band_num: int, Band to check.
+      regions: List of (checksum, xoff, yoff, xsize, ysize) tuples.
+    """
+    band = self.src.GetRasterBand(band_num)
+    windows = [region[1:] for region in regions]
+    checksums = ChecksumWindows(band, windows)
+    for region, checksum in zip(regions, checksums):
+      self.assertEqual(region[0], checksum, 'window %s' % (region[1:],))
+
   # TODO(schwehr): Add assertCreateCopyInterrupt method.
   def CheckCreateCopy(self,
                       check_checksums=True,
@@ -535,62 +562,212 @@ class DriverTestCase(unittest.TestCase):
 
     Must call CheckOpen before using this.
     """
-    expect = json.load(open(self.filepath + '.json'))
-    options = gdal.InfoOptions(
-        format='json', computeMinMax=True, stats=True, computeChecksum=True)
-    result = gdal.Info(self.src, options=options)
-    # Save in case of failure.
-    result_json = json.dumps(result)
-    basename_json = os.path.basename(self.filepath) + '.json'
-
-    # Some drivers include the version number and a difference is okay as long
-    # as the driverShortName is the same, it's okay.
-    expect.pop('driverLongName')
-    result.pop('driverLongName')
-
-    description_expect = expect.pop('description')
-    description_result = result.pop('description')
-    self.assertEqual(os.path.basename(description_result), description_expect)
-
-    files_expect = expect.pop('files')
-    files_result = result.pop('files')
-    self.assertEqual(len(files_result), len(files_expect),
-                     '%s versus %s' % (files_result, files_expect))
-    for filepath_result, filepath_expect in zip(files_result, files_expect):
-      self.assertEqual(os.path.basename(filepath_result), filepath_expect)
-
-    extent_expect_field = _GetExtentField(expect)
-    extent_result_field = _GetExtentField(result)
-
-    if not extent_expect_field or extent_expect_field != extent_result_field:
-      MaybeWriteOutputFile(basename_json, result_json)
-      self.assertEqual(extent_expect_field, extent_result_field, self.filepath)
+    with BlockCacheAtLeast(RasterSize(self.src)):
+      result = GetInfo(self.src)
+    self.CheckInfoResult(self.filepath, result)
 
-    extent_expect = expect.pop(extent_expect_field)['coordinates'][0]
-    extent_result = result.pop(extent_result_field)['coordinates'][0]
+  def CheckInfoFiles(self, filepaths, num_threads=None):
+    """Compare many files against their golden json dumps.
+
+    The gdal.Info calls are done in a pool of threads, each with its own open
+    dataset, sharing a block cache of MAX_BLOCK_CACHE bytes.  The comparisons
+    are done afterwards in the calling thread.  Does not change self.src.
+
+    Args:
+      filepaths: List of str paths that each have a .json golden file.
+      num_threads: int, Number of workers.  Defaults to the number of CPUs.
+    """
+    def _Info(filepath):
+      src = gdal.Open(filepath, gdal.GA_ReadOnly)
+      if not src:
+        return None
+      return GetInfo(src)
+
+    pool = ThreadPool(num_threads)
+    try:
+      with BlockCacheAtLeast(MAX_BLOCK_CACHE):
+        results = pool.map(_Info, filepaths)
+    finally:
+      pool.close()
+      pool.join()
+
+    for filepath, result in zip(filepaths, results):
+      self.assertTrue(result, '%s driver unable to open %s' % (self.driver_name,
+                                                               filepath))
+      self.assertEqual(self.driver_name, result['driverShortName'].lower(),
+                       filepath)
+      self.CheckInfoResult(filepath, result)
+
+  def CheckInfoResult(self, filepath, result):
+    """Compare the output of GetInfo to the golden json dump of filepath.
+
+    Args:
+      filepath: str, Path to the file that was checked.  The golden is
+        filepath + '.json'.
+      result: Dictionary from GetInfo.
+    """
+    expect = LoadGoldenJson(filepath + '.json')
+    diffs = DiffInfo(expect, result)
+    if diffs:
+      MaybeWriteOutputFile(os.path.basename(filepath) + '.json',
+                           json.dumps(result))
+    self.assertFalse(diffs, '%s:\n%s' % (filepath, '\n'.join(diffs)))
+
+
+def GetInfo(src):
+  """Get the gdal.Info json used by CheckInfo.
+
+  The min/max, statistics and checksum are each a pass over the pixels.  Use
+  GetInfo inside BlockCacheAtLeast so that only the first pass has to read and
+  decode the blocks.
+
+  Args:
+    src: An open gdal Dataset.
 
-    self.assertEqual(len(extent_result), len(extent_expect))
-    for a, b in zip(extent_result, extent_expect):
-      self.assertAlmostEqual(a[0], b[0], places=2, msg=self.filepath)
+  Returns:
+    Dictionary of the json output of gdal.Info.
+  """
+  options = gdal.InfoOptions(
+      format='json', computeMinMax=True, stats=True, computeChecksum=True)
+  return gdal.Info(src, options=options)
+
+
+def RasterSize(src):
+  """Number of bytes needed to hold all of the pixels of a dataset."""
+  return sum(
+      src.RasterXSize * src.RasterYSize *
+      gdal.GetDataTypeSize(src.GetRasterBand(band_num).DataType) // 8
+      for band_num in range(1, src.RasterCount + 1))
+
+
+@contextlib.contextmanager
+def BlockCacheAtLeast(num_bytes):
+  """Grow the GDAL block cache for the duration of the context.
 
-    bands_expect = expect.pop('bands')
-    bands_result = result.pop('bands')
-    if bands_result != bands_expect:
-      MaybeWriteOutputFile(basename_json, result_json)
-      self.assertEqual(bands_result, bands_expect, self.filepath)
+  The cache is never shrunk and is limited to MAX_BLOCK_CACHE bytes.
 
-    srs_wkt_expect = expect.pop('coordinateSystem')['wkt']
-    srs_wkt_result = result.pop('coordinateSystem')['wkt']
-    if srs_wkt_expect:
-      srs_expect = osr.SpatialReference(wkt=str(srs_wkt_expect))
-      srs_result = osr.SpatialReference(wkt=str(srs_wkt_result))
-      if not srs_expect.IsSame(srs_result):
-        MaybeWriteOutputFile(basename_json, result_json)
-        self.assertTrue(srs_expect.IsSame(srs_result), self.filepath)
+  Args:
+    num_bytes: int, Size in bytes that the cache should be able to hold.
+
+  Yields:
+    None
+  """
+  original = gdal.GetCacheMax()
+  num_bytes = min(num_bytes, MAX_BLOCK_CACHE)
+  if num_bytes > original:
+    gdal.SetCacheMax(num_bytes)
+  try:
+    yield
+  finally:
+    gdal.SetCacheMax(original)
+
+
+# Parsed golden json files keyed by path.  Each value is a tuple of the file
+# modification time and the parsed document.
+_golden_cache = {}
+_golden_cache_lock = threading.Lock()
+
+
+def LoadGoldenJson(filepath):
+  """Parse a golden json file, keeping the result for later calls.
+
+  The file is parsed again if it has been modified since it was cached.
+
+  Args:
+    filepath: str, Path to a json file.
+
+  Returns:
+    A copy of the parsed document that the caller is free to modify.
+  """
+  mtime = os.path.getmtime(filepath)
+  with _golden_cache_lock:
+    cached = _golden_cache.get(filepath)
+    if cached is None or cached[0] != mtime:
+      with open(filepath) as golden_file:
+        cached = (mtime, json.load(golden_file))
+      _golden_cache[filepath] = cached
+  return copy.deepcopy(cached[1])
 
-    if result != expect:
-      MaybeWriteOutputFile(basename_json, result_json)
-      self.assertEqual(result, expect, self.filepath)
+
+def DiffInfo(expect, result):
+  """Find the differences between two gdal.Info json dictionaries.
+
+  Ignores the driverLongName, the directories in the description and files,
+  extent x coordinates that match to 2 decimal places, and coordinate systems
+  that are the same but written differently.
+
+  Args:
+    expect: Dictionary from a golden json file.
+    result: Dictionary from GetInfo.
+
+  Returns:
+    A list of str describing each difference.  Empty if they match.
+  """
+  expect = copy.deepcopy(expect)
+  result = copy.deepcopy(result)
+  diffs = []
+
+  expect.pop('driverLongName', None)
+  result.pop('driverLongName', None)
+
+  description_expect = expect.pop('description', None)
+  description_result = result.pop('description', None)
+  if description_result is not None:
+    description_result = os.path.basename(description_result)
+  if description_result != description_expect:
+    diffs.append('description: %r != %r' % (description_result,
+                                           description_expect))
+
+  files_expect = expect.pop('files', [])
+  files_result = [os.path.basename(filepath)
+                  for filepath in result.pop('files', [])]
+  if files_result != files_expect:
+    diffs.append('files: %r != %r' % (files_result, files_expect))
+
+  extent_expect_field = _GetExtentField(expect)
+  extent_result_field = _GetExtentField(result)
+  if extent_expect_field != extent_result_field:
+    diffs.append('extent field: %r != %r' % (extent_result_field,
+                                            extent_expect_field))
+  elif extent_expect_field:
+    extent_expect = expect.pop(extent_expect_field)['coordinates'][0]
+    extent_result = result.pop(extent_result_field)['coordinates'][0]
+    if len(extent_result) != len(extent_expect) or [
+        a for a, b in zip(extent_result, extent_expect)
+        if round(a[0] - b[0], 2)]:
+      diffs.append('%s: %r != %r' % (extent_expect_field, extent_result,
+                                     extent_expect))
+
+  srs_wkt_expect = expect.pop('coordinateSystem', {}).get('wkt')
+  srs_wkt_result = result.pop('coordinateSystem', {}).get('wkt')
+  if srs_wkt_expect:
+    srs_expect = osr.SpatialReference(wkt=str(srs_wkt_expect))
+    srs_result = osr.SpatialReference(wkt=str(srs_wkt_result or ''))
+    if not srs_expect.IsSame(srs_result):
+      diffs.append('coordinateSystem: %r != %r' % (srs_wkt_result,
+                                                   srs_wkt_expect))
+
+  _DiffJson('', result, expect, diffs)
+  return diffs
+
+
+def _DiffJson(path, result, expect, diffs):
+  """Recursively add a str to diffs for each leaf that does not match."""
+  if isinstance(result, dict) and isinstance(expect, dict):
+    for key in sorted(set(result) | set(expect)):
+      key_path = '%s/%s' % (path, key)
+      if key not in expect:
+        diffs.append('%s: added %r' % (key_path, result[key]))
+      elif key not in result:
+        diffs.append('%s: removed %r' % (key_path, expect[key]))
+      else:
+        _DiffJson(key_path, result[key], expect[key], diffs)
+  elif (isinstance(result, list) and isinstance(expect, list) and
+        len(result) == len(expect)):
+    for index, (a, b) in enumerate(zip(result, expect)):
+      _DiffJson('%s[%d]' % (path, index), a, b, diffs)
+  elif result != expect:
+    diffs.append('%s: %r != %r' % (path or '/', result, expect))
 
 
 def _GetExtentField(json_info):
@@ -616,3 +793,117 @@ def MaybeWriteOutputFile(filename, data):
   output_dir = os.environ['TEST_UNDECLARED_OUTPUTS_DIR']
   filepath = os.path.join(output_dir, os.path.basename(filename))
   open(filepath, 'w').write(data)
+
+
+# Primes cycled through for each value by GDALChecksumImage.
+_CHECKSUM_PRIMES = (7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43)
+
+_INT32_MIN = -2147483648
+_INT32_MAX = 2147483647
+
+
+def _IsFloatingPoint(gdal_type):
+  return gdal.GetDataTypeName(gdal_type).lstrip('C').startswith('Float')
+
+
+def _ChecksumValues(array, gdal_type):
+  """Convert pixels to the integers that GDALChecksumImage adds up.
+
+  GDALChecksumImage reads integer types as Int32, which clamps, and floating
+  point types as Float64, which it then rounds and clamps itself.  Complex
+  pixels are two values: real then imaginary.
+
+  Args:
+    array: 2D numpy array from ReadAsArray.
+    gdal_type: The GDAL data type of the band.
+
+  Returns:
+    2D numpy int64 array with one column per value.
+  """
+  if gdal.DataTypeIsComplex(gdal_type):
+    pairs = numpy.empty(array.shape + (2,), dtype=numpy.float64)
+    pairs[..., 0] = array.real
+    pairs[..., 1] = array.imag
+    array = pairs.reshape(array.shape[0], -1)
+
+  if _IsFloatingPoint(gdal_type):
+    values = numpy.asarray(array, dtype=numpy.float64)
+    finite = numpy.isfinite(values)
+    with numpy.errstate(invalid='ignore'):
+      rounded = numpy.floor(numpy.clip(values + 0.5, -_INT32_MAX, _INT32_MAX))
+    # NaN and infinity are counted as INT_MIN.
+    return numpy.where(finite, rounded, _INT32_MIN).astype(numpy.int64)
+
+  if array.dtype == numpy.uint64:
+    return numpy.minimum(array, _INT32_MAX).astype(numpy.int64)
+  return numpy.clip(array.astype(numpy.int64), _INT32_MIN, _INT32_MAX)
+
+
+def _Checksum(values):
+  """Add up the values like GDALChecksumImage.
+
+  The primes cycle with the row major index of each value in the window, so
+  the result does not depend on how GDAL chunks its reads.
+
+  Args:
+    values: 2D numpy int64 array from _ChecksumValues.
+
+  Returns:
+    int checksum.
+  """
+  values = values.ravel()
+  primes = numpy.array(_CHECKSUM_PRIMES, dtype=numpy.int64)
+  value_primes = primes[numpy.arange(values.size) % len(_CHECKSUM_PRIMES)]
+  # fmod keeps the sign of the value like the C % operator.
+  return int(numpy.fmod(values, value_primes).sum()) & 0xffff
+
+
+def ChecksumArray(array, gdal_type):
+  """Compute the same checksum as GDALChecksumImage from pixels in memory.
+
+  Requires numpy.
+
+  Args:
+    array: 2D numpy array of a whole window as returned by ReadAsArray.
+    gdal_type: The GDAL data type of the band the pixels came from.
+
+  Returns:
+    int checksum.
+  """
+  return _Checksum(_ChecksumValues(array, gdal_type))
+
+
+def ChecksumWindows(band, windows):
+  """Compute the checksums of many windows of a band with one read.
+
+  Reads the bounding box of all windows into memory once.  Gives the same
+  results as calling band.Checksum for each window.  Requires numpy.
+
+  Args:
+    band: gdal raster Band.
+    windows: List of (xoff, yoff, xsize, ysize) tuples.  None for a window
+      means the whole band.
+
+  Returns:
+    List of int checksums, one per window.
+  """
+  windows = [window or (0, 0, band.XSize, band.YSize) for window in windows]
+  if not windows:
+    return []
+  xmin = min(window[0] for window in windows)
+  ymin = min(window[1] for window in windows)
+  xmax = max(window[0] + window[2] for window in windows)
+  ymax = max(window[1] + window[3] for window in windows)
+
+  gdal_type = band.DataType
+  array = band.ReadAsArray(xmin, ymin, xmax - xmin, ymax - ymin)
+  values = _ChecksumValues(array, gdal_type)
+  values_per_pixel = 2 if gdal.DataTypeIsComplex(gdal_type) else 1
+
+  checksums = []
+  for xoff, yoff, xsize, ysize in windows:
+    x = (xoff - xmin) * values_per_pixel
+    y = yoff - ymin
+    checksums.append(
+        _Checksum(values[y:y + ysize, x:x + xsize * values_per_pixel]))
+  return checksums
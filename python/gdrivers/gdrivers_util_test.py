@@ -24,8 +24,14 @@ import unittest
 
 import mock
 from osgeo import gdal
+from autotest2.gcore import gcore_util
 from autotest2.gdrivers import gdrivers_util
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
 
 class DriversTest(unittest.TestCase):
 
@@ -123,6 +129,98 @@ class DriverTest(gdrivers_util.DriverTestCase):
                       data_type, nodata - 1)
 
 
+@unittest.skipIf(not numpy, 'Requires numpy')
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.MEM_DRIVER)
+class ChecksumWindowsTest(unittest.TestCase):
+
+  def setUp(self):
+    super(ChecksumWindowsTest, self).setUp()
+    self.windows = [None, (0, 0, 7, 5), (3, 2, 9, 8), (10, 9, 1, 1),
+                    (0, 11, 13, 1), (12, 0, 1, 12)]
+
+  def CreateBand(self, gdal_type, values):
+    src = gdal.GetDriverByName('MEM').Create('', 13, 12, 1, gdal_type)
+    band = src.GetRasterBand(1)
+    band.WriteArray(values)
+    return src, band
+
+  def CheckWindows(self, band):
+    expected = [band.Checksum(*(window or ())) for window in self.windows]
+    self.assertEqual(expected,
+                     gdrivers_util.ChecksumWindows(band, self.windows),
+                     gdal.GetDataTypeName(band.DataType))
+
+  def testIntegerTypes(self):
+    values = numpy.arange(-78, 78).reshape(12, 13) * 1234567
+    for gdal_type in (gdal.GDT_Byte, gdal.GDT_UInt16, gdal.GDT_Int16,
+                      gdal.GDT_UInt32, gdal.GDT_Int32):
+      _, band = self.CreateBand(gdal_type, values)
+      self.CheckWindows(band)
+
+  def testFloatingPointTypes(self):
+    values = (numpy.arange(-78, 78).reshape(12, 13) * 1e7 / 3.0)
+    values[0, 0] = numpy.nan
+    values[1, 1] = numpy.inf
+    values[2, 2] = -numpy.inf
+    values[3, 3] = -2.5
+    values[3, 4] = 2.5
+    values[4, 4] = 1e300
+    for gdal_type in (gdal.GDT_Float32, gdal.GDT_Float64):
+      _, band = self.CreateBand(gdal_type, values)
+      self.CheckWindows(band)
+
+  def testComplexTypes(self):
+    values = (numpy.arange(-78, 78).reshape(12, 13) * 1001 -
+              1j * numpy.arange(156).reshape(12, 13) * 17)
+    for gdal_type in (gdal.GDT_CInt16, gdal.GDT_CInt32, gdal.GDT_CFloat32,
+                      gdal.GDT_CFloat64):
+      _, band = self.CreateBand(gdal_type, values / 7.0)
+      self.CheckWindows(band)
+
+  def testChecksumArray(self):
+    values = numpy.arange(156).reshape(12, 13)
+    _, band = self.CreateBand(gdal.GDT_Int32, values)
+    self.assertEqual(band.Checksum(),
+                     gdrivers_util.ChecksumArray(values, gdal.GDT_Int32))
+
+  @gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
+  def testChunkedTiles(self):
+    # With a small cache, a row of 256x256 tiles is more than the 10 MB that
+    # GDALChecksumImage reads at once, so it reads the window in chunks.  The
+    # checksum must not depend on that.
+    filepath = '/vsimem/checksum_chunked.tif'
+    xsize = 10240
+    ysize = 300
+    values = numpy.arange(xsize * ysize).reshape(ysize, xsize) * 7919
+    windows = [None, (256, 10, xsize - 300, ysize - 10),
+               (301, 17, xsize - 611, 203)]
+    for gdal_type in (gdal.GDT_Float64, gdal.GDT_Int32):
+      with gcore_util.GdalUnlinkWhenDone(filepath):
+        dst = gdal.GetDriverByName('GTiff').Create(
+            filepath, xsize, ysize, 1, gdal_type, options=['TILED=YES'])
+        band = dst.GetRasterBand(1)
+        band.WriteArray(values)
+        dst.FlushCache()
+
+        expected = [band.Checksum(*(window or ())) for window in windows]
+        original_cache = gdal.GetCacheMax()
+        gdal.SetCacheMax(1000000)
+        try:
+          chunked = [band.Checksum(*(window or ())) for window in windows]
+        finally:
+          gdal.SetCacheMax(original_cache)
+        self.assertEqual(expected, chunked)
+
+        name = gdal.GetDataTypeName(gdal_type)
+        self.assertEqual(expected,
+                         gdrivers_util.ChecksumWindows(band, windows), name)
+        self.assertEqual(
+            expected[2],
+            gdrivers_util.ChecksumArray(band.ReadAsArray(*windows[2]),
+                                        gdal_type), name)
+        dst = None
+
+
 @contextlib.contextmanager
 def TempRemoveEnv(key):
   original = os.getenv(key)
@@ -153,6 +251,73 @@ class OtherFunctionsTest(unittest.TestCase):
             json.loads('{"wgs84Extent": "foo","extent": "bar"}')))
     self.assertIsNone(gdrivers_util._GetExtentField(json.loads('{}')))
 
+  def testBlockCacheAtLeast(self):
+    original = gdal.GetCacheMax()
+    with gdrivers_util.BlockCacheAtLeast(original + 1024):
+      self.assertEqual(original + 1024, gdal.GetCacheMax())
+    self.assertEqual(original, gdal.GetCacheMax())
+
+    with gdrivers_util.BlockCacheAtLeast(original - 1):
+      self.assertEqual(original, gdal.GetCacheMax())
+    self.assertEqual(original, gdal.GetCacheMax())
+
+  def testLoadGoldenJson(self):
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      filepath = os.path.join(tempdir, 'golden.json')
+      with open(filepath, 'w') as golden_file:
+        golden_file.write('{"a": [1, 2], "b": "c"}')
+      os.utime(filepath, (1000, 1000))
+
+      golden = gdrivers_util.LoadGoldenJson(filepath)
+      self.assertEqual({'a': [1, 2], 'b': 'c'}, golden)
+
+      # Callers get a copy that they may modify.
+      golden['a'].append(3)
+      golden.pop('b')
+      self.assertEqual({'a': [1, 2], 'b': 'c'},
+                       gdrivers_util.LoadGoldenJson(filepath))
+
+      # The cached document is used while the file is unchanged.
+      with open(filepath, 'w') as golden_file:
+        golden_file.write('{"d": 4}')
+      os.utime(filepath, (1000, 1000))
+      self.assertEqual({'a': [1, 2], 'b': 'c'},
+                       gdrivers_util.LoadGoldenJson(filepath))
+
+      os.utime(filepath, (2000, 2000))
+      self.assertEqual({'d': 4}, gdrivers_util.LoadGoldenJson(filepath))
+
+  def testDiffInfo(self):
+    expect = {
+        'description': 'a.tif',
+        'driverShortName': 'GTiff',
+        'driverLongName': 'GeoTIFF',
+        'files': ['a.tif'],
+        'coordinateSystem': {'wkt': ''},
+        'wgs84Extent': {'type': 'Polygon',
+                        'coordinates': [[[1.0, 2.0], [3.0, 4.0]]]},
+        'bands': [{'band': 1, 'checksum': 4672}],
+    }
+    result = json.loads(json.dumps(expect))
+    result['description'] = '/some/dir/a.tif'
+    result['driverLongName'] = 'GeoTIFF 2'
+    result['files'] = ['/some/dir/a.tif']
+    result['wgs84Extent']['coordinates'][0][0][0] = 1.001
+    self.assertEqual([], gdrivers_util.DiffInfo(expect, result))
+
+    result['bands'][0]['checksum'] = 1
+    result['bands'][0]['noDataValue'] = 0
+    result['size'] = [20, 20]
+    self.assertEqual(
+        ['/bands[0]/checksum: 1 != 4672',
+         '/bands[0]/noDataValue: added 0',
+         '/size: added [20, 20]'],
+        gdrivers_util.DiffInfo(expect, result))
+
+    result = json.loads(json.dumps(expect))
+    result['wgs84Extent']['coordinates'][0][0][0] = 1.5
+    self.assertEqual(1, len(gdrivers_util.DiffInfo(expect, result)))
+
   def testMaybeWriteOutputFile(self):
     undeclared = 'TEST_UNDECLARED_OUTPUTS_DIR'
     filename_noexist = 'noexist.txt'
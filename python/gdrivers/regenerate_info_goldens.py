@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Regenerate the golden json files used by DriverTestCase.CheckInfo.
+
+Finds every fixture that has a golden next to it (e.g. byte.tif and
+byte.tif.json), recomputes the gdal.Info json in a pool of processes and
+rewrites only the goldens that differ in more than the fields that CheckInfo
+ignores.  Each difference is printed.
+
+Usage:
+
+  regenerate_info_goldens.py [-n] [-j PROCESSES] [DIR ...]
+
+With no DIR, searches the testdata directories of all of autotest2/python.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+
+from osgeo import gdal
+
+import logging
+from autotest2.gdrivers import gdrivers_util
+
+GOLDEN_EXT = '.json'
+
+
+def FindGoldens(dirpaths):
+  """Find fixtures with a golden json file.
+
+  Args:
+    dirpaths: List of str directories to search recursively.
+
+  Returns:
+    Sorted list of str paths to the fixtures.  The golden for each is the
+    path plus GOLDEN_EXT.
+  """
+  fixtures = []
+  for dirpath in dirpaths:
+    for root, _, filenames in os.walk(dirpath):
+      for filename in filenames:
+        if not filename.endswith(GOLDEN_EXT):
+          continue
+        fixture = os.path.join(root, filename[:-len(GOLDEN_EXT)])
+        if os.path.isfile(fixture):
+          fixtures.append(fixture)
+  return sorted(fixtures)
+
+
+def NormalizeInfo(info):
+  """Strip the directories from a gdal.Info json dictionary in place."""
+  if 'description' in info:
+    info['description'] = os.path.basename(info['description'])
+  if 'files' in info:
+    info['files'] = [os.path.basename(filepath) for filepath in info['files']]
+  return info
+
+
+def FormatGolden(info):
+  """Lay out the json like gdalinfo -json."""
+  return json.dumps(info, indent=2, separators=(',', ':')) + '\n'
+
+
+def _ComputeInfo(fixture):
+  """Process pool worker returning (fixture, info or None, error message)."""
+  gdal.ErrorReset()
+  src = gdal.Open(fixture, gdal.GA_ReadOnly)
+  if not src:
+    return fixture, None, gdal.GetLastErrorMsg() or 'Unable to open'
+  with gdrivers_util.BlockCacheAtLeast(gdrivers_util.RasterSize(src)):
+    info = gdrivers_util.GetInfo(src)
+  return fixture, NormalizeInfo(info), None
+
+
+def Regenerate(fixtures, processes=None, dry_run=False, options=None,
+               out=sys.stdout):
+  """Recompute the goldens of fixtures and rewrite the changed ones.
+
+  Args:
+    fixtures: List of str paths from FindGoldens.
+    processes: int, Number of worker processes.  Defaults to the CPU count.
+    dry_run: If True, only report the differences.
+    options: optparse options passed to gdrivers_util.Setup in each worker
+      so that auxiliary files are not written next to the fixtures.
+    out: File like object for the report.
+
+  Returns:
+    A tuple of lists of str paths: (changed, failed).
+  """
+  initializer = gdrivers_util.Setup if options else None
+  initargs = (options,) if options else ()
+  pool = multiprocessing.Pool(processes, initializer, initargs)
+  try:
+    results = pool.map(_ComputeInfo, fixtures)
+  finally:
+    pool.close()
+    pool.join()
+
+  changed = []
+  failed = []
+  for fixture, info, error in results:
+    if error:
+      out.write('%s: FAILED %s\n' % (fixture, error))
+      failed.append(fixture)
+      continue
+
+    golden = fixture + GOLDEN_EXT
+    diffs = gdrivers_util.DiffInfo(gdrivers_util.LoadGoldenJson(golden), info)
+    if not diffs:
+      logging.info('Unchanged: %s', golden)
+      continue
+
+    changed.append(golden)
+    out.write('%s:\n' % golden)
+    for diff in diffs:
+      out.write('  %s\n' % diff)
+    if not dry_run:
+      with open(golden, 'w') as golden_file:
+        golden_file.write(FormatGolden(info))
+
+  return changed, failed
+
+
+def main(argv):
+  parser = gdrivers_util.CreateParser()
+  parser.usage = '%prog [options] [DIR ...]'
+  parser.add_option('-n', '--dry-run', default=False, action='store_true',
+                    help='Report differences without writing any goldens.')
+  parser.add_option('-j', '--processes', default=None, type='int',
+                    help='Number of worker processes.  Defaults to the '
+                    'number of CPUs.',
+                    metavar='N')
+  options, args = parser.parse_args(argv[1:])
+  gdrivers_util.Setup(options)
+
+  dirpaths = args or [os.path.dirname(os.path.dirname(
+      os.path.abspath(__file__)))]
+  fixtures = FindGoldens(dirpaths)
+  logging.info('Found %d goldens', len(fixtures))
+
+  changed, failed = Regenerate(
+      fixtures, options.processes, options.dry_run, options)
+  sys.stdout.write('%d goldens, %d %s, %d failed\n' % (
+      len(fixtures), len(changed),
+      'differ' if options.dry_run else 'rewritten', len(failed)))
+  return 1 if failed else 0
+
+
+if __name__ == '__main__':
+  sys.exit(main(sys.argv))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for regenerate_info_goldens.py."""
+
+import json
+import os
+import unittest
+
+from osgeo import gdal
+import six
+
+from autotest2.gcore import gcore_util
+from autotest2.gdrivers import gdrivers_util
+from autotest2.gdrivers import regenerate_info_goldens
+
+
+class FindGoldensTest(unittest.TestCase):
+
+  def testFindGoldens(self):
+    with gcore_util.TestTemporaryDirectory() as tempdir:
+      os.mkdir(os.path.join(tempdir, 'sub'))
+      for filename in ('a.tif', 'a.tif.json', 'sub/b.grb', 'sub/b.grb.json',
+                       'esripoint.json', 'c.tif'):
+        open(os.path.join(tempdir, filename), 'w').close()
+
+      self.assertEqual(
+          [os.path.join(tempdir, 'a.tif'),
+           os.path.join(tempdir, 'sub', 'b.grb')],
+          regenerate_info_goldens.FindGoldens([tempdir]))
+
+  def testNormalizeInfo(self):
+    info = {'description': '/a/b/c.tif', 'files': ['/a/b/c.tif', 'd.aux']}
+    regenerate_info_goldens.NormalizeInfo(info)
+    self.assertEqual({'description': 'c.tif', 'files': ['c.tif', 'd.aux']},
+                     info)
+
+
+@gdrivers_util.SkipIfDriverMissing(gdrivers_util.GTIFF_DRIVER)
+class RegenerateTest(unittest.TestCase):
+
+  def setUp(self):
+    super(RegenerateTest, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  def testRegenerate(self):
+    # Keep the statistics from adding an .aux.xml to the file list.
+    with gdrivers_util.ConfigOption('GDAL_PAM_ENABLED', 'NO'), \
+         gcore_util.TestTemporaryDirectory() as tempdir:
+      fixture = os.path.join(tempdir, 'a.tif')
+      golden = fixture + regenerate_info_goldens.GOLDEN_EXT
+      dst = gdal.GetDriverByName('GTiff').Create(fixture, 4, 3)
+      dst.GetRasterBand(1).Fill(7)
+      dst = None
+
+      _, info, error = regenerate_info_goldens._ComputeInfo(fixture)
+      self.assertIsNone(error)
+      self.assertEqual('a.tif', info['description'])
+      with open(golden, 'w') as golden_file:
+        golden_file.write(regenerate_info_goldens.FormatGolden(info))
+
+      out = six.StringIO()
+      changed, failed = regenerate_info_goldens.Regenerate(
+          [fixture], processes=1, out=out)
+      self.assertEqual(([], []), (changed, failed))
+      self.assertEqual('', out.getvalue())
+
+      info['bands'][0]['checksum'] += 1
+      with open(golden, 'w') as golden_file:
+        golden_file.write(regenerate_info_goldens.FormatGolden(info))
+      os.utime(golden, (1000, 1000))
+
+      changed, failed = regenerate_info_goldens.Regenerate(
+          [fixture], processes=1, dry_run=True, out=out)
+      self.assertEqual(([golden], []), (changed, failed))
+      self.assertIn('/bands[0]/checksum', out.getvalue())
+      with open(golden) as golden_file:
+        self.assertEqual(info, json.load(golden_file))
+
+      changed, failed = regenerate_info_goldens.Regenerate(
+          [fixture], processes=1, out=out)
+      self.assertEqual(([golden], []), (changed, failed))
+      with open(golden) as golden_file:
+        self.assertEqual(info['bands'][0]['checksum'] - 1,
+                         json.load(golden_file)['bands'][0]['checksum'])
+
+  def testMissingFixture(self):
+    out = six.StringIO()
+    changed, failed = regenerate_info_goldens.Regenerate(
+        ['/does/not/exist.tif'], processes=1, out=out)
+    self.assertEqual(([], ['/does/not/exist.tif']), (changed, failed))
+    self.assertIn('FAILED', out.getvalue())
+
+
+if __name__ == '__main__':
+  unittest.main()
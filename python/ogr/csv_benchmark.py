@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark reading CSV files with the type detection open options.
+
+csv_test covers quoting on tiny files.  This writes a tall and a wide CSV
+and reads each with sweeps of AUTODETECT_TYPE, AUTODETECT_SIZE_LIMIT and
+KEEP_GEOM_COLUMNS.  The report has the rows per second of a full read and
+the extra time that type detection adds to opening the file.
+
+Format is described here:
+
+http://www.gdal.org/drv_csv.html
+"""
+
+import csv
+import os
+import unittest
+
+from osgeo import gdal
+from osgeo import ogr
+import logging
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.ogr import ogr_util
+
+DRIVER = ogr_util.CSV_DRIVER
+
+# Name to (rows before scaling, number of columns after x and y).
+SHAPES = {
+    'tall': (100000, 8),
+    'wide': (2000, 200),
+}
+
+# The types cycle through the columns after x and y.
+COLUMN_TYPES = (ogr.OFTInteger, ogr.OFTReal, ogr.OFTString, ogr.OFTDate)
+
+GEOM_OPTIONS = ['X_POSSIBLE_NAMES=x', 'Y_POSSIBLE_NAMES=y']
+
+# Name to open options.  The first is the baseline for the detection cost.
+OPTION_SETS = (
+    ('strings', []),
+    ('autodetect_1k', ['AUTODETECT_TYPE=YES', 'AUTODETECT_SIZE_LIMIT=1000']),
+    ('autodetect_100k', ['AUTODETECT_TYPE=YES',
+                         'AUTODETECT_SIZE_LIMIT=100000']),
+    ('autodetect_all', ['AUTODETECT_TYPE=YES', 'AUTODETECT_SIZE_LIMIT=0']),
+    ('geom_keep', GEOM_OPTIONS + ['KEEP_GEOM_COLUMNS=YES']),
+    ('geom_drop', GEOM_OPTIONS + ['KEEP_GEOM_COLUMNS=NO']),
+    ('autodetect_geom_drop', GEOM_OPTIONS + [
+        'KEEP_GEOM_COLUMNS=NO', 'AUTODETECT_TYPE=YES',
+        'AUTODETECT_SIZE_LIMIT=0']),
+)
+
+
+def ColumnValue(column_type, row, column):
+  if column_type == ogr.OFTInteger:
+    return str(row * 7 + column)
+  if column_type == ogr.OFTReal:
+    return '%.3f' % (row * 0.125 + column)
+  if column_type == ogr.OFTString:
+    return 'text %d, "%d"' % (row, column)
+  return '20%02d-%02d-%02d' % (row % 100, row % 12 + 1, row % 28 + 1)
+
+
+def WriteCsv(filepath, num_rows, num_columns):
+  """Write x, y and num_columns columns of the COLUMN_TYPES."""
+  types = [COLUMN_TYPES[i % len(COLUMN_TYPES)] for i in range(num_columns)]
+  with open(filepath, 'w') as f:
+    writer = csv.writer(f, lineterminator='\n')
+    writer.writerow(['x', 'y'] + ['c%d' % i for i in range(num_columns)])
+    for row in range(num_rows):
+      writer.writerow(
+          ['%.6f' % (row % 360 - 180), '%.6f' % (row % 180 - 90)] +
+          [ColumnValue(column_type, row, column)
+           for column, column_type in enumerate(types)])
+  return types
+
+
+def ReadAll(layer):
+  """Read every field of every feature and return the number of rows."""
+  num_fields = layer.GetLayerDefn().GetFieldCount()
+  count = 0
+  for feature in ogr_util.Features(layer):
+    for field_num in range(num_fields):
+      feature.GetField(field_num)
+    feature.GetGeometryRef()
+    count += 1
+  return count
+
+
+@ogr_util.SkipIfDriverMissing(DRIVER)
+class CsvIngestBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(CsvIngestBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  def CheckLayer(self, layer, name, options, types):
+    """Check the fields and the geometry for the options."""
+    defn = layer.GetLayerDefn()
+    names = [defn.GetFieldDefn(i).GetName()
+             for i in range(defn.GetFieldCount())]
+    xy_names = [] if 'KEEP_GEOM_COLUMNS=NO' in options else ['x', 'y']
+    self.assertEqual(xy_names + ['c%d' % i for i in range(len(types))], names,
+                     name)
+    self.assertEqual(GEOM_OPTIONS[0] in options,
+                     defn.GetGeomType() != ogr.wkbNone, name)
+
+    # A small AUTODETECT_SIZE_LIMIT may not reach past the first row of a wide
+    # file, so only check the types when the whole file is used.
+    if 'AUTODETECT_SIZE_LIMIT=0' in options:
+      detected = [defn.GetFieldDefn(len(xy_names) + i).GetType()
+                  for i in range(len(types))]
+      self.assertEqual(types, detected, name)
+
+  def testOpenOptions(self):
+    report = benchmark_util.Report(
+        'csv_ingest',
+        ['shape', 'rows', 'columns', 'options', 'open_ms', 'detect_ms',
+         'rows_s', 'mb_s'])
+    with gcore_util.TestTemporaryDirectory(prefix='csv_benchmark') as tmpdir:
+      for shape, (num_rows, num_columns) in sorted(SHAPES.items()):
+        num_rows = benchmark_util.Scale(num_rows)
+        filepath = os.path.join(tmpdir, shape + '.csv')
+        types = WriteCsv(filepath, num_rows, num_columns)
+        file_mb = float(os.path.getsize(filepath)) / benchmark_util.MB
+
+        baseline_open = None
+        for name, options in OPTION_SETS:
+          with benchmark_util.Timer() as open_timer:
+            src = gdal.OpenEx(filepath, gdal.OF_VECTOR,
+                              allowed_drivers=['CSV'], open_options=options)
+            layer = src.GetLayer(0)
+            layer.GetLayerDefn()
+          self.CheckLayer(layer, name, options, types)
+
+          with benchmark_util.Timer() as read_timer:
+            self.assertEqual(num_rows, ReadAll(layer), name)
+          layer = None
+          src = None
+
+          if baseline_open is None:
+            baseline_open = open_timer.seconds
+          seconds = open_timer.seconds + read_timer.seconds
+          report.Add(
+              shape=shape, rows=num_rows, columns=num_columns + 2,
+              options=name, open_ms=open_timer.seconds * 1000,
+              detect_ms=(open_timer.seconds - baseline_open) * 1000,
+              rows_s=benchmark_util.Rate(num_rows, seconds),
+              mb_s=benchmark_util.Rate(file_mb, seconds))
+          logging.info('%s %s: %.1f s', shape, name, seconds)
+
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,168 @@
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local HTTP stand-in for an ESRI ArcGIS FeatureService query endpoint.
+
+The GeoJSON and ESRIJSON drivers page through a FeatureService by adding
+resultOffset to the URL for as long as the server says that the transfer
+limit was exceeded.  FeatureServiceServer serves a synthetic layer of points
+so that paging can be tested without a real server.
+
+Usage:
+
+  with feature_service_util.FeatureServiceServer(95, 10) as server:
+    src = ogr.Open(server.Url())
+    ...
+  offsets = [request.offset for request in server.requests]
+
+Feature i (starting at 1) has FID i, an integer "value" of 10 * i and is a
+point at (i, -i).
+"""
+
+import collections
+import json
+import threading
+
+import logging
+import six
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib import parse
+
+QUERY_PATH = '/FeatureServer/0/query'
+
+Request = collections.namedtuple(
+    'Request', ['path', 'output', 'offset', 'count'])
+
+
+def GeoJsonPage(fids, exceeded_transfer_limit):
+  return {
+      'type': 'FeatureCollection',
+      'properties': {'exceededTransferLimit': exceeded_transfer_limit},
+      'features': [{
+          'type': 'Feature',
+          'id': fid,
+          'geometry': {'type': 'Point', 'coordinates': [fid, -fid]},
+          'properties': {'value': 10 * fid},
+      } for fid in fids],
+  }
+
+
+def EsriJsonPage(fids, exceeded_transfer_limit):
+  return {
+      'objectIdFieldName': 'objectid',
+      'geometryType': 'esriGeometryPoint',
+      'spatialReference': {'wkid': 4326},
+      'fields': [
+          {'name': 'objectid', 'type': 'esriFieldTypeOID'},
+          {'name': 'value', 'type': 'esriFieldTypeInteger'},
+      ],
+      'features': [{
+          'geometry': {'x': fid, 'y': -fid},
+          'attributes': {'objectid': fid, 'value': 10 * fid},
+      } for fid in fids],
+      'exceededTransferLimit': exceeded_transfer_limit,
+  }
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+  def do_GET(self):  # pylint: disable=invalid-name
+    url = parse.urlparse(self.path)
+    query = dict(parse.parse_qsl(url.query))
+    owner = self.server.owner
+    if url.path != QUERY_PATH:
+      owner.Record(Request(self.path, None, None, None))
+      self.send_error(404)
+      return
+
+    output = query.get('f', 'geojson')
+    offset = query.get('resultOffset')
+    count = query.get('resultRecordCount')
+    owner.Record(Request(self.path, output,
+                         None if offset is None else int(offset),
+                         None if count is None else int(count)))
+
+    body = json.dumps(owner.Page(output, int(offset or 0),
+                                 int(count or owner.max_record_count)))
+    if not isinstance(body, bytes):
+      body = body.encode('utf-8')
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, fmt, *args):
+    logging.debug('FeatureServiceServer: ' + fmt, *args)
+
+
+class _ThreadingHttpServer(socketserver.ThreadingMixIn,
+                           BaseHTTPServer.HTTPServer):
+  daemon_threads = True
+
+
+class FeatureServiceServer(object):
+  """Context manager serving num_features points on a local port.
+
+  Attributes:
+    num_features: int, Number of features in the layer.
+    max_record_count: int, Largest page the server returns.  Also the page
+      size when the request does not have resultRecordCount.
+    requests: List of Request, one for each request in the order received.
+    port: int, Port the server is listening on while in the with block.
+  """
+
+  def __init__(self, num_features, max_record_count=1000):
+    self.num_features = num_features
+    self.max_record_count = max_record_count
+    self.requests = []
+    self.port = None
+    self._lock = threading.Lock()
+    self._server = None
+    self._thread = None
+
+  def __enter__(self):
+    self._server = _ThreadingHttpServer(('127.0.0.1', 0), _Handler)
+    self._server.owner = self
+    self.port = self._server.server_address[1]
+    self._thread = threading.Thread(target=self._server.serve_forever)
+    self._thread.daemon = True
+    self._thread.start()
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self._server.shutdown()
+    self._server.server_close()
+    self._thread.join()
+
+  def Url(self, output='geojson', **params):
+    """URL of the query endpoint with extra query parameters."""
+    query = [('f', output)] + sorted(six.iteritems(params))
+    return 'http://127.0.0.1:%d%s?%s' % (self.port, QUERY_PATH,
+                                         parse.urlencode(query))
+
+  def Record(self, request):
+    with self._lock:
+      self.requests.append(request)
+
+  def Page(self, output, offset, count):
+    """The response as a dictionary for resultOffset and resultRecordCount."""
+    count = min(count, self.max_record_count)
+    last = min(offset + count, self.num_features)
+    fids = range(offset + 1, last + 1)
+    exceeded_transfer_limit = last < self.num_features
+    if output == 'json':
+      return EsriJsonPage(fids, exceeded_transfer_limit)
+    return GeoJsonPage(fids, exceeded_transfer_limit)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for feature_service_util.py."""
+
+import json
+import unittest
+
+from six.moves.urllib import error
+from six.moves.urllib import request
+
+from autotest2.ogr import feature_service_util
+
+
+def Fetch(url):
+  response = request.urlopen(url)
+  try:
+    return json.loads(response.read().decode('utf-8'))
+  finally:
+    response.close()
+
+
+class FeatureServiceServerTest(unittest.TestCase):
+
+  def testPage(self):
+    server = feature_service_util.FeatureServiceServer(25, 10)
+    page = server.Page('geojson', 20, 10)
+    self.assertEqual([21, 22, 23, 24, 25],
+                     [feature['id'] for feature in page['features']])
+    self.assertFalse(page['properties']['exceededTransferLimit'])
+
+    page = server.Page('geojson', 0, 100)
+    self.assertEqual(10, len(page['features']))
+    self.assertTrue(page['properties']['exceededTransferLimit'])
+
+    page = server.Page('json', 5, 2)
+    self.assertEqual(
+        [{'objectid': 6, 'value': 60}, {'objectid': 7, 'value': 70}],
+        [feature['attributes'] for feature in page['features']])
+    self.assertTrue(page['exceededTransferLimit'])
+
+    self.assertEqual([], server.Page('geojson', 30, 10)['features'])
+
+  def testServe(self):
+    with feature_service_util.FeatureServiceServer(25, 10) as server:
+      page = Fetch(server.Url())
+      self.assertEqual(list(range(1, 11)),
+                       [feature['id'] for feature in page['features']])
+
+      page = Fetch(server.Url(resultOffset=20, resultRecordCount=3))
+      self.assertEqual([21, 22, 23],
+                       [feature['id'] for feature in page['features']])
+      self.assertTrue(page['properties']['exceededTransferLimit'])
+
+      page = Fetch(server.Url('json', resultOffset=23))
+      self.assertEqual([24, 25], [feature['attributes']['objectid']
+                                  for feature in page['features']])
+      self.assertFalse(page['exceededTransferLimit'])
+
+      with self.assertRaises(error.HTTPError):
+        Fetch('http://127.0.0.1:%d/other' % server.port)
+
+    self.assertEqual(
+        [('geojson', None, None), ('geojson', 20, 3), ('json', 23, None),
+         (None, None, None)],
+        [(r.output, r.offset, r.count) for r in server.requests])
+    self.assertEqual('/other', server.requests[-1].path)
+
+
+if __name__ == '__main__':
+  unittest.main()
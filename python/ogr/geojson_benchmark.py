@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark reading large GeoJSON and GeoJSONSeq files from disk.
+
+The geojson_test cases are small strings.  This writes FeatureCollections
+and GeoJSON text sequences with increasing numbers of features, then reads
+each in a fresh process with ogr.Open and a walk over the features to get
+the throughput and the peak resident memory.
+
+The slope of the peak resident memory growth against the file size is
+logged and reported.  A slope well below 1 means the driver streams the file
+rather than reading it all into memory.  It is not asserted because which
+reader is used depends on the GDAL version and configuration.
+
+Formats are described here:
+
+http://www.gdal.org/drv_geojson.html
+http://www.gdal.org/drv_geojsonseq.html
+"""
+
+import json
+import os
+import unittest
+
+import logging
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.ogr import ogr_util
+
+# Number of features in each file before scaling.
+SIZES = (20000, 80000, 320000)
+
+# Memory growth below this is treated as noise when fitting the slope.
+MIN_GROWTH = 4 * benchmark_util.MB
+
+# Extension to driver.
+FORMATS = (
+    ('.geojson', ogr_util.GEOJSON_DRIVER),
+    ('.geojsons', ogr_util.GEOJSONSEQ_DRIVER),
+)
+
+
+def MakeFeature(fid):
+  """A GeoJSON feature dictionary with a short linestring."""
+  x = (fid % 3600) / 10.0 - 180
+  y = (fid // 3600 % 1800) / 10.0 - 90
+  return {
+      'type': 'Feature',
+      'id': fid,
+      'properties': {'name': 'feature_%d' % fid, 'value': fid * 0.25,
+                     'even': fid % 2 == 0},
+      'geometry': {'type': 'LineString',
+                   'coordinates': [[x, y], [x + 0.05, y + 0.05],
+                                   [x + 0.1, y]]},
+  }
+
+
+def WriteGeoJson(filepath, num_features):
+  """Write a FeatureCollection with one feature per line."""
+  with open(filepath, 'w') as f:
+    f.write('{"type": "FeatureCollection", "features": [\n')
+    for fid in range(num_features):
+      if fid:
+        f.write(',\n')
+      f.write(json.dumps(MakeFeature(fid)))
+    f.write('\n]}\n')
+
+
+def WriteGeoJsonSeq(filepath, num_features):
+  """Write newline delimited features."""
+  with open(filepath, 'w') as f:
+    for fid in range(num_features):
+      f.write(json.dumps(MakeFeature(fid)))
+      f.write('\n')
+
+
+@ogr_util.SkipIfDriverMissing(ogr_util.GEOJSON_DRIVER)
+@ogr_util.SkipIfDriverMissing(ogr_util.GEOJSONSEQ_DRIVER)
+class GeoJsonIngestBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(GeoJsonIngestBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  def testIngest(self):
+    report = benchmark_util.Report(
+        'geojson_ingest',
+        ['driver', 'features', 'file_mb', 'features_s', 'mb_s',
+         'growth_mb'])
+    slopes = benchmark_util.Report('geojson_ingest_slopes',
+                                   ['driver', 'slope'])
+    sizes = [benchmark_util.Scale(size) for size in SIZES]
+    with gcore_util.TestTemporaryDirectory(
+        prefix='geojson_benchmark') as tmpdir:
+      for ext, driver_name in FORMATS:
+        file_sizes = []
+        growths = []
+        for num_features in sizes:
+          filepath = os.path.join(tmpdir,
+                                  'features_%d%s' % (num_features, ext))
+          if driver_name == ogr_util.GEOJSON_DRIVER:
+            WriteGeoJson(filepath, num_features)
+          else:
+            WriteGeoJsonSeq(filepath, num_features)
+          file_size = os.path.getsize(filepath)
+
+          count, seconds, rss_growth = benchmark_util.RunInSubprocess(
+              ogr_util.CountFeatures, filepath, driver_name)
+          os.remove(filepath)
+          self.assertEqual(num_features, count)
+
+          growth = max(rss_growth, MIN_GROWTH)
+          file_sizes.append(file_size)
+          growths.append(growth)
+          file_mb = float(file_size) / benchmark_util.MB
+          report.Add(
+              driver=driver_name, features=num_features, file_mb=file_mb,
+              features_s=benchmark_util.Rate(num_features, seconds),
+              mb_s=benchmark_util.Rate(file_mb, seconds),
+              growth_mb=float(rss_growth) / benchmark_util.MB)
+
+        slope = benchmark_util.SlopeLogLog(file_sizes, growths)
+        logging.info('%s memory slope: %.2f', driver_name, slope)
+        slopes.Add(driver=driver_name, slope=slope)
+
+    report.Write()
+    slopes.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -54,7 +54,11 @@ from osgeo import gdal
 from osgeo import ogr
 from osgeo import osr
 import unittest
+import logging
+from autotest2.gcore import benchmark_util
 from autotest2.gcore import gcore_util
+from autotest2.gdrivers import gdrivers_util
+from autotest2.ogr import feature_service_util
 from autotest2.ogr import ogr_util
 
 DRIVER = ogr_util.GEOJSON_DRIVER
@@ -1126,6 +1130,55 @@ class OgrGeoJsonTest(ogr_util.DriverTestCase):
     self.assertEqual(feature.GetFID(), 1)
 
     # TODO(schwehr): Add the rest of the original test.
+    # test42EsriFeatureServiceScrollingHttp covers the paging.
+
+  @gdrivers_util.SkipIfDriverMissing(gdrivers_util.HTTP_DRIVER)
+  def test42EsriFeatureServiceScrollingHttp(self):
+    num_features = 95
+    page_size = 10
+    with feature_service_util.FeatureServiceServer(
+        num_features, page_size) as server:
+      with benchmark_util.Timer() as timer:
+        src = gdal.OpenEx(server.Url(), gdal.OF_VECTOR,
+                          allowed_drivers=['GeoJSON'])
+        self.assertIsNotNone(src)
+        layer = src.GetLayer(0)
+        features = list(ogr_util.Features(layer))
+      logging.info('%.1f pages/s', benchmark_util.Rate(
+          len(server.requests), timer.seconds))
+
+      self.assertEqual(list(range(1, num_features + 1)),
+                       [feature.GetFID() for feature in features])
+      self.assertEqual([10 * fid for fid in range(1, num_features + 1)],
+                       [feature.GetField('value') for feature in features])
+      self.assertEqual('POINT (95 -95)',
+                       features[-1].GetGeometryRef().ExportToWkt())
+
+      # The first request does not have an offset and the page size of the
+      # first page is used for the rest.
+      self.assertEqual(
+          [None] + list(range(page_size, num_features, page_size)),
+          [request.offset for request in server.requests])
+      self.assertEqual(
+          [None] + [page_size] * (len(server.requests) - 1),
+          [request.count for request in server.requests])
+
+      del server.requests[:]
+      layer.ResetReading()
+      self.assertEqual(1, layer.GetNextFeature().GetFID())
+      self.assertLessEqual(len(server.requests), 1)
+
+  @gdrivers_util.SkipIfDriverMissing(gdrivers_util.HTTP_DRIVER)
+  def test42EsriFeatureServiceScrollingHttpRecordCount(self):
+    with feature_service_util.FeatureServiceServer(25, 10) as server:
+      src = gdal.OpenEx(server.Url(resultRecordCount=4), gdal.OF_VECTOR,
+                        allowed_drivers=['GeoJSON'])
+      self.assertIsNotNone(src)
+      fids = [feature.GetFID()
+              for feature in ogr_util.Features(src.GetLayer(0))]
+    self.assertEqual(list(range(1, 26)), fids)
+    self.assertEqual(7, len(server.requests))
+    self.assertEqual([4] * 7, [request.count for request in server.requests])
 
   def test43FeatureWithoutGeometry(self):
     src = ogr.Open(
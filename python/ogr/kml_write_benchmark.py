@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark writing many KML layers with features spread across them.
+
+kml_test.testInterleavedWriting and testTwoLayers write two layers.  This
+creates L layers and writes F features with feature i going to layer
+i % L, then reads the file back to check every feature.
+
+The KML driver writes each layer as a Folder as it goes, so it refuses a
+CreateFeature on a layer other than the last one created (bug 2772).  It
+is given the features grouped by layer.  LIBKML builds the document in
+memory and is given them interleaved.
+
+Formats are described here:
+
+http://www.gdal.org/drv_kml.html
+http://www.gdal.org/drv_libkml.html
+"""
+
+import unittest
+
+from osgeo import gdal
+from osgeo import ogr
+import logging
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.ogr import ogr_util
+
+# Total number of features before scaling.
+NUM_FEATURES = 20000
+
+LAYER_COUNTS = (1, 10, 100, 500)
+
+# Driver to True if CreateFeature calls can be interleaved across layers.
+DRIVERS = {
+    ogr_util.KML_DRIVER: False,
+    ogr_util.LIBKML_DRIVER: True,
+}
+
+
+def _CreateLayer(dst, layer_num):
+  layer = dst.CreateLayer('layer_%d' % layer_num, geom_type=ogr.wkbPoint)
+  layer.CreateField(ogr.FieldDefn('value', ogr.OFTInteger))
+  return layer
+
+
+def ExpectedFeature(i):
+  """(value, x, y) of feature i."""
+  return 3 * i, i % 360 - 180, i % 180 - 90
+
+
+def _WriteFeature(layer, i):
+  value, x, y = ExpectedFeature(i)
+  feature = ogr.Feature(layer.GetLayerDefn())
+  feature.SetField('value', value)
+  point = ogr.Geometry(ogr.wkbPoint)
+  point.AddPoint_2D(x, y)
+  feature.SetGeometry(point)
+  return layer.CreateFeature(feature)
+
+
+def WriteLayers(driver_name, filepath, num_layers, num_features, interleaved):
+  """Write feature i of num_features to layer i % num_layers.
+
+  Args:
+    driver_name: str, Driver to write with.
+    filepath: str, Where to write.
+    num_layers: int, Number of layers to create.
+    num_features: int, Total number of features.
+    interleaved: If True, create all the layers and then write the features
+      in order.  Otherwise create each layer and write its features before
+      creating the next.
+
+  Returns:
+    The number of CreateFeature calls that failed.
+  """
+  dst = ogr.GetDriverByName(driver_name).CreateDataSource(filepath)
+  failures = 0
+  if interleaved:
+    layers = [_CreateLayer(dst, layer_num) for layer_num in range(num_layers)]
+    for i in range(num_features):
+      if _WriteFeature(layers[i % num_layers], i) != ogr_util.OGRERR_NONE:
+        failures += 1
+  else:
+    for layer_num in range(num_layers):
+      layer = _CreateLayer(dst, layer_num)
+      for i in range(layer_num, num_features, num_layers):
+        if _WriteFeature(layer, i) != ogr_util.OGRERR_NONE:
+          failures += 1
+  dst = None  # Flush the file.
+  return failures
+
+
+def ReadLayers(driver_name, filepath):
+  """Dictionary of layer name to list of (value, x, y) for each feature."""
+  src = gdal.OpenEx(filepath, gdal.OF_VECTOR, allowed_drivers=[driver_name])
+  layers = {}
+  for layer in src:
+    layers[layer.GetName()] = [
+        (feature.GetFieldAsInteger('value'), feature.GetGeometryRef().GetX(),
+         feature.GetGeometryRef().GetY())
+        for feature in ogr_util.Features(layer)]
+  return layers
+
+
+@ogr_util.SkipIfDriverMissing(ogr_util.KML_DRIVER)
+class KmlWriteBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(KmlWriteBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  def Expected(self, num_layers, num_features):
+    return dict(
+        ('layer_%d' % layer_num,
+         [ExpectedFeature(i)
+          for i in range(layer_num, num_features, num_layers)])
+        for layer_num in range(num_layers))
+
+  def testManyLayers(self):
+    num_features = benchmark_util.Scale(NUM_FEATURES)
+    report = benchmark_util.Report(
+        'kml_write_layers',
+        ['driver', 'order', 'layers', 'features', 'write_s', 'features_s',
+         'file_mb', 'read_s'])
+    for driver_name, interleaved in sorted(DRIVERS.items()):
+      if driver_name not in ogr_util.drivers:
+        logging.info('Skipping %s', driver_name)
+        continue
+      for num_layers in LAYER_COUNTS:
+        filepath = '/vsimem/kml_write_benchmark_%d.kml' % num_layers
+        with gcore_util.GdalUnlinkWhenDone(filepath):
+          with benchmark_util.Timer() as write_timer:
+            failures = WriteLayers(driver_name, filepath, num_layers,
+                                   num_features, interleaved)
+          self.assertEqual(0, failures)
+          file_mb = float(gdal.VSIStatL(filepath).size) / benchmark_util.MB
+
+          with benchmark_util.Timer() as read_timer:
+            layers = ReadLayers(driver_name, filepath)
+
+        expected = self.Expected(num_layers, num_features)
+        self.assertEqual(sorted(expected), sorted(layers))
+        for name in sorted(expected):
+          self.assertEqual(expected[name], layers[name], name)
+
+        report.Add(
+            driver=driver_name,
+            order='interleaved' if interleaved else 'grouped',
+            layers=num_layers, features=num_features,
+            write_s=write_timer.seconds,
+            features_s=benchmark_util.Rate(num_features, write_timer.seconds),
+            file_mb=file_mb, read_s=read_timer.seconds)
+
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark OGR geometry operations by the number of vertices.
+
+ogr_geom_test checks Area, Boundary, BuildPolygonFromEdges and pickling on
+small geometries.  This times those and IsValid, Buffer, Intersection and
+the WKB, WKT and pickle round trips on random polygons, multipolygons and
+linestrings with a controlled number of vertices.  The report has the
+operations per second for each vertex count to compare GDAL and GEOS
+versions.
+
+Operations that need GEOS are skipped when GDAL is built without it.
+"""
+
+import math
+import pickle
+import random
+import unittest
+
+from osgeo import ogr
+import logging
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+
+# Vertices per geometry.  For multipolygons, the total over all parts.
+VERTEX_COUNTS = (16, 256, 4096)
+
+# Number of geometries of each kind and size before scaling.
+NUM_GEOMETRIES = 20
+
+# Number of polygons in each multipolygon.
+NUM_PARTS = 4
+
+
+def HaveGeos():
+  point1 = ogr.CreateGeometryFromWkt('POINT(10 20)')
+  point2 = ogr.CreateGeometryFromWkt('POINT(30 20)')
+  with gcore_util.ErrorHandler('CPLQuietErrorHandler'):
+    return point1.Union(point2) is not None
+
+
+def RandomRing(rand, num_vertices, x=0.0, y=0.0, radius=100.0):
+  """A closed star shaped ring around (x, y), which is always simple.
+
+  Each vertex is jittered within its own slice of the circle, so with at
+  least 4 vertices no gap reaches half a turn and the center stays inside.
+  The closing point is not counted in num_vertices.
+  """
+  ring = ogr.Geometry(ogr.wkbLinearRing)
+  for i in range(num_vertices):
+    angle = 2 * math.pi * (i + rand.random()) / num_vertices
+    r = radius * rand.uniform(0.5, 1.0)
+    ring.AddPoint_2D(x + r * math.cos(angle), y + r * math.sin(angle))
+  ring.CloseRings()
+  return ring
+
+
+def RandomPolygon(rand, num_vertices, x=0.0, y=0.0):
+  polygon = ogr.Geometry(ogr.wkbPolygon)
+  polygon.AddGeometry(RandomRing(rand, num_vertices, x, y))
+  return polygon
+
+
+def RandomMultiPolygon(rand, num_vertices):
+  """NUM_PARTS polygons far enough apart not to touch."""
+  multipolygon = ogr.Geometry(ogr.wkbMultiPolygon)
+  for part in range(NUM_PARTS):
+    multipolygon.AddGeometry(RandomPolygon(
+        rand, max(4, num_vertices // NUM_PARTS), 300.0 * part, 0.0))
+  return multipolygon
+
+
+def RandomLineString(rand, num_vertices):
+  """A random walk."""
+  line = ogr.Geometry(ogr.wkbLineString)
+  x = y = 0.0
+  for _ in range(num_vertices):
+    x += rand.uniform(-1, 1)
+    y += rand.uniform(-1, 1)
+    line.AddPoint_2D(x, y)
+  return line
+
+
+GENERATORS = (
+    ('polygon', RandomPolygon),
+    ('multipolygon', RandomMultiPolygon),
+    ('linestring', RandomLineString),
+)
+
+
+def Edges(polygon):
+  """The exterior ring of polygon as a collection of two point lines."""
+  ring = polygon.GetGeometryRef(0)
+  edges = ogr.Geometry(ogr.wkbGeometryCollection)
+  for i in range(ring.GetPointCount() - 1):
+    edge = ogr.Geometry(ogr.wkbLineString)
+    edge.AddPoint_2D(ring.GetX(i), ring.GetY(i))
+    edge.AddPoint_2D(ring.GetX(i + 1), ring.GetY(i + 1))
+    edges.AddGeometry(edge)
+  return edges
+
+
+def _ShiftPoints(geom, dx, dy):
+  for i in range(geom.GetGeometryCount()):
+    _ShiftPoints(geom.GetGeometryRef(i), dx, dy)
+  for i in range(geom.GetPointCount()):
+    geom.SetPoint_2D(i, geom.GetX(i) + dx, geom.GetY(i) + dy)
+
+
+def Shifted(geom):
+  """Copy of geom moved by a quarter of its size to overlap the original."""
+  min_x, max_x, min_y, max_y = geom.GetEnvelope()
+  shifted = geom.Clone()
+  _ShiftPoints(shifted, (max_x - min_x) / 4, (max_y - min_y) / 4)
+  return shifted
+
+
+def Operations(kind, have_geos):
+  """(name, function of a geometry) to time for a kind of geometry."""
+  operations = [
+      ('wkb', lambda g: ogr.CreateGeometryFromWkb(g.ExportToWkb())),
+      ('wkt', lambda g: ogr.CreateGeometryFromWkt(g.ExportToWkt())),
+      ('pickle', lambda g: pickle.loads(pickle.dumps(g))),
+  ]
+  if kind != 'linestring':
+    operations.append(('area', lambda g: g.Area()))
+  if kind == 'polygon':
+    operations.append(('build_polygon_from_edges',
+                       lambda edges: ogr.BuildPolygonFromEdges(edges, 0, 0)))
+  if have_geos:
+    operations.extend([
+        ('boundary', lambda g: g.Boundary()),
+        ('is_valid', lambda g: g.IsValid()),
+        ('buffer', lambda g: g.Buffer(1.0)),
+        ('intersection', lambda pair: pair[0].Intersection(pair[1])),
+    ])
+  return operations
+
+
+def Arguments(name, geoms):
+  """The inputs to an operation for each geometry."""
+  if name == 'build_polygon_from_edges':
+    return [Edges(geom) for geom in geoms]
+  if name == 'intersection':
+    return [(geom, Shifted(geom)) for geom in geoms]
+  return geoms
+
+
+class OgrGeomBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(OgrGeomBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  def CheckResults(self, kind, name, geoms, results):
+    """Spot check the first result of each operation."""
+    geom = geoms[0]
+    result = results[0]
+    if name in ('wkb', 'wkt', 'pickle'):
+      self.assertEqual(geom.ExportToIsoWkb(), result.ExportToIsoWkb(), name)
+    elif name == 'area':
+      self.assertGreater(result, 0)
+    elif name == 'build_polygon_from_edges':
+      self.assertAlmostEqual(geom.Area(), result.Area(), delta=1e-6)
+    elif name == 'is_valid':
+      self.assertTrue(result, kind)
+    elif name == 'buffer':
+      self.assertGreater(result.Area(), geom.Area())
+    elif name == 'intersection' and kind != 'linestring':
+      # A random walk need not cross its shifted copy.
+      self.assertFalse(result.IsEmpty(), kind)
+    else:
+      self.assertIsNotNone(result, name)
+
+  def testOperations(self):
+    have_geos = HaveGeos()
+    if not have_geos:
+      logging.info('GDAL was built without GEOS')
+    num_geometries = benchmark_util.Scale(NUM_GEOMETRIES)
+    report = benchmark_util.Report(
+        'ogr_geom_operations',
+        ['geometry', 'vertices', 'operation', 'count', 'ops_s'])
+    for kind, generator in GENERATORS:
+      for num_vertices in VERTEX_COUNTS:
+        rand = random.Random(num_vertices)
+        geoms = [generator(rand, num_vertices) for _ in range(num_geometries)]
+        for name, operation in Operations(kind, have_geos):
+          arguments = Arguments(name, geoms)
+          results = []
+          with benchmark_util.Timer() as timer:
+            for argument in arguments:
+              results.append(operation(argument))
+          self.CheckResults(kind, name, geoms, results)
+          report.Add(
+              geometry=kind, vertices=num_vertices, operation=name,
+              count=num_geometries,
+              ops_s=benchmark_util.Rate(num_geometries, timer.seconds))
+
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -25,6 +25,7 @@ http://trac.osgeo.org/gdal/browser/trunk/autotest/pymod/gdaltest.py#L284
 import datetime
 from optparse import OptionParser
 import os
+import struct
 import sys
 import unittest
 
@@ -35,6 +36,11 @@ import gflags as flags
 import logging
 from autotest2.gcore import gcore_util
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
 FLAGS = flags.FLAGS
 
 
@@ -55,6 +61,7 @@ EDIGEO_DRIVER = 'edigeo'
 ELASTICSEARCH_DRIVER = 'elasticsearch'
 GEOCONCEPT_DRIVER = 'geoconcept'
 GEOJSON_DRIVER = 'geojson'
+GEOJSONSEQ_DRIVER = 'geojsonseq'
 GEOMEDIA_DRIVER = 'geomedia'
 GEORSS_DRIVER = 'georss'
 GFT_DRIVER = 'gft'
@@ -120,6 +127,224 @@ def Features(layer):
     yield feature
 
 
+def CountFeatures(filepath, driver_name):
+  """Open filepath with only driver_name and read all features.
+
+  Module level so that it can be run with benchmark_util.RunInSubprocess.
+
+  Returns:
+    The number of features in all layers.
+  """
+  src = gdal.OpenEx(filepath, gdal.OF_VECTOR, allowed_drivers=[driver_name])
+  count = 0
+  for layer in src:
+    for feature in Features(layer):
+      feature.GetGeometryRef()
+      count += 1
+  return count
+
+
+def HaveArrowStream():
+  """True if layers can be read as columns with GetArrowStreamAsNumPy."""
+  return numpy is not None and hasattr(ogr.Layer, 'GetArrowStreamAsNumPy')
+
+
+def ArrowBatches(layer, options=None):
+  """Read a layer as batches of columns rather than one feature at a time.
+
+  Requires GDAL 3.6 or newer and numpy.  Starts from the first feature.
+
+  Args:
+    layer: OGR layer instance.
+    options: List of str options for GetArrowStreamAsNumPy.
+      e.g. ['MAX_FEATURES_IN_BATCH=1000'].
+
+  Yields:
+    Dictionaries of column name to numpy array.  The FID is in the column
+    named by ArrowFidColumn and the geometries are WKB.
+  """
+  layer.ResetReading()
+  stream = layer.GetArrowStreamAsNumPy(options=options or [])
+  for batch in stream:
+    yield batch
+
+
+def ArrowFidColumn(layer):
+  return layer.GetFIDColumn() or 'OGC_FID'
+
+
+def _ColumnMismatches(got, expect):
+  """Compare a column from ArrowBatches with a list of expected values.
+
+  Args:
+    got: numpy array or masked array.  Nulls are masked or None.
+    expect: Sequence of values of the same length.  None is a null.
+
+  Returns:
+    A numpy bool array that is True where the values differ.
+  """
+  data = numpy.ma.getdata(got)
+  got_null = numpy.ma.getmaskarray(got).copy()
+  expect_null = numpy.array([value is None for value in expect], dtype=bool)
+
+  if data.dtype == object:
+    got_null |= numpy.array([value is None for value in data], dtype=bool)
+    expect_values = numpy.empty(len(expect), dtype=object)
+    for i, value in enumerate(expect):
+      # Strings come back as utf-8 bytes.
+      if isinstance(value, six.text_type):
+        value = value.encode('utf-8')
+      expect_values[i] = value
+  else:
+    expect_values = numpy.array(
+        [data.dtype.type() if value is None else value for value in expect],
+        dtype=data.dtype)
+
+  different = data != expect_values
+  if data.dtype.kind in 'fc':
+    different &= ~(numpy.isnan(data) & numpy.isnan(expect_values))
+  return (got_null != expect_null) | (~got_null & ~expect_null & different)
+
+
+# ISO WKB geometry type codes without the Z and M thousands to the name
+# returned by GetGeometryName.
+_WKB_GEOMETRY_NAMES = {
+    1: 'POINT',
+    2: 'LINESTRING',
+    3: 'POLYGON',
+    4: 'MULTIPOINT',
+    5: 'MULTILINESTRING',
+    6: 'MULTIPOLYGON',
+    7: 'GEOMETRYCOLLECTION',
+    8: 'CIRCULARSTRING',
+    9: 'COMPOUNDCURVE',
+    10: 'CURVEPOLYGON',
+    11: 'MULTICURVE',
+    12: 'MULTISURFACE',
+    15: 'POLYHEDRALSURFACE',
+    16: 'TIN',
+    17: 'TRIANGLE',
+}
+
+# Types whose parts are rings without a WKB header.
+_WKB_RING_TYPES = (3, 17)
+
+
+class _UnknownWkbType(Exception):
+  pass
+
+
+def _ParseWkb(wkb, offset):
+  """Decode one geometry from ISO WKB.
+
+  Args:
+    wkb: bytes or bytearray of ISO WKB.
+    offset: int, Where the geometry starts.
+
+  Returns:
+    A tuple of ((name, children, coordinates), offset after the geometry).
+    coordinates is an (N, 3) numpy array of x, y, z with z of 0 when
+    missing, or None for geometries made of other geometries.
+  """
+  endian = '<' if six.indexbytes(wkb, offset) == 1 else '>'
+  wkb_type = struct.unpack_from(endian + 'I', wkb, offset + 1)[0]
+  offset += 5
+  base_type = wkb_type % 1000
+  if base_type not in _WKB_GEOMETRY_NAMES:
+    raise _UnknownWkbType(wkb_type)
+  has_z = wkb_type // 1000 in (1, 3)
+  num_dims = 2 + has_z + (wkb_type // 1000 in (2, 3))
+  coordinate_type = numpy.dtype(endian + 'f8')
+
+  def _Coordinates(num_points, offset):
+    values = numpy.frombuffer(wkb, coordinate_type, num_points * num_dims,
+                              offset).reshape(num_points, num_dims)
+    xyz = numpy.zeros((num_points, 3))
+    xyz[:, :2] = values[:, :2]
+    if has_z:
+      xyz[:, 2] = values[:, 2]
+    return xyz, offset + values.nbytes
+
+  def _Count(offset):
+    return struct.unpack_from(endian + 'I', wkb, offset)[0], offset + 4
+
+  name = _WKB_GEOMETRY_NAMES[base_type]
+  if base_type == 1:
+    xyz, offset = _Coordinates(1, offset)
+    # An empty point is all NaN and has no points.
+    if numpy.isnan(xyz[0, :2]).all():
+      xyz = xyz[:0]
+    return (name, [], xyz), offset
+
+  if base_type in (2, 8):
+    num_points, offset = _Count(offset)
+    xyz, offset = _Coordinates(num_points, offset)
+    return (name, [], xyz), offset
+
+  num_parts, offset = _Count(offset)
+  children = []
+  for _ in range(num_parts):
+    if base_type in _WKB_RING_TYPES:
+      num_points, offset = _Count(offset)
+      xyz, offset = _Coordinates(num_points, offset)
+      children.append(('LINEARRING', [], xyz))
+    else:
+      child, offset = _ParseWkb(wkb, offset)
+      children.append(child)
+  return (name, children, None), offset
+
+
+def _WkbTree(geom):
+  """Decode a geometry for CheckFeatureGeometry.
+
+  Returns:
+    The tree from _ParseWkb with the top level name from GetGeometryName, or
+    None if numpy is missing or the type is not known.
+  """
+  if numpy is None:
+    return None
+  try:
+    (_, children, xyz), _ = _ParseWkb(geom.ExportToIsoWkb(ogr.wkbNDR), 0)
+  except _UnknownWkbType:
+    return None
+  return geom.GetGeometryName(), children, xyz
+
+
+def _CompareWkbTrees(got, expect, leaves):
+  """Walk two trees from _WkbTree in the order of the point by point check.
+
+  Args:
+    got: Tree of the geometry being checked.
+    expect: Tree of the expected geometry.
+    leaves: List that (got, expect) coordinate arrays are appended to.
+
+  Returns:
+    None if the structure matches.  Otherwise (got, expect, message)
+    arguments for assertEqual describing the first difference.
+  """
+  got_name, got_children, got_xyz = got
+  expect_name, expect_children, expect_xyz = expect
+  if got_name != expect_name:
+    return (got_name, expect_name, 'geometry names do not match: %s != %s' %
+            (got_name, expect_name))
+  if len(got_children) != len(expect_children):
+    return (len(got_children), len(expect_children),
+            'sub-geometry counts do not match')
+  got_points = 0 if got_xyz is None else len(got_xyz)
+  expect_points = 0 if expect_xyz is None else len(expect_xyz)
+  if got_points != expect_points:
+    return got_points, expect_points, 'point counts do not match'
+
+  if got_children:
+    for got_child, expect_child in zip(got_children, expect_children):
+      mismatch = _CompareWkbTrees(got_child, expect_child, leaves)
+      if mismatch:
+        return mismatch
+  elif got_points:
+    leaves.append((got_xyz, expect_xyz))
+  return None
+
+
 def SkipIfDriverMissing(driver_name):
   """Decorator that only runs a test if a required driver is found.
 
@@ -205,6 +430,49 @@ class DriverTestCase(unittest.TestCase):
     feat = layer.GetNextFeature()
     self.assertIsNone(feat, 'got more features than expected')
 
+  def CheckColumnsAgainstArrays(self, layer, expected, options=None):
+    """Compare whole columns of a layer with vectorized equality.
+
+    The bulk version of CheckFeaturesAgainstList.  Requires HaveArrowStream.
+
+    Args:
+      layer: OGR layer instance.  Read from the start.
+      expected: Dictionary of field name to a sequence of the values of all
+        features in order.  None is a null field.
+      options: List of str options for GetArrowStreamAsNumPy.
+    """
+    fid_column = ArrowFidColumn(layer)
+    layer_defn = layer.GetLayerDefn()
+    for field_name in expected:
+      self.assertGreaterEqual(layer_defn.GetFieldIndex(field_name), 0,
+                              'Did not find required field ' + field_name)
+    num_expected = set(len(values) for values in expected.values())
+    self.assertLessEqual(len(num_expected), 1,
+                         'expected columns are not the same length')
+    num_expected = num_expected.pop() if num_expected else 0
+
+    count = 0
+    for batch in ArrowBatches(layer, options):
+      fids = batch[fid_column]
+      size = len(fids)
+      self.assertLessEqual(
+          count + size, num_expected,
+          'Got more than the expected %d features.' % num_expected)
+      for field_name, values in sorted(expected.items()):
+        got = batch[field_name]
+        expect = values[count:count + size]
+        mismatches = _ColumnMismatches(got, expect)
+        if mismatches.any():
+          i = int(numpy.argmax(mismatches))
+          self.fail('Field %s differs first at FID %d: got %r, expected %r' %
+                    (field_name, fids[i], got[i], expect[i]))
+      count += size
+
+    self.assertEqual(
+        count, num_expected,
+        'Got only %d features, not the expected %d features.' %
+        (count, num_expected))
+
   def CheckFeatureGeometry(self, feat, geom, max_error=0.0001):
     # This is a mutation of check_feature_geometry in
     # http://trac.osgeo.org/gdal/browser/trunk/autotest/pymod/ogrtest.py
@@ -229,6 +497,36 @@ class DriverTestCase(unittest.TestCase):
     if f_geom is None and geom is not None:
       self.fail('expected geometry but got NULL.')
 
+    if f_geom is None and geom is None:
+      return
+
+    got_tree = _WkbTree(f_geom)
+    expect_tree = _WkbTree(geom)
+    if got_tree is None or expect_tree is None:
+      self._CheckGeometryPointByPoint(f_geom, geom, max_error)
+      return
+
+    # Compare the structure first, collecting the coordinates of the leaf
+    # geometries in the same order that the point by point check visits them.
+    leaves = []
+    mismatch = _CompareWkbTrees(got_tree, expect_tree, leaves)
+
+    if leaves:
+      got = numpy.concatenate([leaf[0] for leaf in leaves]).ravel()
+      expect = numpy.concatenate([leaf[1] for leaf in leaves]).ravel()
+      with numpy.errstate(invalid='ignore'):
+        bad = ~((got == expect) | (numpy.abs(got - expect) <= max_error))
+      if bad.any():
+        i = int(numpy.argmax(bad))
+        # Same message as the point by point check.
+        self.assertAlmostEqual(float(got[i]), float(expect[i]),
+                               delta=max_error)
+
+    if mismatch:
+      self.assertEqual(*mismatch)
+
+  def _CheckGeometryPointByPoint(self, f_geom, geom, max_error):
+    """Slower version of CheckFeatureGeometry for when numpy is missing."""
     self.assertEquals(f_geom.GetGeometryName(),
                       geom.GetGeometryName(),
                       'geometry names do not match: %s != %s' %
@@ -245,9 +543,9 @@ class DriverTestCase(unittest.TestCase):
     if f_geom.GetGeometryCount() > 0:
       count = f_geom.GetGeometryCount()
       for i in range(count):
-        self.CheckFeatureGeometry(f_geom.GetGeometryRef(i),
-                                  geom.GetGeometryRef(i),
-                                  max_error)
+        self._CheckGeometryPointByPoint(f_geom.GetGeometryRef(i),
+                                        geom.GetGeometryRef(i),
+                                        max_error)
     else:
       count = f_geom.GetPointCount()
       for i in range(count):
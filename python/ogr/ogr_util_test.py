@@ -18,6 +18,7 @@
 import os
 import unittest
 
+from osgeo import ogr
 from autotest2.gcore import gcore_util
 from autotest2.ogr import ogr_util
 
@@ -34,5 +35,147 @@ class OgrUtilTest(unittest.TestCase):
     self.assertTrue(os.path.isfile(filepath))
 
 
+@unittest.skipIf(not ogr_util.HaveArrowStream(),
+                 'Requires numpy and GetArrowStreamAsNumPy')
+@ogr_util.SkipIfDriverMissing(ogr_util.MEMORY_DRIVER)
+class CheckColumnsAgainstArraysTest(ogr_util.DriverTestCase):
+
+  def setUp(self):
+    super(CheckColumnsAgainstArraysTest, self).setUp(ogr_util.MEMORY_DRIVER,
+                                                     '')
+    self.ints = [3, None, 5, 7, 11]
+    self.reals = [0.5, 1.5, None, float('nan'), -2.0]
+    self.names = ['a', 'b', None, u'\u00e9', 'e']
+
+    self.datasource = self.driver.CreateDataSource('')
+    self.layer = self.datasource.CreateLayer('test')
+    self.layer.CreateField(ogr.FieldDefn('int', ogr.OFTInteger))
+    self.layer.CreateField(ogr.FieldDefn('real', ogr.OFTReal))
+    self.layer.CreateField(ogr.FieldDefn('name', ogr.OFTString))
+    for values in zip(self.ints, self.reals, self.names):
+      feature = ogr.Feature(self.layer.GetLayerDefn())
+      for field_num, value in enumerate(values):
+        if value is not None:
+          feature.SetField(field_num, value)
+      self.layer.CreateFeature(feature)
+
+  def testMatch(self):
+    self.CheckColumnsAgainstArrays(
+        self.layer, {'int': self.ints, 'real': self.reals, 'name': self.names})
+
+  def testSmallBatches(self):
+    self.CheckColumnsAgainstArrays(
+        self.layer, {'int': self.ints, 'name': self.names},
+        options=['MAX_FEATURES_IN_BATCH=2'])
+
+  def testFirstDifference(self):
+    ints = list(self.ints)
+    ints[3] = 8
+    ints[4] = 12
+    with self.assertRaisesRegex(AssertionError, 'int differs first at FID 3'):
+      self.CheckColumnsAgainstArrays(self.layer, {'int': ints})
+
+    names = list(self.names)
+    names[2] = 'c'
+    with self.assertRaisesRegex(AssertionError, 'name differs first at FID 2'):
+      self.CheckColumnsAgainstArrays(self.layer, {'name': names},
+                                     options=['MAX_FEATURES_IN_BATCH=2'])
+
+  def testCounts(self):
+    with self.assertRaisesRegex(AssertionError, 'Got only 5 features'):
+      self.CheckColumnsAgainstArrays(self.layer, {'int': self.ints + [1]})
+    with self.assertRaisesRegex(AssertionError, 'more than the expected 4'):
+      self.CheckColumnsAgainstArrays(self.layer, {'int': self.ints[:4]})
+
+  def testMissingField(self):
+    with self.assertRaisesRegex(AssertionError,
+                                'Did not find required field absent'):
+      self.CheckColumnsAgainstArrays(self.layer, {'absent': self.ints})
+
+
+@ogr_util.SkipIfDriverMissing(ogr_util.MEMORY_DRIVER)
+class CheckFeatureGeometryTest(ogr_util.DriverTestCase):
+
+  def setUp(self):
+    super(CheckFeatureGeometryTest, self).setUp(ogr_util.MEMORY_DRIVER, '')
+
+  def testMatch(self):
+    for wkt in ('POINT (1 2)',
+                'POINT EMPTY',
+                'LINESTRING (1 2 3,4 5 6)',
+                'POLYGON ((0 0,1 0,1 1,0 0),(0.1 0.1,0.2 0.1,0.1 0.2,0.1 0.1))',
+                'MULTIPOLYGON (((0 0,1 0,1 1,0 0)),((5 5,6 5,6 6,5 5)))',
+                'GEOMETRYCOLLECTION (POINT (1 2),LINESTRING EMPTY)',
+                'CIRCULARSTRING (0 0,1 1,2 0)'):
+      self.CheckFeatureGeometry(ogr.CreateGeometryFromWkt(wkt), wkt)
+
+  def testWithinMaxError(self):
+    self.CheckFeatureGeometry(
+        ogr.CreateGeometryFromWkt('LINESTRING (1 2,3 4.00001)'),
+        'LINESTRING (1 2,3 4)')
+
+  def testNull(self):
+    feature = ogr.Feature(ogr.FeatureDefn())
+    with self.assertRaisesRegex(AssertionError, 'expected geometry but got'):
+      self.CheckFeatureGeometry(feature, 'POINT (1 2)')
+
+  def testNameMismatch(self):
+    with self.assertRaisesRegex(AssertionError, 'geometry names do not match'):
+      self.CheckFeatureGeometry(
+          ogr.CreateGeometryFromWkt('MULTIPOINT (1 2)'), 'POINT (1 2)')
+
+  def testCountMismatch(self):
+    with self.assertRaisesRegex(AssertionError, 'sub-geometry counts'):
+      self.CheckFeatureGeometry(
+          ogr.CreateGeometryFromWkt('MULTIPOINT (1 2,3 4)'),
+          'MULTIPOINT (1 2)')
+    with self.assertRaisesRegex(AssertionError, 'point counts do not match'):
+      self.CheckFeatureGeometry(
+          ogr.CreateGeometryFromWkt('POLYGON ((0 0,1 0,1 1,0 1,0 0))'),
+          'POLYGON ((0 0,1 0,1 1,0 0))')
+
+  def testCoordinateMismatch(self):
+    with self.assertRaisesRegex(AssertionError, '4.1 != 4.0 within 0.0001'):
+      self.CheckFeatureGeometry(
+          ogr.CreateGeometryFromWkt('LINESTRING (1 2 3,4.1 5 6)'),
+          'LINESTRING (1 2 3,4 5 6)')
+    with self.assertRaisesRegex(AssertionError, '7.0 != 3.0 within 0.1'):
+      self.CheckFeatureGeometry(
+          ogr.CreateGeometryFromWkt('LINESTRING (1 2 7,4 5 6)'),
+          'LINESTRING (1 2 3,4 5 6)', max_error=0.1)
+
+  def testCoordinateBeforeStructure(self):
+    # The first part differs before the second part is missing a point, so
+    # the point by point check would complain about the coordinate first.
+    with self.assertRaisesRegex(AssertionError, '9.0 != 0.0'):
+      self.CheckFeatureGeometry(
+          ogr.CreateGeometryFromWkt('MULTILINESTRING ((9 0,1 1),(2 2))'),
+          'MULTILINESTRING ((0 0,1 1),(2 2,3 3))')
+
+  def testManyPoints(self):
+    count = 100000
+    ring = ogr.Geometry(ogr.wkbLinearRing)
+    for i in range(count):
+      ring.AddPoint_2D(i, i % 7)
+    ring.AddPoint_2D(0, 0)
+    polygon = ogr.Geometry(ogr.wkbPolygon)
+    polygon.AddGeometry(ring)
+    self.CheckFeatureGeometry(polygon, polygon)
+
+    moved = polygon.Clone()
+    moved.GetGeometryRef(0).SetPoint_2D(count - 1, 0, 0)
+    with self.assertRaisesRegex(AssertionError, '0.0 != %.1f' % (count - 1)):
+      self.CheckFeatureGeometry(moved, polygon)
+
+  def testPointByPoint(self):
+    wkt = 'MULTIPOLYGON (((0 0,1 0,1 1,0 0)),((5 5,6 5,6 6,5 5)))'
+    geom = ogr.CreateGeometryFromWkt(wkt)
+    self._CheckGeometryPointByPoint(geom, geom.Clone(), 0.0001)
+    with self.assertRaisesRegex(AssertionError, 'sub-geometry counts'):
+      self._CheckGeometryPointByPoint(
+          geom, ogr.CreateGeometryFromWkt('MULTIPOLYGON (((0 0,1 0,1 1,0 0)))'),
+          0.0001)
+
+
 if __name__ == '__main__':
   unittest.main()
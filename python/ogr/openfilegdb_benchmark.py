@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark OpenFileGDB attribute filters with and without field indexes.
+
+openfilegdb_test.test04AttributeIndexes checks the results of the WHERE
+clauses on a tiny layer.  This times the same forms of clauses on layers with
+increasing numbers of rows.  Every field is written twice: once with an
+attribute index and once without (the _scan fields).  Each clause is timed
+with SetAttributeFilter and a full iteration over the matches for both.
+
+The test checks that each indexed clause uses its index, that the _scan
+clause does not and that both return the same rows.  The times and the
+log-log slope of each indexed clause against the number of rows are only
+reported: selective clauses on indexed fields should scale sub-linearly,
+but they take microseconds and are too noisy to assert on.
+
+Set OPENFILEGDB_BENCHMARK_DIR to a directory to keep the generated .gdb
+fixtures between runs.  Fixtures already there are loaded, not rebuilt.
+"""
+
+import datetime
+import os
+import shutil
+import unittest
+
+from osgeo import gdal
+from osgeo import ogr
+import logging
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.ogr import ogr_util
+
+DRIVER = ogr_util.OPENFILEGDB_DRIVER
+
+LAYER_NAME = 'bench'
+
+# Number of rows in each fixture before scaling.
+SIZES = (5000, 20000, 80000)
+
+# Number of times each query is timed.  The fastest is reported.
+REPEAT = 3
+
+FIELDS = (
+    ('id', ogr.OFTInteger),
+    ('nullint', ogr.OFTInteger),
+    ('str', ogr.OFTString),
+    ('real', ogr.OFTReal),
+    ('adate', ogr.OFTDateTime),
+)
+
+START_DATE = datetime.datetime(2013, 12, 26, 12, 34, 56)
+
+# (clause, selective, uses index) for the clause forms of
+# test04AttributeIndexes.  Fields are named with {id} etc so that each clause
+# can be run against the indexed and the unindexed copy of the fields.  {mid}
+# is a row in the middle of the layer and {last} is the last row.  Selective
+# clauses match no more than a few rows regardless of the size of the layer.
+CLAUSES = (
+    ('{id} = {mid}', True, True),
+    ('{mid} = {id}', True, True),
+    ('{id} = 0', True, True),
+    ('{id} <= 1', True, True),
+    ('{last} <= {id}', True, True),
+    ('{id} < 1', True, True),
+    ('{id} >= 1', False, True),
+    ('{id} <> 0', False, True),
+    ('{id} IS NOT NULL', False, True),
+    ('{id} IS NULL', True, True),
+    ('{nullint} IS NOT NULL', True, True),
+    ('{nullint} IS NULL', False, True),
+    ("{str} = 'foo_{mid:08d}'", True, True),
+    ("{str} < 'foo_00000002'", True, True),
+    ("{str} > 'foo_{mid:08d}'", False, True),
+    ('{real} = {mid}.5', True, True),
+    ('{real} > {last}.5', True, True),
+    ("{adate} = '{mid_date}'", True, True),
+    ("{adate} < '{start_date}'", True, True),
+    ('NOT({id} = {mid})', False, True),
+    ('{id} = 1 OR {id} = {mid}', True, True),
+    ('{id} < 3 OR {id} > {last}', True, True),
+    ('{id} <= {mid} OR {id} >= {mid}', False, True),
+    ('{id} = {mid} AND {real} = {mid}.5', True, True),
+    ('{id} BETWEEN {mid} AND {mid_10}', True, True),
+    ('{id} IN ({mid}, 2, 1)', True, True),
+    ('fid = {mid}', True, False),
+    ('fid IS NOT NULL', False, False),
+    ('{id} = {id}', False, False),
+    ('{id} = {mid} + 0', True, False),
+)
+
+
+def FormatDate(value):
+  return value.strftime('%Y/%m/%d %H:%M:%S')
+
+
+def ClauseValues(num_rows):
+  """Values to format the CLAUSES with for a layer of num_rows rows."""
+  mid = num_rows // 2
+  return {
+      'mid': mid,
+      'mid_10': mid + 9,
+      'last': num_rows,
+      'start_date': FormatDate(START_DATE),
+      'mid_date': FormatDate(START_DATE + datetime.timedelta(minutes=mid - 1)),
+  }
+
+
+def FieldNames(indexed):
+  suffix = '' if indexed else '_scan'
+  return dict((name, name + suffix) for name, _ in FIELDS)
+
+
+def CreateFixture(filepath, num_rows):
+  """Write a .gdb with num_rows rows and index half of the fields.
+
+  Row i (starting at 1) has id i, str foo_<i>, real i + 0.5 and adate
+  START_DATE + i - 1 minutes.  nullint is always NULL.
+
+  Returns:
+    True if the fixture was written with the indexes.
+  """
+  driver = ogr.GetDriverByName(DRIVER)
+  src = driver.CreateDataSource(filepath)
+  if not src:
+    return False
+  layer = src.CreateLayer(LAYER_NAME, geom_type=ogr.wkbNone)
+  for indexed in (True, False):
+    names = FieldNames(indexed)
+    for name, field_type in FIELDS:
+      layer.CreateField(ogr.FieldDefn(names[name], field_type))
+
+  layer.StartTransaction()
+  defn = layer.GetLayerDefn()
+  for i in range(1, num_rows + 1):
+    date = START_DATE + datetime.timedelta(minutes=i - 1)
+    feature = ogr.Feature(defn)
+    for indexed in (True, False):
+      names = FieldNames(indexed)
+      feature.SetField(names['id'], i)
+      feature.SetField(names['str'], 'foo_%08d' % i)
+      feature.SetField(names['real'], i + 0.5)
+      feature.SetField(names['adate'], date.year, date.month, date.day,
+                       date.hour, date.minute, date.second, 0)
+    layer.CreateFeature(feature)
+  layer.CommitTransaction()
+
+  for name, _ in FIELDS:
+    gdal.ErrorReset()
+    with gcore_util.ErrorHandler('CPLQuietErrorHandler'):
+      src.ExecuteSQL('CREATE INDEX idx_%s ON %s(%s)' % (name, LAYER_NAME, name))
+    if gdal.GetLastErrorType() >= gdal.CE_Failure:
+      logging.info('Unable to create index on %s: %s', name,
+                   gdal.GetLastErrorMsg())
+      return False
+  return True
+
+
+class Fixtures(object):
+  """Context manager with the path of a .gdb for each size."""
+
+  def __init__(self, sizes):
+    self.sizes = sizes
+    self.dirpath = gdal.GetConfigOption('OPENFILEGDB_BENCHMARK_DIR')
+    self.tempdir = None
+    self.filepaths = {}
+
+  def __enter__(self):
+    if not self.dirpath:
+      self.tempdir = gcore_util.TestTemporaryDirectory(
+          prefix='openfilegdb_benchmark')
+      self.dirpath = self.tempdir.__enter__()
+    for num_rows in self.sizes:
+      filepath = os.path.join(self.dirpath, 'bench_%d.gdb' % num_rows)
+      if os.path.isdir(filepath):
+        logging.info('Loading %s', filepath)
+      else:
+        # Build under another name so that an interrupted or failed build is
+        # never loaded by a later run.
+        partial_filepath = os.path.join(self.dirpath,
+                                        'bench_%d.partial.gdb' % num_rows)
+        shutil.rmtree(partial_filepath, ignore_errors=True)
+        try:
+          with benchmark_util.Timer() as timer:
+            created = CreateFixture(partial_filepath, num_rows)
+          if created:
+            os.rename(partial_filepath, filepath)
+        finally:
+          shutil.rmtree(partial_filepath, ignore_errors=True)
+        if not created:
+          self.filepaths = None
+          break
+        logging.info('Created %s in %.1f s', filepath, timer.seconds)
+      self.filepaths[num_rows] = filepath
+    return self.filepaths
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    if self.tempdir:
+      self.tempdir.__exit__(exc_type, exc_value, traceback)
+
+
+def AttrIndexUse(src, layer):
+  """Number of indexes the OpenFileGDB driver is using for the filter."""
+  sql_layer = src.ExecuteSQL('GetLayerAttrIndexUse %s' % layer.GetName())
+  attr_index_use = int(sql_layer.GetNextFeature().GetField(0))
+  src.ReleaseResultSet(sql_layer)
+  return attr_index_use
+
+
+def TimeQuery(layer, where_clause):
+  """Returns (fastest seconds, sorted FIDs) for the filter and iteration."""
+  fids = []
+
+  def Query():
+    del fids[:]
+    layer.SetAttributeFilter(where_clause)
+    for feature in layer:
+      fids.append(feature.GetFID())
+
+  seconds = benchmark_util.TimeIt(Query, REPEAT)
+  return seconds, sorted(fids)
+
+
+@ogr_util.SkipIfDriverMissing(DRIVER)
+class OpenFileGdbAttributeIndexBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(OpenFileGdbAttributeIndexBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+    driver = ogr.GetDriverByName(DRIVER)
+    if driver.GetMetadataItem(gdal.DCAP_CREATE) != 'YES':
+      self.skipTest('OpenFileGDB driver cannot write')
+
+  def testIndexedVersusScan(self):
+    sizes = [benchmark_util.Scale(size) for size in SIZES]
+    report = benchmark_util.Report(
+        'openfilegdb_attribute_index',
+        ['rows', 'clause', 'matches', 'index_use', 'indexed_ms', 'scan_ms'])
+    indexed_seconds = dict((clause, []) for clause, _, _ in CLAUSES)
+
+    with Fixtures(sizes) as filepaths:
+      if not filepaths:
+        self.skipTest('Unable to create indexes with the OpenFileGDB driver')
+
+      for num_rows in sizes:
+        src = ogr.Open(filepaths[num_rows])
+        self.assertTrue(src, filepaths[num_rows])
+        layer = src.GetLayerByName(LAYER_NAME)
+        self.assertEqual(num_rows, layer.GetFeatureCount())
+        values = ClauseValues(num_rows)
+
+        for clause, _, uses_index in CLAUSES:
+          indexed_clause = clause.format(**dict(values, **FieldNames(True)))
+          scan_clause = clause.format(**dict(values, **FieldNames(False)))
+
+          indexed, indexed_fids = TimeQuery(layer, indexed_clause)
+          index_use = AttrIndexUse(src, layer)
+          self.assertEqual(uses_index, index_use > 0, indexed_clause)
+          scan, scan_fids = TimeQuery(layer, scan_clause)
+          self.assertEqual(0, AttrIndexUse(src, layer), scan_clause)
+          self.assertEqual(scan_fids, indexed_fids, indexed_clause)
+
+          indexed_seconds[clause].append(indexed)
+          report.Add(rows=num_rows, clause=indexed_clause,
+                     matches=len(indexed_fids), index_use=index_use,
+                     indexed_ms=indexed * 1000, scan_ms=scan * 1000)
+        layer = None
+        src = None
+
+    report.Write()
+
+    # A selective query on an indexed field should grow much slower than the
+    # row count.  A full scan has a slope of about 1.
+    slopes = benchmark_util.Report(
+        'openfilegdb_attribute_index_slopes',
+        ['clause', 'selective', 'uses_index', 'slope'])
+    for clause, selective, uses_index in CLAUSES:
+      slope = benchmark_util.SlopeLogLog(sizes, indexed_seconds[clause])
+      logging.info('%s: slope %.2f', clause, slope)
+      slopes.Add(clause=clause, selective=selective, uses_index=uses_index,
+                 slope=slope)
+    slopes.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
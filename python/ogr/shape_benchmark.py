@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark shapefile spatial filters with and without a .qix index.
+
+shape_test.test09SearchInsidePolyReturnNone and
+test10SelectSomePolygonsByRegion check SetSpatialFilterRect on poly.shp.
+This writes shapefiles with many small polygons and times random rectangle
+queries before and after "CREATE SPATIAL INDEX ON".
+
+For each query the report gives the number of features returned and
+bbox_candidates, the number of features whose bounding box touches the
+rectangle.  GDAL does not expose how many shapes the .qix hands to the
+driver, so bbox_candidates is computed with numpy from the written
+envelopes.  It is a lower bound on the shapes the index returns, since the
+.qix tree nodes cover more than the exact bounding boxes.
+
+Format is described here:
+
+http://www.gdal.org/drv_shapefile.html
+"""
+
+import os
+import unittest
+
+from osgeo import ogr
+import logging
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.ogr import ogr_util
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+DRIVER = ogr_util.SHAPEFILE_DRIVER
+
+# Number of polygons in each shapefile before scaling.
+SIZES = (10000, 40000)
+
+# Number of random rectangles queried per shapefile.
+NUM_QUERIES = 100
+
+# Width and height of the query rectangles as a fraction of the extent.
+QUERY_FRACTION = 0.02
+
+# Width and height of the polygons as a fraction of the grid spacing.
+POLYGON_FRACTION = 0.8
+
+
+def CreateShapefile(filepath, num_features, seed=42):
+  """Write a grid of jittered squares in random order.
+
+  Returns:
+    A (num_features, 4) numpy array of minx, maxx, miny, maxy for each FID.
+  """
+  random_state = numpy.random.RandomState(seed)
+  columns = int(numpy.ceil(numpy.sqrt(num_features)))
+  cells = random_state.permutation(columns * columns)[:num_features]
+  minx = (cells % columns) + random_state.uniform(
+      0, 1 - POLYGON_FRACTION, num_features)
+  miny = (cells // columns) + random_state.uniform(
+      0, 1 - POLYGON_FRACTION, num_features)
+  envelopes = numpy.column_stack(
+      (minx, minx + POLYGON_FRACTION, miny, miny + POLYGON_FRACTION))
+
+  dst = ogr.GetDriverByName(DRIVER).CreateDataSource(filepath)
+  layer = dst.CreateLayer(
+      os.path.splitext(os.path.basename(filepath))[0], geom_type=ogr.wkbPolygon)
+  layer.CreateField(ogr.FieldDefn('id', ogr.OFTInteger))
+  defn = layer.GetLayerDefn()
+  for fid, (x0, x1, y0, y1) in enumerate(envelopes):
+    feature = ogr.Feature(defn)
+    feature.SetField(0, fid)
+    feature.SetGeometry(ogr.CreateGeometryFromWkt(
+        'POLYGON ((%r %r,%r %r,%r %r,%r %r,%r %r))' %
+        (x0, y0, x0, y1, x1, y1, x1, y0, x0, y0)))
+    layer.CreateFeature(feature)
+  dst = None
+  return envelopes
+
+
+def QueryRects(extent, num_queries, seed=7):
+  """Random (minx, miny, maxx, maxy) rectangles inside extent."""
+  random_state = numpy.random.RandomState(seed)
+  width = extent * QUERY_FRACTION
+  minx = random_state.uniform(0, extent - width, num_queries)
+  miny = random_state.uniform(0, extent - width, num_queries)
+  return [(x, y, x + width, y + width) for x, y in zip(minx, miny)]
+
+
+def BoundingBoxCandidates(envelopes, rect):
+  """Number of features whose bounding box touches rect.
+
+  This is a lower bound on the number of shapes a .qix query returns.
+  """
+  minx, miny, maxx, maxy = rect
+  return int(numpy.count_nonzero(
+      (envelopes[:, 0] <= maxx) & (envelopes[:, 1] >= minx) &
+      (envelopes[:, 2] <= maxy) & (envelopes[:, 3] >= miny)))
+
+
+def RunQueries(layer, rects):
+  """Returns (seconds, list of sorted FID lists) for the rectangles."""
+  results = []
+  with benchmark_util.Timer() as timer:
+    for rect in rects:
+      layer.SetSpatialFilterRect(*rect)
+      results.append(sorted(feature.GetFID() for feature in layer))
+  layer.SetSpatialFilter(None)
+  return timer.seconds, results
+
+
+@unittest.skipIf(not numpy, 'Requires numpy')
+@ogr_util.SkipIfDriverMissing(DRIVER)
+class ShapefileSpatialIndexBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(ShapefileSpatialIndexBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  def Query(self, filepath, rects, create_index):
+    """Open filepath, create or drop its index and run the queries."""
+    src = ogr.Open(filepath, update=1)
+    self.assertTrue(src, filepath)
+    layer = src.GetLayer()
+    sql = '%s SPATIAL INDEX ON %s' % (
+        'CREATE' if create_index else 'DROP', layer.GetName())
+    with gcore_util.ErrorHandler('CPLQuietErrorHandler'):
+      src.ExecuteSQL(sql)
+    qix = os.path.splitext(filepath)[0] + '.qix'
+    self.assertEqual(create_index, os.path.exists(qix), sql)
+    src = None
+
+    src = ogr.Open(filepath)
+    layer = src.GetLayer()
+    self.assertEqual(create_index,
+                     bool(layer.TestCapability(ogr.OLCFastSpatialFilter)))
+    return RunQueries(layer, rects)
+
+  def testSpatialIndex(self):
+    report = benchmark_util.Report(
+        'shapefile_spatial_index',
+        ['features', 'index', 'queries', 'ms_per_query',
+         'bbox_candidates', 'returned'])
+    with gcore_util.TestTemporaryDirectory(prefix='shape_benchmark') as tmpdir:
+      for num_features in [benchmark_util.Scale(size) for size in SIZES]:
+        filepath = os.path.join(tmpdir, 'grid_%d.shp' % num_features)
+        envelopes = CreateShapefile(filepath, num_features)
+        rects = QueryRects(envelopes[:, 1].max(), NUM_QUERIES)
+        candidates = sum(BoundingBoxCandidates(envelopes, rect)
+                         for rect in rects)
+
+        scan_seconds, scan_results = self.Query(filepath, rects, False)
+        index_seconds, index_results = self.Query(filepath, rects, True)
+        self.assertEqual(scan_results, index_results)
+
+        returned = sum(len(fids) for fids in index_results)
+        self.assertLessEqual(returned, candidates)
+        for index, seconds in (('no', scan_seconds), ('qix', index_seconds)):
+          report.Add(
+              features=num_features, index=index, queries=NUM_QUERIES,
+              ms_per_query=seconds * 1000 / NUM_QUERIES,
+              bbox_candidates=float(candidates) / NUM_QUERIES,
+              returned=float(returned) / NUM_QUERIES)
+        logging.info('%d features: qix is %.1fx faster', num_features,
+                     benchmark_util.Rate(scan_seconds, index_seconds))
+
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()
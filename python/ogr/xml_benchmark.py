@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# Copyright 2018 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the Expat based KML, GPX and GeoRSS readers on large documents.
+
+kml_test, gpx_test and georss_test parse tiny files.  This generates
+documents with a given number of features and nesting depth for each driver
+and reads them in a fresh process to get features per second and how much
+the peak resident memory grew.
+
+The depth is the number of nested Folders around the Placemarks for KML and
+the number of nested unknown elements inside each feature for GPX and
+GeoRSS, which the parsers have to skip.
+
+Formats are described here:
+
+http://www.gdal.org/drv_kml.html
+http://www.gdal.org/drv_gpx.html
+http://www.gdal.org/drv_georss.html
+"""
+
+import os
+import unittest
+
+from xml.sax import saxutils
+
+import logging
+from autotest2.gcore import benchmark_util
+from autotest2.gcore import gcore_util
+from autotest2.ogr import ogr_util
+
+# Number of features in each document before scaling.
+FEATURE_COUNTS = (10000, 40000)
+
+DEPTHS = (1, 16)
+
+
+def _Nested(depth):
+  """Open and close tags of depth nested elements with some text."""
+  opening = ''.join('<ext:level%d id="%d">' % (level, level)
+                    for level in range(depth))
+  closing = ''.join('</ext:level%d>' % level
+                    for level in reversed(range(depth)))
+  return opening + 'skip me' + closing
+
+
+def WriteKml(f, num_features, depth):
+  f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+          '<kml xmlns="http://www.opengis.net/kml/2.2">\n<Document>\n')
+  for level in range(depth):
+    f.write('<Folder><name>folder %d</name>\n' % level)
+  for fid in range(num_features):
+    x = fid % 360 - 180
+    y = fid % 180 - 90
+    f.write('<Placemark><name>%s</name>'
+            '<description>feature %d</description>'
+            '<ExtendedData><Data name="value"><value>%d</value></Data>'
+            '</ExtendedData>' % (saxutils.escape('p<%d>' % fid), fid, fid))
+    if fid % 2:
+      f.write('<Point><coordinates>%d,%d,0</coordinates></Point>' % (x, y))
+    else:
+      f.write('<LineString><coordinates>%d,%d %d,%d</coordinates>'
+              '</LineString>' % (x, y, x + 1, y))
+    f.write('</Placemark>\n')
+  f.write('</Folder>\n' * depth)
+  f.write('</Document>\n</kml>\n')
+
+
+def WriteGpx(f, num_features, depth):
+  f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+          '<gpx version="1.1" creator="autotest2"'
+          ' xmlns="http://www.topografix.com/GPX/1/1"'
+          ' xmlns:ext="http://example.com/ext">\n')
+  for fid in range(num_features):
+    f.write('<wpt lat="%d" lon="%d"><ele>%d</ele><name>wpt %d</name>'
+            '<extensions>%s</extensions></wpt>\n' %
+            (fid % 180 - 90, fid % 360 - 180, fid % 1000, fid,
+             _Nested(depth)))
+  f.write('</gpx>\n')
+
+
+def WriteGeoRss(f, num_features, depth):
+  f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+          '<rss version="2.0" xmlns:georss="http://www.georss.org/georss"'
+          ' xmlns:ext="http://example.com/ext">\n<channel>\n'
+          '<title>benchmark</title><link>http://example.com/</link>'
+          '<description>benchmark</description>\n')
+  for fid in range(num_features):
+    f.write('<item><title>item %d</title><description>%s</description>'
+            '<georss:point>%d %d</georss:point>%s</item>\n' %
+            (fid, saxutils.escape('<b>%d</b>' % fid), fid % 180 - 90,
+             fid % 360 - 180, _Nested(depth)))
+  f.write('</channel>\n</rss>\n')
+
+
+# Driver to (extension, writer).
+FORMATS = {
+    ogr_util.KML_DRIVER: ('.kml', WriteKml),
+    ogr_util.GPX_DRIVER: ('.gpx', WriteGpx),
+    ogr_util.GEORSS_DRIVER: ('.xml', WriteGeoRss),
+}
+
+
+class XmlParseBenchmark(unittest.TestCase):
+
+  def setUp(self):
+    super(XmlParseBenchmark, self).setUp()
+    gcore_util.SetupTestEnv()
+
+  def testParse(self):
+    drivers = sorted(driver_name for driver_name in FORMATS
+                     if driver_name in ogr_util.drivers)
+    if not drivers:
+      self.skipTest('Requires one of %s' % sorted(FORMATS))
+
+    report = benchmark_util.Report(
+        'xml_parse',
+        ['driver', 'features', 'depth', 'file_mb', 'features_s', 'mb_s',
+         'growth_mb'])
+    with gcore_util.TestTemporaryDirectory(prefix='xml_benchmark') as tmpdir:
+      for driver_name in drivers:
+        ext, writer = FORMATS[driver_name]
+        for num_features in FEATURE_COUNTS:
+          num_features = benchmark_util.Scale(num_features)
+          for depth in DEPTHS:
+            filepath = os.path.join(
+                tmpdir, 'features_%d_%d%s' % (num_features, depth, ext))
+            with open(filepath, 'w') as f:
+              writer(f, num_features, depth)
+            file_mb = float(os.path.getsize(filepath)) / benchmark_util.MB
+
+            count, seconds, rss_growth = benchmark_util.RunInSubprocess(
+                ogr_util.CountFeatures, filepath, driver_name)
+            os.remove(filepath)
+            self.assertEqual(num_features, count, filepath)
+
+            report.Add(
+                driver=driver_name, features=num_features, depth=depth,
+                file_mb=file_mb,
+                features_s=benchmark_util.Rate(num_features, seconds),
+                mb_s=benchmark_util.Rate(file_mb, seconds),
+                growth_mb=float(rss_growth) / benchmark_util.MB)
+            logging.info('%s %d features depth %d: %.1f s', driver_name,
+                         num_features, depth, seconds)
+
+    report.Write()
+
+
+if __name__ == '__main__':
+  unittest.main()